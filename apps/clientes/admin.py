@@ -0,0 +1,16 @@
+from django.contrib import admin
+
+from core.admin import BaseAdmin
+from .models import Cliente
+
+
+@admin.register(Cliente)
+class ClienteAdmin(BaseAdmin):
+    list_display = ("identificacion", "razon_social", "email", "is_active", "politica_cobranza")
+    list_filter = ("is_active",)
+    # Identificación exacta (__exact usa el índice único; "=" sería iexact); razón social por contenido
+    search_fields = ("identificacion__exact", "razon_social")
+    list_select_related = ("politica_cobranza",)
+    autocomplete_fields = ("politica_cobranza",)
+    # Por pk: el ORDER BY ... LIMIT de cada página sale del índice de la PK
+    ordering = ("-pk",)
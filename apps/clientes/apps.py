@@ -5,3 +5,7 @@ class ClientesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.clientes"
     verbose_name = "Clientes"
+
+    def ready(self):
+        """Registra el ModelCache (invalidación al guardar/eliminar)"""
+        from . import cache  # noqa: F401
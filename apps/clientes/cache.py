@@ -0,0 +1,5 @@
+from core.model_cache import ModelCache
+
+from .models import Cliente
+
+clientes = ModelCache(Cliente, campos_unicos=("identificacion",))
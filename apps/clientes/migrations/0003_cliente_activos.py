@@ -0,0 +1,28 @@
+# Generated by Django 4.2.11 on 2026-10-19 15:48
+
+from django.db import migrations, models
+import django.db.models.manager
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clientes', '0002_politica_cobranza'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='cliente',
+            options={'default_manager_name': 'all_objects', 'ordering': ['razon_social'], 'verbose_name': 'Cliente', 'verbose_name_plural': 'Clientes'},
+        ),
+        migrations.AlterModelManagers(
+            name='cliente',
+            managers=[
+                ('all_objects', django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['razon_social'], name='cliente_activo_razon_idx'),
+        ),
+    ]
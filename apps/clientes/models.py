@@ -1,5 +1,5 @@
 from django.db import models
-from core.mixins import AuditDateModel
+from core.mixins import ActiveManager, AuditDateModel
 
 
 class Cliente(AuditDateModel):
@@ -13,11 +13,31 @@ class Cliente(AuditDateModel):
     email = models.EmailField(blank=True, null=True)
     celular = models.CharField(max_length=15, blank=True, null=True)
     is_active = models.BooleanField(default=True)
+    politica_cobranza = models.ForeignKey(
+        "cobranza.PoliticaCobranza",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="clientes",
+        help_text="Política de cobranza de sus líneas, salvo que la línea tenga una propia.",
+    )
+
+    objects = ActiveManager()
+    all_objects = models.Manager()
 
     class Meta:
         verbose_name = "Cliente"
         verbose_name_plural = "Clientes"
         ordering = ["razon_social"]
+        # Validadores, filtros, relaciones y dumpdata ven también los eliminados
+        default_manager_name = "all_objects"
+        indexes = [
+            models.Index(
+                fields=["razon_social"],
+                condition=models.Q(is_active=True),
+                name="cliente_activo_razon_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.razon_social} ({self.identificacion})"
@@ -12,10 +12,13 @@ class ClienteSerializer(serializers.ModelSerializer):
             "email",
             "celular",
             "is_active",
+            "politica_cobranza",
             "created_at",
             "modified_at",
         ]
         read_only_fields = ["id", "created_at", "modified_at"]
+        # Sin esto un alta por formulario (sin la casilla) crearía el registro inactivo
+        extra_kwargs = {"is_active": {"default": True}}
 
     def validate_identificacion(self, value):
         value = value.strip()
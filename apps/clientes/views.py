@@ -1,23 +1,27 @@
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from core.viewsets import IncludeInactiveMixin
+
 from .models import Cliente
 from .serializers import ClienteSerializer
 from .filters import ClienteFilter
 
 
-class ClienteViewSet(viewsets.ModelViewSet):
+class ClienteViewSet(IncludeInactiveMixin, viewsets.ModelViewSet):
     """
     CRUD de Clientes con soft delete.
 
     - Solo admin puede hacer DELETE (eliminación lógica).
     - El resto de operaciones requieren autenticación.
+    - Los eliminados solo aparecen con ?include_inactive=1.
     """
 
-    queryset = Cliente.objects.all()
+    queryset = Cliente.all_objects.all()
     serializer_class = ClienteSerializer
     filterset_class = ClienteFilter
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
@@ -47,3 +51,11 @@ class ClienteViewSet(viewsets.ModelViewSet):
     def update(self, request, *args, **kwargs):
         kwargs["partial"] = True
         return super().update(request, *args, **kwargs)
+
+    @action(detail=True, methods=["get"], url_path="estado-cuenta")
+    def estado_cuenta(self, request, pk=None):
+        """Facturado, pagado, vencido y pendiente del cliente, por línea"""
+        from apps.cobranza.estado_cuenta import obtener_estado_cuenta
+
+        cliente = self.get_object()
+        return Response(obtener_estado_cuenta(cliente.pk))
@@ -0,0 +1,48 @@
+from django.contrib import admin
+
+from core.admin import BaseAdmin
+from .models import CollectionsRequestLog, CollectionsRun, PoliticaCobranza, Rubro
+
+
+@admin.register(PoliticaCobranza)
+class PoliticaCobranzaAdmin(BaseAdmin):
+    list_display = ("nombre", "dias_gracia", "monto_minimo", "cantidad_minima")
+    search_fields = ("nombre",)
+
+
+@admin.register(Rubro)
+class RubroAdmin(BaseAdmin):
+    list_display = ("id", "linea_servicio", "valor_total", "estado_rubro", "fecha_vencimiento", "fecha_pago")
+    list_filter = ("estado_rubro",)
+    search_fields = ("linea_servicio__cliente__identificacion__exact",)
+    search_ids = ("pk", "linea_servicio_id")
+    list_select_related = ("linea_servicio__cliente",)
+    autocomplete_fields = ("linea_servicio",)
+    # Con el orden del modelo (-fecha_vencimiento, -pk) usa rubro_vencimiento_idx
+    date_hierarchy = "fecha_vencimiento"
+
+
+@admin.register(CollectionsRun)
+class CollectionsRunAdmin(BaseAdmin):
+    list_display = ("id", "started_at", "finished_at", "status", "procesadas", "total", "lease_hasta")
+    list_filter = ("status",)
+    date_hierarchy = "started_at"
+
+
+@admin.register(CollectionsRequestLog)
+class CollectionsRequestLogAdmin(BaseAdmin):
+    """Solo lectura: los logs los escribe el proceso de cobranza"""
+
+    list_display = ("started_at", "linea_servicio", "run", "status", "action_taken", "unpaid_count")
+    list_filter = ("status", "action_taken")
+    search_ids = ("linea_servicio_id",)
+    list_select_related = ("linea_servicio__cliente", "run")
+    raw_id_fields = ("linea_servicio", "run")
+    # Filtrar por fecha acota las particiones; el orden usa log_started_idx
+    date_hierarchy = "started_at"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
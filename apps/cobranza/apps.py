@@ -7,24 +7,9 @@ class CobranzaConfig(AppConfig):
     verbose_name = "Cobranza"
 
     def ready(self):
-        """Registra la tarea periódica en Celery Beat al arrancar"""
-        try:
-            from django_celery_beat.models import PeriodicTask, IntervalSchedule
-            import json
-
-            schedule, _ = IntervalSchedule.objects.get_or_create(
-                every=5,
-                period=IntervalSchedule.MINUTES,
-            )
-
-            PeriodicTask.objects.update_or_create(
-                name="Proceso Control Morosidad (cada 5 min)",
-                defaults={
-                    "interval": schedule,
-                    "task": "cobranza.proceso_control_morosidad",
-                    "args": json.dumps([]),
-                    "enabled": True,
-                },
-            )
-        except Exception:
-            pass
+        """
+        Conecta las señales. Sin consultas a la BD: se ejecuta en cada proceso
+        (web, workers, comandos). Las tareas de Celery Beat se registran con
+        ``manage.py sincronizar_beat`` (ver apps.cobranza.beat).
+        """
+        from . import signals  # noqa: F401
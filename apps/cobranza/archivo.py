@@ -0,0 +1,100 @@
+"""
+Archivo de rubros liquidados.
+
+Los rubros PAGADO/ANULADO con vencimiento anterior al corte (inicio del mes de
+hace COBRANZA_ARCHIVO_MESES meses) se mueven por lotes a RubroArchivado, así la
+tabla de rubros y sus índices solo contienen lo que consultan la tarea de
+cobranza y estado-cobranza. RubroViewSet los sigue sirviendo al pedir rangos
+históricos.
+"""
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import BooleanField, Value
+from django.utils import timezone
+
+from .models import Rubro, RubroArchivado, EstadoRubro
+from .particiones import inicio_mes
+
+logger = logging.getLogger(__name__)
+
+ESTADOS_ARCHIVABLES = (EstadoRubro.PAGADO, EstadoRubro.ANULADO)
+
+CAMPOS = (
+    "id",
+    "linea_servicio",
+    "valor_total",
+    "estado_rubro",
+    "fecha_emision",
+    "fecha_vencimiento",
+    "fecha_pago",
+    "created_at",
+    "modified_at",
+)
+
+
+def fecha_corte(meses=None, now=None):
+    """Vencimientos anteriores a esta fecha pueden estar archivados."""
+    meses = settings.COBRANZA_ARCHIVO_MESES if meses is None else meses
+    return inicio_mes(now or timezone.now(), -meses)
+
+
+def archivar_rubros(meses=None, lote=None):
+    """Mueve los rubros liquidados anteriores al corte, un lote por transacción."""
+    corte = fecha_corte(meses)
+    lote = lote or settings.COBRANZA_ARCHIVO_LOTE
+    total = 0
+
+    while True:
+        with transaction.atomic():
+            filas = list(
+                Rubro.objects.filter(
+                    estado_rubro__in=ESTADOS_ARCHIVABLES,
+                    fecha_vencimiento__lt=corte,
+                )
+                .order_by("pk")
+                .select_for_update(skip_locked=True)
+                .values(*CAMPOS)[:lote]
+            )
+            if not filas:
+                break
+
+            RubroArchivado.objects.bulk_create(
+                [
+                    RubroArchivado(
+                        linea_servicio_id=fila.pop("linea_servicio"),
+                        **fila,
+                    )
+                    for fila in filas
+                ],
+                ignore_conflicts=True,
+            )
+            Rubro.objects.filter(pk__in=[fila["id"] for fila in filas]).delete()
+
+        total += len(filas)
+        logger.info("[COBRANZA] Rubros archivados: %d (corte %s)", total, corte)
+
+    return total
+
+
+ORDEN_HISTORICO = ("-fecha_vencimiento", "-id")
+
+
+def union_historica(vigentes, archivados, orden=ORDEN_HISTORICO):
+    """
+    Rubros vigentes y archivados como una sola consulta (UNION ALL) de
+    diccionarios, ordenada por ``orden`` (campos de CAMPOS).
+    """
+    return (
+        vigentes.order_by()
+        .values(*CAMPOS)
+        .annotate(archivado=Value(False, output_field=BooleanField()))
+        .union(
+            archivados.order_by()
+            .values(*CAMPOS)
+            .annotate(archivado=Value(True, output_field=BooleanField())),
+            all=True,
+        )
+        .order_by(*orden)
+    )
@@ -0,0 +1,45 @@
+"""
+Tareas periódicas de Celery Beat (DatabaseScheduler).
+
+Se registran con ``python manage.py sincronizar_beat`` (idempotente: crea o
+actualiza cada tarea por nombre), no al arrancar cada proceso. La migración
+0010_tareas_periodicas guarda su propia copia de la lista de entonces; al
+agregar o cambiar una entrada de TAREAS_PERIODICAS hay que ejecutar el
+comando en el deploy.
+"""
+import json
+
+# (nombre, tarea, cada, periodo de IntervalSchedule)
+TAREAS_PERIODICAS = (
+    ("Proceso Control Morosidad (cada 5 min)", "cobranza.proceso_control_morosidad", 5, "minutes"),
+    ("Mantenimiento de particiones de logs (diario)", "cobranza.mantener_particiones_logs", 1, "days"),
+    ("Archivo de rubros liquidados (diario)", "cobranza.archivar_rubros", 1, "days"),
+    ("Limpieza de resultados de tareas (diario)", "core.limpiar_resultados", 1, "days"),
+    ("Resumen de antigüedad de cartera (cada hora)", "cobranza.actualizar_resumen_antiguedad", 1, "hours"),
+)
+
+
+def sincronizar_tareas():
+    """
+    Crea las tareas de TAREAS_PERIODICAS que falten y corrige tarea, intervalo
+    y argumentos de las existentes. ``enabled`` solo se fija al crear: una
+    tarea pausada desde el admin sigue pausada. Devuelve (creadas, actualizadas).
+    """
+    from django_celery_beat.models import IntervalSchedule, PeriodicTask
+
+    creadas = actualizadas = 0
+    for nombre, tarea, cada, periodo in TAREAS_PERIODICAS:
+        intervalo, _ = IntervalSchedule.objects.get_or_create(every=cada, period=periodo)
+        programacion = {"interval": intervalo, "task": tarea, "args": json.dumps([])}
+        periodica, creada = PeriodicTask.objects.get_or_create(
+            name=nombre, defaults={**programacion, "enabled": True}
+        )
+        if creada:
+            creadas += 1
+            continue
+        actualizadas += 1
+        if any(getattr(periodica, campo) != valor for campo, valor in programacion.items()):
+            for campo, valor in programacion.items():
+                setattr(periodica, campo, valor)
+            periodica.save(update_fields=list(programacion))
+    return creadas, actualizadas
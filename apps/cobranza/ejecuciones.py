@@ -0,0 +1,91 @@
+"""
+Estado de las ejecuciones del proceso de control de morosidad (CollectionsRun).
+
+Cada lote de líneas se confirma junto con el avance de la ejecución, de modo
+que un reintento de Celery o una ejecución manual tras una caída continúan
+desde la última línea confirmada con el mismo ``started_at``. Los logs de
+ese lote llevan la ejecución y son únicos por (run, línea): repetir un lote
+no los duplica.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import CollectionsRun, RunStatus
+
+logger = logging.getLogger(__name__)
+
+
+def _lease():
+    return timezone.now() + timedelta(seconds=settings.COBRANZA_RUN_LEASE_SECONDS)
+
+
+def tomar_ejecucion(task_id=None, run_id=None, total=0):
+    """
+    Devuelve la ejecución a procesar: la indicada, la que quedó en curso (si su
+    lease venció o es del mismo task) o una nueva. None si otro worker tiene
+    una ejecución en curso.
+    """
+    ahora = timezone.now()
+    with transaction.atomic():
+        pendientes = CollectionsRun.objects.select_for_update().filter(status=RunStatus.EN_CURSO)
+        run = (pendientes.filter(pk=run_id) if run_id else pendientes).first()
+
+        if run is not None:
+            propia = task_id is not None and run.task_id == task_id
+            if not propia and run.lease_hasta and run.lease_hasta > ahora:
+                logger.warning("[COBRANZA] Ejecución %d en curso en otro worker; se omite.", run.pk)
+                return None
+            limite = timedelta(seconds=settings.COBRANZA_RUN_REANUDAR_MAX_SECONDS)
+            if ahora - run.started_at <= limite:
+                run.task_id = task_id
+                run.lease_hasta = _lease()
+                run.save(update_fields=["task_id", "lease_hasta", "modified_at"])
+                logger.info(
+                    "[COBRANZA] Reanudando ejecución %d desde la línea %d (%d procesadas).",
+                    run.pk, run.ultima_linea_id, run.procesadas,
+                )
+                return run
+            # Demasiado antigua: su ``now`` ya no sirve, se empieza de nuevo
+            run.status = RunStatus.ABANDONADA
+            run.finished_at = ahora
+            run.save(update_fields=["status", "finished_at", "modified_at"])
+            logger.warning("[COBRANZA] Ejecución %d abandonada en la línea %d.", run.pk, run.ultima_linea_id)
+
+    try:
+        with transaction.atomic():
+            return CollectionsRun.objects.create(
+                started_at=ahora, task_id=task_id, total=total, lease_hasta=_lease()
+            )
+    except IntegrityError:
+        # Otro worker creó la suya entre medio (run_unica_en_curso)
+        logger.warning("[COBRANZA] Ya hay una ejecución en curso; se omite.")
+        return None
+
+
+def registrar_avance(run, ultima_linea_id, cantidad):
+    """Guarda el checkpoint y renueva el lease; llamar dentro de la transacción del lote."""
+    CollectionsRun.objects.filter(pk=run.pk).update(
+        ultima_linea_id=ultima_linea_id,
+        procesadas=F("procesadas") + cantidad,
+        lease_hasta=_lease(),
+        modified_at=timezone.now(),
+    )
+    run.ultima_linea_id = ultima_linea_id
+    run.procesadas += cantidad
+
+
+def completar_ejecucion(run):
+    run.status = RunStatus.COMPLETADA
+    run.finished_at = timezone.now()
+    run.lease_hasta = None
+    run.save(update_fields=["status", "finished_at", "lease_hasta", "modified_at"])
+
+
+def liberar_ejecucion(run):
+    """Suelta el lease tras un error para que el reintento (u otro worker) la retome."""
+    CollectionsRun.objects.filter(pk=run.pk).update(lease_hasta=None, modified_at=timezone.now())
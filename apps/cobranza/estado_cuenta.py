@@ -0,0 +1,108 @@
+"""
+Estado de cuenta por cliente.
+
+Se calcula con una agregación condicional sobre Rubro agrupada por línea (más
+una sobre RubroArchivado para el histórico liquidado) y se guarda en caché
+hasta la próxima escritura de rubros o líneas del cliente (signals, el
+bulk_update de la cobranza y las transiciones masivas) o hasta el próximo
+vencimiento, lo que ocurra antes.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Min, Q, Sum
+from django.utils import timezone
+
+from core.db_router import usar_primaria
+
+from .models import Rubro, RubroArchivado, EstadoRubro
+
+CACHE_KEY = "cobranza:estado_cuenta:{}"
+
+CAMPOS_MONTO = ("total_facturado", "total_pagado", "vencido", "pendiente")
+
+
+def calcular_estado_cuenta(cliente_id, now=None):
+    now = now or timezone.now()
+    facturado = ~Q(estado_rubro=EstadoRubro.ANULADO)
+    pagado = Q(estado_rubro=EstadoRubro.PAGADO)
+    vencido = Q(estado_rubro=EstadoRubro.NO_PAGADO, fecha_vencimiento__lt=now)
+    pendiente = Q(estado_rubro=EstadoRubro.NO_PAGADO, fecha_vencimiento__gte=now)
+
+    lineas = {
+        fila["linea_id"]: fila
+        for fila in Rubro.objects.filter(linea_servicio__cliente_id=cliente_id)
+        .values(
+            linea_id=F("linea_servicio"),
+            linea_numero=F("linea_servicio__linea_numero"),
+            estado_linea=F("linea_servicio__estado_linea"),
+        )
+        .annotate(
+            total_facturado=Sum("valor_total", filter=facturado, default=0),
+            total_pagado=Sum("valor_total", filter=pagado, default=0),
+            vencido=Sum("valor_total", filter=vencido, default=0),
+            pendiente=Sum("valor_total", filter=pendiente, default=0),
+            proximo_vencimiento=Min("fecha_vencimiento", filter=pendiente),
+        )
+        .order_by()
+    }
+
+    # El archivo solo guarda rubros PAGADO/ANULADO: suma a facturado y pagado
+    archivados = (
+        RubroArchivado.objects.filter(
+            linea_servicio__cliente_id=cliente_id, estado_rubro=EstadoRubro.PAGADO
+        )
+        .values(
+            linea_id=F("linea_servicio"),
+            linea_numero=F("linea_servicio__linea_numero"),
+            estado_linea=F("linea_servicio__estado_linea"),
+        )
+        .annotate(total_pagado=Sum("valor_total"))
+        .order_by()
+    )
+    for fila in archivados:
+        pagado_archivo = fila.pop("total_pagado")
+        linea = lineas.setdefault(
+            fila["linea_id"],
+            {**fila, **dict.fromkeys(CAMPOS_MONTO, 0), "proximo_vencimiento": None},
+        )
+        linea["total_facturado"] += pagado_archivo
+        linea["total_pagado"] += pagado_archivo
+
+    lineas = sorted(lineas.values(), key=lambda fila: fila["linea_numero"])
+    vencimientos = [f["proximo_vencimiento"] for f in lineas if f["proximo_vencimiento"]]
+    return {
+        "cliente_id": cliente_id,
+        "generado_at": now,
+        **{campo: sum(f[campo] for f in lineas) for campo in CAMPOS_MONTO},
+        "proximo_vencimiento": min(vencimientos, default=None),
+        "lineas": lineas,
+    }
+
+
+def _segundos_hasta(momento, now):
+    return max(int((momento - now).total_seconds()), 1)
+
+
+def obtener_estado_cuenta(cliente_id):
+    """Estado de cuenta serializado, desde caché si está vigente."""
+    from .serializers import EstadoCuentaSerializer
+
+    key = CACHE_KEY.format(cliente_id)
+    data = cache.get(key)
+    if data is None:
+        now = timezone.now()
+        # Lo que se cachea se lee de la primaria: desde la réplica podría
+        # volver a guardarse lo que la última escritura acaba de invalidar
+        with usar_primaria():
+            estado = calcular_estado_cuenta(cliente_id, now)
+        data = EstadoCuentaSerializer(estado).data
+        timeout = settings.COBRANZA_ESTADO_CUENTA_TTL
+        # Al llegar el próximo vencimiento, lo pendiente pasa a vencido
+        if estado["proximo_vencimiento"]:
+            timeout = min(timeout, _segundos_hasta(estado["proximo_vencimiento"], now))
+        cache.set(key, data, timeout)
+    return data
+
+
+def invalidar_estado_cuenta(cliente_id):
+    cache.delete(CACHE_KEY.format(cliente_id))
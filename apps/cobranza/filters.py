@@ -0,0 +1,39 @@
+import django_filters
+from .models import Rubro, RubroArchivado, CollectionsRequestLog, ResumenAntiguedad
+
+
+class RubroFilter(django_filters.FilterSet):
+    fecha_vencimiento_desde = django_filters.IsoDateTimeFilter(
+        field_name="fecha_vencimiento", lookup_expr="gte"
+    )
+    fecha_vencimiento_hasta = django_filters.IsoDateTimeFilter(
+        field_name="fecha_vencimiento", lookup_expr="lt"
+    )
+
+    class Meta:
+        model = Rubro
+        fields = ["linea_servicio", "estado_rubro"]
+
+
+class RubroArchivadoFilter(RubroFilter):
+    class Meta(RubroFilter.Meta):
+        model = RubroArchivado
+
+
+class CollectionsRequestLogFilter(django_filters.FilterSet):
+    # Filtrar por started_at permite a PostgreSQL descartar particiones
+    started_desde = django_filters.IsoDateTimeFilter(field_name="started_at", lookup_expr="gte")
+    started_hasta = django_filters.IsoDateTimeFilter(field_name="started_at", lookup_expr="lt")
+
+    class Meta:
+        model = CollectionsRequestLog
+        fields = ["run", "linea_servicio", "status", "action_taken"]
+
+
+class ResumenAntiguedadFilter(django_filters.FilterSet):
+    fecha_desde = django_filters.DateFilter(field_name="fecha", lookup_expr="gte")
+    fecha_hasta = django_filters.DateFilter(field_name="fecha", lookup_expr="lte")
+
+    class Meta:
+        model = ResumenAntiguedad
+        fields = ["fecha", "tramo", "estado_rubro", "estado_linea"]
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.cobranza import archivo
+
+
+class Command(BaseCommand):
+    help = "Mueve a RubroArchivado los rubros PAGADO/ANULADO con vencimiento anterior al corte."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--meses",
+            type=int,
+            default=settings.COBRANZA_ARCHIVO_MESES,
+            help="Antigüedad mínima en meses (por defecto COBRANZA_ARCHIVO_MESES).",
+        )
+        parser.add_argument(
+            "--lote",
+            type=int,
+            default=settings.COBRANZA_ARCHIVO_LOTE,
+            help="Rubros por transacción (por defecto COBRANZA_ARCHIVO_LOTE).",
+        )
+
+    def handle(self, *args, **options):
+        total = archivo.archivar_rubros(meses=options["meses"], lote=options["lote"])
+        corte = archivo.fecha_corte(options["meses"])
+        self.stdout.write(self.style.SUCCESS(f"{total} rubros archivados (vencimiento < {corte:%Y-%m-%d})."))
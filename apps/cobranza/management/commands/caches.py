@@ -0,0 +1,34 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from core.catalogos import invalidar_catalogos, obtener_catalogos
+from core.schema import invalidar_schema, obtener_schema
+
+
+class Command(BaseCommand):
+    help = (
+        "Regenera y guarda (calentar) o vacía (vaciar) las respuestas cacheadas: catálogos y schema OpenAPI. "
+        "Para invalidar toda la caché sin borrarla, subir CACHE_VERSION."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("accion", choices=["calentar", "vaciar"])
+        parser.add_argument(
+            "--todo",
+            action="store_true",
+            help="Con vaciar: borra toda la caché (ModelCache, estados de cuenta, etc.).",
+        )
+
+    def handle(self, *args, **options):
+        if options["accion"] == "calentar":
+            # Reemplaza lo cacheado por el deploy anterior en vez de conservarlo
+            obtener_catalogos(regenerar=True)
+            obtener_schema(regenerar=True)
+            self.stdout.write(self.style.SUCCESS("Catálogos y schema cacheados."))
+        elif options["todo"]:
+            cache.clear()
+            self.stdout.write(self.style.SUCCESS("Caché vaciada."))
+        else:
+            invalidar_catalogos()
+            invalidar_schema()
+            self.stdout.write(self.style.SUCCESS("Catálogos y schema eliminados de la caché."))
@@ -0,0 +1,57 @@
+import argparse
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.cobranza import particiones
+
+
+class Command(BaseCommand):
+    help = (
+        "Crea por adelantado las particiones mensuales de CollectionsRequestLog "
+        "y elimina (o archiva) las que superan el período de retención."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--adelante",
+            type=int,
+            default=settings.COBRANZA_LOGS_MESES_ADELANTE,
+            help="Meses futuros a crear (por defecto COBRANZA_LOGS_MESES_ADELANTE).",
+        )
+        parser.add_argument(
+            "--retencion",
+            type=int,
+            default=settings.COBRANZA_LOGS_RETENCION_MESES,
+            help="Meses a conservar (por defecto COBRANZA_LOGS_RETENCION_MESES).",
+        )
+        parser.add_argument(
+            "--archivar",
+            action=argparse.BooleanOptionalAction,
+            default=settings.COBRANZA_LOGS_ARCHIVAR,
+            help=(
+                "Desadjunta y renombra las particiones vencidas en lugar de eliminarlas "
+                "(por defecto COBRANZA_LOGS_ARCHIVAR; --no-archivar las elimina)."
+            ),
+        )
+        parser.add_argument(
+            "--sin-purga",
+            action="store_true",
+            help="Solo crea particiones; no toca las antiguas.",
+        )
+
+    def handle(self, *args, **options):
+        if not particiones.esta_particionada():
+            raise CommandError("La tabla de logs no está particionada (¿migraciones pendientes?).")
+
+        for nombre in particiones.asegurar_particiones(options["adelante"]):
+            self.stdout.write(f"Creada {nombre}")
+
+        if not options["sin_purga"]:
+            for nombre in particiones.purgar_particiones(
+                options["retencion"], archivar=options["archivar"]
+            ):
+                accion = "Archivada" if options["archivar"] else "Eliminada"
+                self.stdout.write(f"{accion} {nombre}")
+
+        self.stdout.write(self.style.SUCCESS("Particiones al día."))
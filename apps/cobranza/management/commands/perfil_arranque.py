@@ -0,0 +1,131 @@
+import json
+import subprocess
+import sys
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Corre en un proceso nuevo: django.setup() con el ready() de cada app
+# cronometrado y sus consultas a la BD contadas.
+_SCRIPT = """
+import json, time
+import django
+from django.apps import config
+from django.db import connection
+
+ready, consultas, actual = {}, {}, [None]
+crear = config.AppConfig.create.__func__
+
+def create(cls, entry):
+    app_config = crear(cls, entry)
+    original = app_config.ready
+
+    def medido():
+        actual[0] = app_config.label
+        inicio = time.perf_counter()
+        try:
+            original()
+        finally:
+            ready[app_config.label] = time.perf_counter() - inicio
+            actual[0] = None
+
+    app_config.ready = medido
+    return app_config
+
+def contar(execute, sql, params, many, context):
+    consultas[actual[0] or "-"] = consultas.get(actual[0] or "-", 0) + 1
+    return execute(sql, params, many, context)
+
+config.AppConfig.create = classmethod(create)
+inicio = time.perf_counter()
+with connection.execute_wrapper(contar):
+    django.setup()
+total = time.perf_counter() - inicio
+print(json.dumps({"total": total, "ready": ready, "consultas": consultas}))
+"""
+
+
+def _importaciones(salida, prefijos):
+    """
+    Suma el tiempo propio (-X importtime) de los módulos de cada app, en
+    segundos; los que no son de una app, por paquete: ``(celery)``.
+    """
+    tiempos = {}
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:") or "|" not in linea:
+            continue
+        propio, _, modulo = (parte.strip() for parte in linea[len("import time:"):].split("|"))
+        if not propio.isdigit():
+            continue
+        app = next(
+            (label for nombre, label in prefijos if modulo == nombre or modulo.startswith(nombre + ".")),
+            f"({modulo.split('.')[0]})",
+        )
+        tiempos[app] = tiempos.get(app, 0) + int(propio) / 1_000_000
+    return tiempos
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el arranque de Django en un proceso nuevo: tiempo de importación de los módulos "
+        "de cada app, tiempo de su ready() y consultas a la BD hechas durante el arranque."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=15, help="Apps a mostrar (por tiempo total).")
+        parser.add_argument("--json", action="store_true", help="Salida en JSON.")
+
+    def handle(self, *args, **options):
+        proceso = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _SCRIPT],
+            capture_output=True,
+            text=True,
+            cwd=settings.BASE_DIR,
+        )
+        if proceso.returncode != 0:
+            raise CommandError(f"El arranque falló:\n{proceso.stderr[-2000:]}")
+        medicion = json.loads(proceso.stdout.strip().splitlines()[-1])
+
+        # Prefijo más largo primero: django.contrib.admin antes que django
+        prefijos = sorted(
+            ((app_config.name, app_config.label) for app_config in apps.get_app_configs()),
+            key=lambda par: len(par[0]),
+            reverse=True,
+        )
+        importacion = _importaciones(proceso.stderr, prefijos)
+        labels = set(importacion) | set(medicion["ready"])
+        filas = sorted(
+            (
+                {
+                    "app": label,
+                    "importacion": round(importacion.get(label, 0), 4),
+                    "ready": round(medicion["ready"].get(label, 0), 4),
+                    "consultas": medicion["consultas"].get(label, 0),
+                }
+                for label in labels
+            ),
+            key=lambda fila: fila["importacion"] + fila["ready"],
+            reverse=True,
+        )[: options["top"]]
+        resultado = {
+            "setup_segundos": round(medicion["total"], 4),
+            "consultas_totales": sum(medicion["consultas"].values()),
+            "apps": filas,
+        }
+
+        if options["json"]:
+            self.stdout.write(json.dumps(resultado, indent=2))
+            return
+        self.stdout.write(f"{'app':<28}{'importación (s)':>17}{'ready (s)':>12}{'consultas':>11}")
+        for fila in filas:
+            self.stdout.write(
+                f"{fila['app']:<28}{fila['importacion']:>17.4f}{fila['ready']:>12.4f}{fila['consultas']:>11}"
+            )
+        estilo = self.style.WARNING if resultado["consultas_totales"] else self.style.SUCCESS
+        self.stdout.write(
+            estilo(
+                f"django.setup(): {resultado['setup_segundos']:.3f} s, "
+                f"{resultado['consultas_totales']} consultas a la BD."
+            )
+        )
@@ -0,0 +1,62 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.cobranza import services
+
+
+class Command(BaseCommand):
+    help = (
+        "Simula el proceso de control de morosidad sin escribir nada: cuántas "
+        "líneas suspendería o reactivaría en una fecha dada y con días de gracia."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--now",
+            help="Fecha/hora ISO 8601 a simular (por defecto ahora). Sin zona se toma la local.",
+        )
+        parser.add_argument(
+            "--dias-gracia",
+            type=int,
+            help=(
+                "Días de gracia tras el vencimiento antes de contar un rubro como vencido "
+                "(por defecto los de la política de cada línea)."
+            ),
+        )
+        parser.add_argument(
+            "--detalle",
+            action="store_true",
+            help="Escribe una decisión por línea en NDJSON antes del resumen.",
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        if options["now"]:
+            now = parse_datetime(options["now"])
+            if now is None:
+                raise CommandError(f"Fecha inválida: {options['now']}")
+            if timezone.is_naive(now):
+                now = timezone.make_aware(now)
+        if options["dias_gracia"] is not None and options["dias_gracia"] < 0:
+            raise CommandError("--dias-gracia no puede ser negativo.")
+
+        acciones = []
+        for decision in services.simulate_lines(now, options["dias_gracia"]):
+            acciones.append(decision.action)
+            if options["detalle"]:
+                self.stdout.write(json.dumps(decision.as_dict()))
+
+        por_accion = services.resumen_por_accion(acciones)
+        if options["detalle"]:
+            self.stdout.write(json.dumps({"total": len(acciones), "por_accion": por_accion}))
+            return
+
+        gracia = options["dias_gracia"]
+        gracia = "los días de gracia de cada política" if gracia is None else f"{gracia} días de gracia"
+        self.stdout.write(f"Simulación en {now:%Y-%m-%d %H:%M} con {gracia}:")
+        for accion, cantidad in por_accion.items():
+            self.stdout.write(f"  {accion:<10} {cantidad}")
+        self.stdout.write(self.style.SUCCESS(f"{len(acciones)} líneas evaluadas, nada escrito."))
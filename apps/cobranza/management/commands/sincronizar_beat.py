@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.cobranza.beat import sincronizar_tareas
+
+
+class Command(BaseCommand):
+    help = "Crea o actualiza en Celery Beat las tareas periódicas de apps.cobranza.beat (idempotente)."
+
+    def handle(self, *args, **options):
+        creadas, actualizadas = sincronizar_tareas()
+        self.stdout.write(self.style.SUCCESS(f"Tareas periódicas: {creadas} creadas, {actualizadas} actualizadas."))
@@ -0,0 +1,95 @@
+from datetime import datetime
+
+from django.db import migrations, models
+from django.utils import timezone
+
+# Nombres y DDL congelados (no se importa apps.cobranza.particiones): un cambio
+# posterior de ese módulo no debe alterar lo que hace esta migración.
+TABLA = "cobranza_collectionsrequestlog"
+PARTICION_DEFAULT = f"{TABLA}_default"
+MESES_ADELANTE = 3
+
+
+def _inicio_mes(valor, meses=0):
+    valor = timezone.localtime(valor)
+    total = valor.year * 12 + valor.month - 1 + meses
+    return timezone.make_aware(datetime(total // 12, total % 12 + 1, 1))
+
+
+def particionar(apps, schema_editor):
+    """Convierte la tabla de logs en una tabla particionada por mes sobre started_at."""
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE relname = %s", [TABLA])
+        row = cursor.fetchone()
+    if row and row[0] == "p":
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE "{TABLA}" RENAME TO "{TABLA}_old"')
+        # La PK de una tabla particionada debe incluir la clave de partición;
+        # id sigue siendo único porque sale de una única secuencia.
+        cursor.execute(
+            f"""
+            CREATE TABLE "{TABLA}" (
+                "id" bigint NOT NULL,
+                "started_at" timestamp with time zone NOT NULL,
+                "finished_at" timestamp with time zone NULL,
+                "status" varchar(10) NOT NULL,
+                "unpaid_count" smallint NOT NULL CHECK ("unpaid_count" >= 0),
+                "action_taken" varchar(20) NOT NULL,
+                "error_message" text NULL,
+                "linea_servicio_id" bigint NOT NULL
+                    REFERENCES "lineas_lineaservicio" ("id") DEFERRABLE INITIALLY DEFERRED
+            ) PARTITION BY RANGE ("started_at")
+            """
+        )
+        cursor.execute(f'CREATE TABLE "{PARTICION_DEFAULT}" PARTITION OF "{TABLA}" DEFAULT')
+        cursor.execute(f'SELECT MIN("started_at") FROM "{TABLA}_old"')
+        (desde,) = cursor.fetchone()
+
+        # Un mes por partición, desde el log más viejo hasta MESES_ADELANTE meses
+        actual = _inicio_mes(timezone.now())
+        mes = _inicio_mes(desde) if desde else actual
+        while mes <= _inicio_mes(actual, MESES_ADELANTE):
+            cursor.execute(
+                f'CREATE TABLE "{TABLA}_p{mes:%Y%m}" PARTITION OF "{TABLA}" FOR VALUES FROM (%s) TO (%s)',
+                [mes, _inicio_mes(mes, 1)],
+            )
+            mes = _inicio_mes(mes, 1)
+
+    columnas = (
+        '"id", "started_at", "finished_at", "status", "unpaid_count", '
+        '"action_taken", "error_message", "linea_servicio_id"'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f'INSERT INTO "{TABLA}" ({columnas}) SELECT {columnas} FROM "{TABLA}_old"')
+        # Valida ya la FK diferida: con eventos pendientes no se puede hacer ALTER TABLE
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        cursor.execute(f'DROP TABLE "{TABLA}_old"')
+        cursor.execute(f'ALTER TABLE "{TABLA}" ADD PRIMARY KEY ("id", "started_at")')
+        cursor.execute(f'CREATE SEQUENCE "{TABLA}_id_seq" OWNED BY "{TABLA}"."id"')
+        cursor.execute(
+            f"""SELECT setval('"{TABLA}_id_seq"', COALESCE(MAX("id"), 0) + 1, false) FROM "{TABLA}" """
+        )
+        cursor.execute(
+            f"""ALTER TABLE "{TABLA}" ALTER COLUMN "id" SET DEFAULT nextval('"{TABLA}_id_seq"')"""
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cobranza', '0001_initial'),
+    ]
+
+    operations = [
+        # El reverso deja la tabla particionada: es compatible con el modelo.
+        migrations.RunPython(particionar, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='collectionsrequestlog',
+            index=models.Index(fields=['linea_servicio', '-started_at'], name='log_linea_started_idx'),
+        ),
+    ]
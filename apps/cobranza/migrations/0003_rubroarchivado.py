@@ -0,0 +1,36 @@
+# Generated by Django 4.2.11 on 2026-10-19 15:21
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lineas', '0001_initial'),
+        ('cobranza', '0002_particionar_collectionsrequestlog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RubroArchivado',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('valor_total', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('estado_rubro', models.CharField(choices=[('NO_PAGADO', 'No Pagado'), ('PAGADO', 'Pagado'), ('VENCIDO', 'Vencido'), ('ANULADO', 'Anulado')], max_length=20)),
+                ('fecha_emision', models.DateTimeField()),
+                ('fecha_vencimiento', models.DateTimeField()),
+                ('fecha_pago', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('modified_at', models.DateTimeField()),
+                ('archivado_at', models.DateTimeField(auto_now_add=True)),
+                ('linea_servicio', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='rubros_archivados', to='lineas.lineaservicio')),
+            ],
+            options={
+                'verbose_name': 'Rubro archivado',
+                'verbose_name_plural': 'Rubros archivados',
+                'ordering': ['-fecha_vencimiento'],
+                'indexes': [models.Index(fields=['fecha_vencimiento'], name='rubro_arch_vencimiento_idx')],
+            },
+        ),
+    ]
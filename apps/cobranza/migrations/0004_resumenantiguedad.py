@@ -0,0 +1,35 @@
+# Generated by Django 4.2.11 on 2026-10-19 15:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cobranza', '0003_rubroarchivado'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumenAntiguedad',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField()),
+                ('tramo', models.CharField(choices=[('POR_VENCER', 'Por vencer'), ('0_30', '0-30 días'), ('31_60', '31-60 días'), ('61_90', '61-90 días'), ('90_MAS', 'Más de 90 días')], max_length=12)),
+                ('estado_rubro', models.CharField(choices=[('NO_PAGADO', 'No Pagado'), ('PAGADO', 'Pagado'), ('VENCIDO', 'Vencido'), ('ANULADO', 'Anulado')], max_length=20)),
+                ('estado_linea', models.CharField(choices=[('NO_INSTALADO', 'No Instalado'), ('ACTIVO', 'Activo'), ('SUSPENDIDO', 'Suspendido'), ('CANCELADO', 'Cancelado')], max_length=20)),
+                ('cantidad', models.PositiveIntegerField(default=0)),
+                ('monto', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('actualizado_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Resumen de antigüedad',
+                'verbose_name_plural': 'Resúmenes de antigüedad',
+                'ordering': ['-fecha', 'tramo', 'estado_rubro', 'estado_linea'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='resumenantiguedad',
+            constraint=models.UniqueConstraint(fields=('fecha', 'tramo', 'estado_rubro', 'estado_linea'), name='resumen_antiguedad_unico'),
+        ),
+    ]
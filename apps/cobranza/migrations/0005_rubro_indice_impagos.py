@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-19 15:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cobranza', '0004_resumenantiguedad'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rubro',
+            index=models.Index(condition=models.Q(('estado_rubro', 'NO_PAGADO')), fields=['linea_servicio', 'fecha_vencimiento'], include=('valor_total',), name='rubro_impago_linea_venc_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.11 on 2026-10-19 15:39
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cobranza', '0005_rubro_indice_impagos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PoliticaCobranza',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('modified_at', models.DateTimeField(auto_now=True)),
+                ('nombre', models.CharField(max_length=100, unique=True)),
+                ('dias_gracia', models.PositiveSmallIntegerField(default=0, help_text='Días tras el vencimiento antes de que un rubro cuente como vencido.')),
+                ('monto_minimo', models.DecimalField(decimal_places=2, default=0, help_text='Saldo vencido mínimo para suspender.', max_digits=12)),
+                ('cantidad_minima', models.PositiveSmallIntegerField(default=1, help_text='Cantidad mínima de rubros vencidos para suspender.', validators=[django.core.validators.MinValueValidator(1)])),
+            ],
+            options={
+                'verbose_name': 'Política de Cobranza',
+                'verbose_name_plural': 'Políticas de Cobranza',
+                'ordering': ['nombre'],
+            },
+        ),
+    ]
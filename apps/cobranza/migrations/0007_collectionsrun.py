@@ -0,0 +1,48 @@
+# Generated by Django 4.2.11 on 2026-10-19 15:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cobranza', '0006_politicacobranza'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CollectionsRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('modified_at', models.DateTimeField(auto_now=True)),
+                ('started_at', models.DateTimeField(help_text='Instante de evaluación usado para todas las líneas.')),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('EN_CURSO', 'En curso'), ('COMPLETADA', 'Completada'), ('ABANDONADA', 'Abandonada')], default='EN_CURSO', max_length=10)),
+                ('ultima_linea_id', models.BigIntegerField(default=0)),
+                ('procesadas', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('task_id', models.CharField(blank=True, max_length=255, null=True)),
+                ('lease_hasta', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Ejecución de Cobranza',
+                'verbose_name_plural': 'Ejecuciones de Cobranza',
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='collectionsrun',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'EN_CURSO')), fields=('status',), name='run_unica_en_curso'),
+        ),
+        migrations.AddField(
+            model_name='collectionsrequestlog',
+            name='run',
+            field=models.ForeignKey(blank=True, db_index=False, help_text='Ejecución del proceso periódico; vacío en las reevaluaciones por eventos.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='logs', to='cobranza.collectionsrun'),
+        ),
+        migrations.AddConstraint(
+            model_name='collectionsrequestlog',
+            constraint=models.UniqueConstraint(fields=('run', 'linea_servicio', 'started_at'), name='log_unico_por_run_linea'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.11 on 2026-10-19 16:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cobranza', '0007_collectionsrun'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='collectionsrequestlog',
+            index=models.Index(fields=['started_at', 'id'], name='log_started_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rubro',
+            index=models.Index(fields=['fecha_vencimiento', 'id'], name='rubro_vencimiento_idx'),
+        ),
+    ]
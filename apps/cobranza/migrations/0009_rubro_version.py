@@ -0,0 +1,18 @@
+# Generated by Django 4.2.11 on 2026-10-19 16:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cobranza', '0008_indices_admin'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rubro',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
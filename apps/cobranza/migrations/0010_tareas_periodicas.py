@@ -0,0 +1,37 @@
+import json
+
+from django.db import migrations
+
+# Copia congelada de apps.cobranza.beat.TAREAS_PERIODICAS: la migración no debe
+# cambiar si cambia la lista; las tareas nuevas las registra sincronizar_beat.
+TAREAS_PERIODICAS = (
+    ("Proceso Control Morosidad (cada 5 min)", "cobranza.proceso_control_morosidad", 5, "minutes"),
+    ("Mantenimiento de particiones de logs (diario)", "cobranza.mantener_particiones_logs", 1, "days"),
+    ("Archivo de rubros liquidados (diario)", "cobranza.archivar_rubros", 1, "days"),
+    ("Limpieza de resultados de tareas (diario)", "core.limpiar_resultados", 1, "days"),
+    ("Resumen de antigüedad de cartera (cada hora)", "cobranza.actualizar_resumen_antiguedad", 1, "hours"),
+)
+
+
+def registrar(apps, schema_editor):
+    """Registra las tareas periódicas (antes se hacía en CobranzaConfig.ready)."""
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    IntervalSchedule = apps.get_model("django_celery_beat", "IntervalSchedule")
+    for nombre, tarea, cada, periodo in TAREAS_PERIODICAS:
+        intervalo, _ = IntervalSchedule.objects.get_or_create(every=cada, period=periodo)
+        PeriodicTask.objects.get_or_create(
+            name=nombre,
+            defaults={"interval": intervalo, "task": tarea, "args": json.dumps([]), "enabled": True},
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cobranza', '0009_rubro_version'),
+        ('django_celery_beat', '0018_improve_crontab_helptext'),
+    ]
+
+    operations = [
+        migrations.RunPython(registrar, migrations.RunPython.noop),
+    ]
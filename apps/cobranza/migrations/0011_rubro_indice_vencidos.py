@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-19 16:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cobranza', '0010_tareas_periodicas'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rubro',
+            index=models.Index(condition=models.Q(('estado_rubro', 'VENCIDO')), fields=['linea_servicio', 'fecha_vencimiento'], include=('valor_total',), name='rubro_vencido_linea_venc_idx'),
+        ),
+    ]
@@ -1,7 +1,43 @@
 from django.db import models
 from django.core.exceptions import ValidationError
-from core.mixins import AuditDateModel
-from apps.lineas.models import LineaServicio
+from django.core.validators import MinValueValidator
+from core.mixins import AuditDateModel, CleanOnSaveModel, VersionedModel
+from apps.lineas.models import LineaServicio, EstadoLinea
+
+
+class PoliticaCobranza(AuditDateModel):
+    """
+    Reglas de suspensión asignables a clientes o líneas (la de la línea
+    prevalece). Sin política asignada rigen los valores COBRANZA_* de settings.
+    """
+
+    nombre = models.CharField(max_length=100, unique=True)
+    dias_gracia = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Días tras el vencimiento antes de que un rubro cuente como vencido.",
+    )
+    monto_minimo = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        help_text="Saldo vencido mínimo para suspender.",
+    )
+    cantidad_minima = models.PositiveSmallIntegerField(
+        default=1,
+        validators=[MinValueValidator(1)],
+        help_text="Cantidad mínima de rubros vencidos para suspender.",
+    )
+
+    class Meta:
+        verbose_name = "Política de Cobranza"
+        verbose_name_plural = "Políticas de Cobranza"
+        ordering = ["nombre"]
+
+    def __str__(self):
+        return (
+            f"{self.nombre} (gracia {self.dias_gracia} d, "
+            f"mín. ${self.monto_minimo} / {self.cantidad_minima} rubros)"
+        )
 
 
 class EstadoRubro(models.TextChoices):
@@ -11,7 +47,7 @@ class EstadoRubro(models.TextChoices):
     ANULADO = "ANULADO", "Anulado"
 
 
-class Rubro(AuditDateModel):
+class Rubro(CleanOnSaveModel, VersionedModel, AuditDateModel):
     linea_servicio = models.ForeignKey( 
         LineaServicio,
         on_delete=models.PROTECT,
@@ -31,6 +67,24 @@ class Rubro(AuditDateModel):
         verbose_name = "Rubro"
         verbose_name_plural = "Rubros"
         ordering = ["-fecha_vencimiento"]
+        indexes = [
+            # Rubros impagos por línea: la evaluación de morosidad solo lee estos
+            models.Index(
+                fields=["linea_servicio", "fecha_vencimiento"],
+                include=["valor_total"],
+                condition=models.Q(estado_rubro=EstadoRubro.NO_PAGADO),
+                name="rubro_impago_linea_venc_idx",
+            ),
+            # Rubros VENCIDO (pocos): el rollup de antigüedad los lee sin recorrer Rubro
+            models.Index(
+                fields=["linea_servicio", "fecha_vencimiento"],
+                include=["valor_total"],
+                condition=models.Q(estado_rubro=EstadoRubro.VENCIDO),
+                name="rubro_vencido_linea_venc_idx",
+            ),
+            # Listado del admin: ORDER BY fecha_vencimiento DESC, id DESC LIMIT n
+            models.Index(fields=["fecha_vencimiento", "id"], name="rubro_vencimiento_idx"),
+        ]
 
     def __str__(self):
         return (
@@ -50,9 +104,43 @@ class Rubro(AuditDateModel):
                 {"fecha_vencimiento": "La fecha de vencimiento debe ser posterior a la emisión."}
             )
 
-    def save(self, *args, **kwargs):
-        self.full_clean()
-        super().save(*args, **kwargs)
+
+class RubroArchivado(models.Model):
+    """
+    Rubro liquidado (PAGADO/ANULADO) movido fuera de la tabla de rubros vigentes.
+
+    Conserva el id original para que las URLs y referencias externas sigan
+    funcionando (ver apps.cobranza.archivo).
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    linea_servicio = models.ForeignKey(
+        LineaServicio,
+        on_delete=models.PROTECT,
+        related_name="rubros_archivados",
+    )
+    valor_total = models.DecimalField(max_digits=12, decimal_places=2)
+    estado_rubro = models.CharField(max_length=20, choices=EstadoRubro.choices)
+    fecha_emision = models.DateTimeField()
+    fecha_vencimiento = models.DateTimeField()
+    fecha_pago = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField()
+    modified_at = models.DateTimeField()
+    archivado_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Rubro archivado"
+        verbose_name_plural = "Rubros archivados"
+        ordering = ["-fecha_vencimiento"]
+        indexes = [
+            models.Index(fields=["fecha_vencimiento"], name="rubro_arch_vencimiento_idx"),
+        ]
+
+    def __str__(self):
+        return (
+            f"Rubro {self.id} (archivado) – Línea {self.linea_servicio_id} "
+            f"| ${self.valor_total} [{self.estado_rubro}]"
+        )
 
 
 class LogStatus(models.TextChoices):
@@ -66,14 +154,75 @@ class ActionTaken(models.TextChoices):
     UNSUSPEND = "UNSUSPEND", "Reactivado"
 
 
+class RunStatus(models.TextChoices):
+    EN_CURSO = "EN_CURSO", "En curso"
+    COMPLETADA = "COMPLETADA", "Completada"
+    ABANDONADA = "ABANDONADA", "Abandonada"
+
+
+class CollectionsRun(AuditDateModel):
+    """
+    Una ejecución del proceso de control de morosidad.
+
+    Guarda el punto de avance (última línea procesada, en orden de id) para que
+    un reintento o una nueva ejecución tras una caída continúe desde ahí. El
+    worker que la procesa renueva lease_hasta en cada lote; mientras no venza,
+    otro worker no puede tomarla.
+    """
+
+    started_at = models.DateTimeField(help_text="Instante de evaluación usado para todas las líneas.")
+    finished_at = models.DateTimeField(blank=True, null=True)
+    status = models.CharField(
+        max_length=10,
+        choices=RunStatus.choices,
+        default=RunStatus.EN_CURSO,
+    )
+    ultima_linea_id = models.BigIntegerField(default=0)
+    procesadas = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    task_id = models.CharField(max_length=255, blank=True, null=True)
+    lease_hasta = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = "Ejecución de Cobranza"
+        verbose_name_plural = "Ejecuciones de Cobranza"
+        ordering = ["-started_at"]
+        constraints = [
+            # Como mucho una ejecución en curso a la vez
+            models.UniqueConstraint(
+                fields=["status"],
+                condition=models.Q(status="EN_CURSO"),
+                name="run_unica_en_curso",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Ejecución {self.pk} | {self.started_at:%Y-%m-%d %H:%M} | {self.status}"
+
+
 class CollectionsRequestLog(models.Model):
-    """Registro de cada ejecución del proceso de cobranza por línea"""
+    """
+    Registro de cada ejecución del proceso de cobranza por línea.
+
+    En PostgreSQL la tabla está particionada por mes sobre started_at
+    (ver apps.cobranza.particiones).
+    """
 
     linea_servicio = models.ForeignKey(
         LineaServicio,
         on_delete=models.CASCADE,
         related_name="collection_logs",
     )
+    run = models.ForeignKey(
+        CollectionsRun,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="logs",
+        # Lo cubre el índice de log_unico_por_run_linea
+        db_index=False,
+        help_text="Ejecución del proceso periódico; vacío en las reevaluaciones por eventos.",
+    )
     started_at = models.DateTimeField()
     finished_at = models.DateTimeField(blank=True, null=True)
     status = models.CharField(
@@ -94,9 +243,58 @@ class CollectionsRequestLog(models.Model):
         verbose_name = "Log de Cobranza"
         verbose_name_plural = "Logs de Cobranza"
         ordering = ["-started_at"]
+        indexes = [
+            models.Index(fields=["linea_servicio", "-started_at"], name="log_linea_started_idx"),
+            # Listado del admin: ORDER BY started_at DESC, id DESC LIMIT n
+            models.Index(fields=["started_at", "id"], name="log_started_idx"),
+        ]
+        constraints = [
+            # Un log por línea y ejecución; started_at (clave de partición) es el de la ejecución
+            models.UniqueConstraint(
+                fields=["run", "linea_servicio", "started_at"],
+                name="log_unico_por_run_linea",
+            ),
+        ]
 
     def __str__(self):
         return (
             f"Log Línea {self.linea_servicio_id} "
             f"| {self.started_at:%Y-%m-%d %H:%M} | {self.status}"
         )
+
+
+class TramoAntiguedad(models.TextChoices):
+    POR_VENCER = "POR_VENCER", "Por vencer"
+    D0_30 = "0_30", "0-30 días"
+    D31_60 = "31_60", "31-60 días"
+    D61_90 = "61_90", "61-90 días"
+    D90_MAS = "90_MAS", "Más de 90 días"
+
+
+class ResumenAntiguedad(models.Model):
+    """
+    Snapshot diario de la cartera por tramo de antigüedad, estado del rubro y
+    estado de la línea (ver apps.cobranza.reportes).
+    """
+
+    fecha = models.DateField()
+    tramo = models.CharField(max_length=12, choices=TramoAntiguedad.choices)
+    estado_rubro = models.CharField(max_length=20, choices=EstadoRubro.choices)
+    estado_linea = models.CharField(max_length=20, choices=EstadoLinea.choices)
+    cantidad = models.PositiveIntegerField(default=0)
+    monto = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    actualizado_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Resumen de antigüedad"
+        verbose_name_plural = "Resúmenes de antigüedad"
+        ordering = ["-fecha", "tramo", "estado_rubro", "estado_linea"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["fecha", "tramo", "estado_rubro", "estado_linea"],
+                name="resumen_antiguedad_unico",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.fecha} | {self.tramo} | {self.estado_rubro}/{self.estado_linea}: {self.cantidad}"
@@ -0,0 +1,136 @@
+"""
+Particionado mensual de CollectionsRequestLog (PostgreSQL, RANGE sobre started_at).
+
+Cada mes vive en su propia tabla ``cobranza_collectionsrequestlog_pAAAAMM``.
+Los límites se calculan en la zona horaria del proyecto (TIME_ZONE). Una
+partición DEFAULT recoge cualquier fila fuera de rango para que un insert
+nunca falle; al crear la partición de ese mes, sus filas se mueven allí.
+"""
+import logging
+import re
+from datetime import datetime
+
+from django.db import connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+TABLA = "cobranza_collectionsrequestlog"
+PARTICION_DEFAULT = f"{TABLA}_default"
+_PATRON = re.compile(rf"^{TABLA}_p(\d{{4}})(\d{{2}})$")
+
+
+def inicio_mes(valor, meses=0):
+    """Primer instante del mes de ``valor`` (desplazado ``meses``) en hora local."""
+    valor = timezone.localtime(valor)
+    total = valor.year * 12 + valor.month - 1 + meses
+    return timezone.make_aware(datetime(total // 12, total % 12 + 1, 1))
+
+
+def nombre_particion(mes):
+    return f"{TABLA}_p{mes:%Y%m}"
+
+
+def esta_particionada(using="default"):
+    with connections[using].cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE relname = %s", [TABLA])
+        row = cursor.fetchone()
+    return bool(row) and row[0] == "p"
+
+
+def particiones_existentes(using="default"):
+    """Particiones mensuales adjuntas, como {inicio_mes: nombre}."""
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            WHERE p.relname = %s
+            """,
+            [TABLA],
+        )
+        nombres = [row[0] for row in cursor.fetchall()]
+
+    particiones = {}
+    for nombre in nombres:
+        match = _PATRON.match(nombre)
+        if match:
+            mes = timezone.make_aware(datetime(int(match[1]), int(match[2]), 1))
+            particiones[mes] = nombre
+    return particiones
+
+
+def crear_particion(mes, using="default"):
+    """Crea la partición del mes; devuelve False si ya existía."""
+    mes = inicio_mes(mes)
+    if mes in particiones_existentes(using):
+        return False
+
+    nombre = nombre_particion(mes)
+    hasta = inicio_mes(mes, 1)
+    with transaction.atomic(using=using), connections[using].cursor() as cursor:
+        cursor.execute(
+            f'CREATE TABLE "{nombre}" (LIKE "{TABLA}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+        )
+        # Filas que hayan caído en DEFAULT mientras la partición no existía
+        cursor.execute(
+            f"""
+            WITH movidas AS (
+                DELETE FROM "{PARTICION_DEFAULT}"
+                WHERE started_at >= %s AND started_at < %s
+                RETURNING *
+            )
+            INSERT INTO "{nombre}" SELECT * FROM movidas
+            """,
+            [mes, hasta],
+        )
+        cursor.execute(
+            f'ALTER TABLE "{TABLA}" ATTACH PARTITION "{nombre}" FOR VALUES FROM (%s) TO (%s)',
+            [mes, hasta],
+        )
+    logger.info("[COBRANZA] Partición %s creada.", nombre)
+    return True
+
+
+def asegurar_particiones(meses_adelante, desde=None, using="default"):
+    """Crea las particiones desde ``desde`` (por defecto, el mes actual) hasta N meses adelante."""
+    actual = inicio_mes(timezone.now())
+    mes = inicio_mes(desde) if desde else actual
+    creadas = []
+    while mes <= inicio_mes(actual, meses_adelante):
+        if crear_particion(mes, using=using):
+            creadas.append(nombre_particion(mes))
+        mes = inicio_mes(mes, 1)
+    return creadas
+
+
+def purgar_particiones(retencion_meses, archivar=False, using="default"):
+    """
+    Quita las particiones cuyo mes terminó antes del período de retención.
+
+    Se desadjunta la partición completa (sin DELETE masivo). Con ``archivar``
+    la tabla queda separada como ``..._archivo_pAAAAMM`` para exportarla; si
+    no, se elimina.
+    """
+    limite = inicio_mes(timezone.now(), -retencion_meses)
+    procesadas = []
+    for mes, nombre in sorted(particiones_existentes(using).items()):
+        if inicio_mes(mes, 1) > limite:
+            continue
+        with transaction.atomic(using=using), connections[using].cursor() as cursor:
+            cursor.execute(f'ALTER TABLE "{TABLA}" DETACH PARTITION "{nombre}"')
+            if archivar:
+                destino = nombre.replace(f"{TABLA}_p", f"{TABLA}_archivo_p")
+                cursor.execute(f'ALTER TABLE "{nombre}" RENAME TO "{destino}"')
+            else:
+                destino = None
+                cursor.execute(f'DROP TABLE "{nombre}"')
+        logger.info(
+            "[COBRANZA] Partición %s %s.",
+            nombre,
+            f"archivada como {destino}" if archivar else "eliminada",
+        )
+        procesadas.append(nombre)
+    return procesadas
@@ -0,0 +1,59 @@
+"""
+Rollup diario de antigüedad de cartera.
+
+Cada ejecución reescribe el snapshot del día con una agregación agrupada por
+estado de cartera; los días anteriores quedan congelados. El endpoint de
+reportes lee solo esta tabla, nunca Rubro.
+
+Es un recálculo completo de la cartera abierta, no incremental: el tramo de
+cada rubro cambia con el paso del tiempo y el estado de la línea cambia con
+escrituras masivas que no emiten señales, así que aplicar deltas exigiría
+guardar la contribución anterior de cada rubro. Para que no sea un scan de
+Rubro, cada estado se agrega por separado y lee solo su índice parcial
+(rubro_impago_linea_venc_idx / rubro_vencido_linea_venc_idx), que cubre
+línea, vencimiento y valor: los rubros liquidados no se tocan.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Case, CharField, Count, F, Sum, Value, When
+from django.utils import timezone
+
+from .models import Rubro, EstadoRubro, ResumenAntiguedad, TramoAntiguedad
+
+ESTADOS_CARTERA = (EstadoRubro.NO_PAGADO, EstadoRubro.VENCIDO)
+
+
+def tramo_antiguedad(now):
+    """Expresión SQL con el tramo de cada rubro según días desde el vencimiento."""
+    return Case(
+        When(fecha_vencimiento__gte=now, then=Value(TramoAntiguedad.POR_VENCER)),
+        When(fecha_vencimiento__gte=now - timedelta(days=30), then=Value(TramoAntiguedad.D0_30)),
+        When(fecha_vencimiento__gte=now - timedelta(days=60), then=Value(TramoAntiguedad.D31_60)),
+        When(fecha_vencimiento__gte=now - timedelta(days=90), then=Value(TramoAntiguedad.D61_90)),
+        default=Value(TramoAntiguedad.D90_MAS),
+        output_field=CharField(),
+    )
+
+
+def actualizar_resumen_antiguedad(now=None):
+    """Recalcula el snapshot del día de ``now``; devuelve las filas escritas."""
+    now = now or timezone.now()
+    fecha = timezone.localdate(now)
+
+    resumen = []
+    # Un estado por consulta: el filtro por igualdad permite usar el índice parcial
+    for estado in ESTADOS_CARTERA:
+        filas = (
+            Rubro.objects.filter(estado_rubro=estado)
+            .annotate(tramo=tramo_antiguedad(now))
+            .values("tramo", "estado_rubro", estado_linea=F("linea_servicio__estado_linea"))
+            .annotate(cantidad=Count("id"), monto=Sum("valor_total"))
+            .order_by()
+        )
+        resumen.extend(ResumenAntiguedad(fecha=fecha, **fila) for fila in filas)
+
+    with transaction.atomic():
+        ResumenAntiguedad.objects.filter(fecha=fecha).delete()
+        ResumenAntiguedad.objects.bulk_create(resumen)
+    return len(resumen)
@@ -1,8 +1,15 @@
 from rest_framework import serializers
-from .models import Rubro, CollectionsRequestLog
+from apps.lineas.cache import lineas
+from apps.lineas.models import LineaServicio
+from core.fields import CachedPrimaryKeyRelatedField
+from .models import Rubro, CollectionsRequestLog, ResumenAntiguedad, PoliticaCobranza
 
 
 class RubroSerializer(serializers.ModelSerializer):
+    linea_servicio = CachedPrimaryKeyRelatedField(
+        model_cache=lineas, queryset=LineaServicio.all_objects.all()
+    )
+
     class Meta:
         model = Rubro
         fields = [
@@ -13,10 +20,11 @@ class RubroSerializer(serializers.ModelSerializer):
             "fecha_emision",
             "fecha_vencimiento",
             "fecha_pago",
+            "version",
             "created_at",
             "modified_at",
         ]
-        read_only_fields = ["id", "created_at", "modified_at"]
+        read_only_fields = ["id", "version", "created_at", "modified_at"]
 
     def validate(self, attrs):
         fe = attrs.get("fecha_emision")
@@ -28,11 +36,27 @@ class RubroSerializer(serializers.ModelSerializer):
         return attrs
 
 
+class RubroHistoricoSerializer(serializers.Serializer):
+    """Rubro vigente o archivado, a partir de las filas de archivo.union_historica"""
+
+    id = serializers.IntegerField()
+    linea_servicio = serializers.IntegerField()
+    valor_total = serializers.DecimalField(max_digits=12, decimal_places=2)
+    estado_rubro = serializers.CharField()
+    fecha_emision = serializers.DateTimeField()
+    fecha_vencimiento = serializers.DateTimeField()
+    fecha_pago = serializers.DateTimeField(allow_null=True)
+    created_at = serializers.DateTimeField()
+    modified_at = serializers.DateTimeField()
+    archivado = serializers.BooleanField()
+
+
 class CollectionsRequestLogSerializer(serializers.ModelSerializer):
     class Meta:
         model = CollectionsRequestLog
         fields = [
             "id",
+            "run",
             "linea_servicio",
             "started_at",
             "finished_at",
@@ -42,3 +66,64 @@ class CollectionsRequestLogSerializer(serializers.ModelSerializer):
             "error_message",
         ]
         read_only_fields = fields
+
+
+class EstadoCuentaLineaSerializer(serializers.Serializer):
+    linea_id = serializers.IntegerField()
+    linea_numero = serializers.IntegerField()
+    estado_linea = serializers.CharField()
+    total_facturado = serializers.DecimalField(max_digits=14, decimal_places=2)
+    total_pagado = serializers.DecimalField(max_digits=14, decimal_places=2)
+    vencido = serializers.DecimalField(max_digits=14, decimal_places=2)
+    pendiente = serializers.DecimalField(max_digits=14, decimal_places=2)
+    proximo_vencimiento = serializers.DateTimeField(allow_null=True)
+
+
+class EstadoCuentaSerializer(serializers.Serializer):
+    cliente_id = serializers.IntegerField()
+    generado_at = serializers.DateTimeField()
+    total_facturado = serializers.DecimalField(max_digits=14, decimal_places=2)
+    total_pagado = serializers.DecimalField(max_digits=14, decimal_places=2)
+    vencido = serializers.DecimalField(max_digits=14, decimal_places=2)
+    pendiente = serializers.DecimalField(max_digits=14, decimal_places=2)
+    proximo_vencimiento = serializers.DateTimeField(allow_null=True)
+    lineas = EstadoCuentaLineaSerializer(many=True)
+
+
+class ResumenAntiguedadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ResumenAntiguedad
+        fields = [
+            "fecha",
+            "tramo",
+            "estado_rubro",
+            "estado_linea",
+            "cantidad",
+            "monto",
+            "actualizado_at",
+        ]
+        read_only_fields = fields
+
+
+class SimulacionCobranzaSerializer(serializers.Serializer):
+    """Parámetros de la simulación del proceso de cobranza"""
+
+    now = serializers.DateTimeField(required=False)
+    # Sin valor se usan los días de gracia de la política de cada línea
+    dias_gracia = serializers.IntegerField(required=False, min_value=0)
+    detalle = serializers.BooleanField(required=False, default=False)
+
+
+class PoliticaCobranzaSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PoliticaCobranza
+        fields = [
+            "id",
+            "nombre",
+            "dias_gracia",
+            "monto_minimo",
+            "cantidad_minima",
+            "created_at",
+            "modified_at",
+        ]
+        read_only_fields = ["id", "created_at", "modified_at"]
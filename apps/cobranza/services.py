@@ -0,0 +1,339 @@
+"""
+Evaluación de morosidad por lotes de líneas.
+
+Una sola consulta agregada por lote obtiene los rubros vencidos y el saldo de
+cada línea; los cambios de estado y saldo se escriben con un bulk_update y los
+logs con un bulk_create. La usan el proceso periódico, la reevaluación por
+eventos y cualquier endpoint o acción que necesite evaluar líneas.
+
+Las reglas (días de gracia, saldo y cantidad mínimos) salen de la
+PoliticaCobranza de la línea o de su cliente y se evalúan en esa misma
+consulta. simulate_lines recorre todas las líneas sin escribir, para saber qué
+haría el proceso con otro ``now`` o con otros días de gracia.
+"""
+import logging
+from collections import Counter
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from decimal import Decimal
+from itertools import islice
+from typing import Optional
+
+from celery.exceptions import SoftTimeLimitExceeded
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import (
+    BooleanField,
+    Case,
+    Count,
+    DateTimeField,
+    DecimalField,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    FilteredRelation,
+    IntegerField,
+    Q,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.db_router import replica_disponible
+
+from apps.lineas.cache import lineas as lineas_cache
+from apps.lineas.models import LineaServicio, EstadoLinea, ESTADOS_NO_GESTIONABLES
+from .estado_cuenta import invalidar_estado_cuenta
+from .models import EstadoRubro, CollectionsRequestLog, LogStatus, ActionTaken
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Decision:
+    """Resultado de evaluar una línea (aplicado o, en dry-run, solo calculado)."""
+
+    linea_id: int
+    estado_anterior: Optional[str]
+    estado_nuevo: Optional[str]
+    action: str
+    saldo: Optional[Decimal]
+    unpaid_count: int
+    status: str = LogStatus.SUCCESS
+    error_message: Optional[str] = None
+
+    def as_dict(self):
+        datos = asdict(self)
+        datos["saldo"] = None if self.saldo is None else str(self.saldo)
+        return datos
+
+
+def lineas_gestionables():
+    return LineaServicio.objects.exclude(
+        estado_linea__in=list(ESTADOS_NO_GESTIONABLES)
+    )
+
+
+def en_lotes(ids, tamano):
+    ids = iter(ids)
+    while lote := list(islice(ids, tamano)):
+        yield lote
+
+
+def _decidir(linea):
+    """
+    Línea en mora según su política: suspende; sin mora, reactiva. Las
+    suspendidas por un operador (suspension_manual) no cambian de estado.
+    """
+    anterior = linea.estado_linea
+    saldo = linea.saldo or Decimal("0")
+    if linea.suspension_manual:
+        return anterior, ActionTaken.NONE, saldo
+    if linea.en_mora:
+        if anterior != EstadoLinea.SUSPENDIDO:
+            return EstadoLinea.SUSPENDIDO, ActionTaken.SUSPEND, saldo
+        return anterior, ActionTaken.NONE, saldo
+    if anterior == EstadoLinea.SUSPENDIDO:
+        return EstadoLinea.ACTIVO, ActionTaken.UNSUSPEND, saldo
+    return anterior, ActionTaken.NONE, saldo
+
+
+def _regla(campo, defecto, output_field):
+    """Valor de la política de la línea, si no la del cliente, si no el de settings."""
+    return Coalesce(
+        F(f"politica_cobranza__{campo}"),
+        F(f"cliente__politica_cobranza__{campo}"),
+        Value(defecto),
+        output_field=output_field,
+    )
+
+
+def _con_deuda_vencida(lineas, now, dias_gracia=None):
+    """
+    Anota unpaid_count, saldo y en_mora aplicando la política de cada línea
+    dentro de la misma consulta agregada. ``dias_gracia`` (simulaciones)
+    reemplaza los días de gracia de todas las políticas.
+    """
+    if dias_gracia is None:
+        gracia = _regla("dias_gracia", settings.COBRANZA_DIAS_GRACIA, IntegerField())
+    else:
+        gracia = Value(dias_gracia, output_field=IntegerField())
+
+    corte = ExpressionWrapper(
+        Value(now) - ExpressionWrapper(F("gracia") * Value(timedelta(days=1)), output_field=DurationField()),
+        output_field=DateTimeField(),
+    )
+    vencido = Q(impagos__fecha_vencimiento__lt=corte)
+    return (
+        lineas
+        # La condición va en el JOIN: PostgreSQL usa el índice parcial de impagos
+        .annotate(
+            impagos=FilteredRelation(
+                "rubros", condition=Q(rubros__estado_rubro=EstadoRubro.NO_PAGADO)
+            ),
+            gracia=gracia,
+            monto_minimo=_regla(
+                "monto_minimo",
+                settings.COBRANZA_MONTO_MINIMO,
+                DecimalField(max_digits=12, decimal_places=2),
+            ),
+            cantidad_minima=_regla("cantidad_minima", settings.COBRANZA_CANTIDAD_MINIMA, IntegerField()),
+        )
+        .annotate(
+            unpaid_count=Count("impagos", filter=vencido),
+            saldo=Sum("impagos__valor_total", filter=vencido),
+        )
+        .annotate(
+            en_mora=Case(
+                When(
+                    Q(unpaid_count__gt=0)
+                    & Q(unpaid_count__gte=F("cantidad_minima"))
+                    & Q(saldo__gte=F("monto_minimo")),
+                    then=Value(True),
+                ),
+                default=Value(False),
+                output_field=BooleanField(),
+            )
+        )
+        .only("id", "cliente", "estado_linea", "saldo_vencido", "suspension_manual")
+        .order_by("pk")
+    )
+
+
+def _decision(linea):
+    nuevo, action, saldo = _decidir(linea)
+    return Decision(
+        linea_id=linea.pk,
+        estado_anterior=linea.estado_linea,
+        estado_nuevo=nuevo,
+        action=action,
+        saldo=saldo,
+        unpaid_count=linea.unpaid_count,
+    )
+
+
+def _evaluar_lote(ids, now, dry_run, dias_gracia, run=None):
+    if not dry_run:
+        # PATCH y transicion_masiva también escriben estado_linea: se bloquean las
+        # filas antes de leerlas para no pisar un cambio hecho entre la lectura y el
+        # bulk_update. Va aparte porque FOR UPDATE no admite el GROUP BY del agregado.
+        list(
+            LineaServicio.objects.filter(pk__in=ids)
+            .select_for_update(of=("self",))
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+    lineas = _con_deuda_vencida(lineas_gestionables().filter(pk__in=ids), now, dias_gracia)
+
+    decisiones, modificadas, clientes = [], [], set()
+    for linea in lineas:
+        decision = _decision(linea)
+        decisiones.append(decision)
+        if decision.estado_nuevo != linea.estado_linea:
+            # El estado de cuenta cacheado muestra el estado de cada línea
+            clientes.add(linea.cliente_id)
+        if decision.estado_nuevo != linea.estado_linea or decision.saldo != linea.saldo_vencido:
+            linea.estado_linea = decision.estado_nuevo
+            linea.saldo_vencido = decision.saldo
+            linea.modified_at = now
+            linea.version = F("version") + 1
+            modificadas.append(linea)
+
+    if dry_run:
+        return decisiones
+
+    LineaServicio.objects.bulk_update(
+        modificadas, ["estado_linea", "saldo_vencido", "modified_at", "version"]
+    )
+    if modificadas:
+        # bulk_update no emite post_save
+        ids_modificados = [linea.pk for linea in modificadas]
+        transaction.on_commit(lambda: lineas_cache.invalidar(*ids_modificados))
+    if clientes:
+        transaction.on_commit(lambda: _invalidar_estados_cuenta(clientes))
+    finished_at = timezone.now()
+    # Dentro de una ejecución, un lote repetido no duplica logs (run, línea)
+    CollectionsRequestLog.objects.bulk_create(
+        (
+            CollectionsRequestLog(
+                run=run,
+                linea_servicio_id=d.linea_id,
+                started_at=now,
+                finished_at=finished_at,
+                status=LogStatus.SUCCESS,
+                unpaid_count=d.unpaid_count,
+                action_taken=d.action,
+            )
+            for d in decisiones
+        ),
+        ignore_conflicts=run is not None,
+    )
+
+    for d in decisiones:
+        if d.action == ActionTaken.SUSPEND:
+            logger.info(
+                "[COBRANZA] Línea %d SUSPENDIDA. Rubros vencidos: %d | Saldo: %s",
+                d.linea_id, d.unpaid_count, d.saldo,
+            )
+        elif d.action == ActionTaken.UNSUSPEND:
+            logger.info("[COBRANZA] Línea %d REACTIVADA. Sin deuda pendiente.", d.linea_id)
+    return decisiones
+
+
+def _invalidar_estados_cuenta(clientes):
+    for cliente_id in clientes:
+        invalidar_estado_cuenta(cliente_id)
+
+
+def _fallo(linea_id, exc, now, dry_run, run=None):
+    logger.exception("[COBRANZA] Error procesando línea %d: %s", linea_id, exc)
+    if not dry_run:
+        try:
+            CollectionsRequestLog.objects.bulk_create(
+                [
+                    CollectionsRequestLog(
+                        run=run,
+                        linea_servicio_id=linea_id,
+                        started_at=now,
+                        finished_at=timezone.now(),
+                        status=LogStatus.FAILED,
+                        error_message=str(exc),
+                    )
+                ],
+                ignore_conflicts=run is not None,
+            )
+        except Exception:
+            logger.exception("[COBRANZA] No se pudo registrar el error de la línea %d", linea_id)
+    return Decision(
+        linea_id=linea_id,
+        estado_anterior=None,
+        estado_nuevo=None,
+        action=ActionTaken.NONE,
+        saldo=None,
+        unpaid_count=0,
+        status=LogStatus.FAILED,
+        error_message=str(exc),
+    )
+
+
+def evaluate_lines(ids, now=None, dry_run=False, dias_gracia=None, run=None):
+    """
+    Evalúa las líneas indicadas (las no gestionables o inactivas se ignoran) y
+    devuelve una Decision por línea, ordenadas por id.
+
+    Con dry_run no escribe nada. Si el lote falla, se reintenta línea a línea
+    para que un error solo afecte a su línea, que queda con un log FAILED.
+    Con ``run`` los logs quedan asociados a esa CollectionsRun.
+    """
+    now = now or timezone.now()
+    ids = list(ids)
+    if not ids:
+        return []
+
+    try:
+        with transaction.atomic():
+            return _evaluar_lote(ids, now, dry_run, dias_gracia, run)
+    except SoftTimeLimitExceeded:
+        # Límite de la tarea: no es un fallo del lote, se corta acá
+        raise
+    except Exception as exc:
+        if len(ids) == 1:
+            return [_fallo(ids[0], exc, now, dry_run, run)]
+        logger.warning(
+            "[COBRANZA] Falló el lote de %d líneas (%s); se procesan de a una.", len(ids), exc
+        )
+
+    decisiones = []
+    for linea_id in ids:
+        try:
+            with transaction.atomic():
+                decisiones.extend(_evaluar_lote([linea_id], now, dry_run, dias_gracia, run))
+        except SoftTimeLimitExceeded:
+            raise
+        except Exception as exc:
+            decisiones.append(_fallo(linea_id, exc, now, dry_run, run))
+    return decisiones
+
+
+def simulate_lines(now=None, dias_gracia=None):
+    """
+    Genera la Decision de cada línea gestionable como si el proceso corriera en
+    ``now``, sin escribir nada. Es una única consulta agregada leída por
+    bloques; va a la réplica si está disponible.
+    """
+    now = now or timezone.now()
+    alias = settings.DATABASE_REPLICA_ALIAS if replica_disponible() else DEFAULT_DB_ALIAS
+    lineas = _con_deuda_vencida(lineas_gestionables().using(alias), now, dias_gracia)
+    for linea in lineas.iterator(chunk_size=2000):
+        yield _decision(linea)
+
+
+def resumen_por_accion(decisiones):
+    """
+    Cantidad por ActionTaken (todas las acciones, aunque sea con 0). Acepta
+    Decisions o directamente sus acciones.
+    """
+    conteo = Counter(getattr(d, "action", d) for d in decisiones)
+    return {action.value: conteo.get(action, 0) for action in ActionTaken}
@@ -0,0 +1,52 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.lineas.cache import lineas as lineas_cache
+from apps.lineas.models import LineaServicio
+from .models import PoliticaCobranza, Rubro
+
+
+@receiver(post_save, sender=Rubro)
+@receiver(post_delete, sender=Rubro)
+def rubro_modificado(sender, instance, origin=None, **kwargs):
+    """
+    Al confirmarse la escritura invalida el estado de cuenta del cliente y
+    programa la reevaluación de cobranza de la línea.
+
+    Los borrados masivos por queryset (p. ej. el archivo de rubros, que no
+    cambia los totales) no pasan por aquí para no cargar la línea de cada fila.
+    """
+    from .estado_cuenta import invalidar_estado_cuenta
+    from .tasks import programar_reevaluacion
+
+    if origin is not None and origin is not instance:
+        return
+    linea_id = instance.linea_servicio_id
+    # La línea cargada o, si no, desde el ModelCache: sin consulta por cada save()
+    if Rubro._meta.get_field("linea_servicio").is_cached(instance):
+        cliente_id = instance.linea_servicio.cliente_id
+    else:
+        cliente_id = lineas_cache.get(linea_id).cliente_id
+    transaction.on_commit(lambda: invalidar_estado_cuenta(cliente_id))
+    transaction.on_commit(lambda: programar_reevaluacion(linea_id))
+
+
+@receiver(post_save, sender=LineaServicio)
+def linea_modificada(sender, instance, created=False, **kwargs):
+    """El estado de cuenta cacheado incluye el estado de cada línea del cliente"""
+    from .estado_cuenta import invalidar_estado_cuenta
+
+    if created:
+        return
+    cliente_id = instance.cliente_id
+    transaction.on_commit(lambda: invalidar_estado_cuenta(cliente_id))
+
+
+@receiver(post_save, sender=PoliticaCobranza)
+@receiver(post_delete, sender=PoliticaCobranza)
+def politica_modificada(sender, instance, **kwargs):
+    """Las políticas forman parte de /api/catalogos/"""
+    from core.catalogos import invalidar_catalogos
+
+    transaction.on_commit(invalidar_catalogos)
@@ -1,7 +1,6 @@
 import logging
 from celery import shared_task
-from django.db import transaction
-from django.db.models import Sum, Q
+from celery.exceptions import SoftTimeLimitExceeded
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
@@ -11,107 +10,144 @@ logger = logging.getLogger(__name__)
     bind=True,
     max_retries=3,
     default_retry_delay=60,
+    # El resultado (contadores) se consulta tras ejecutar-cobranza
+    ignore_result=False,
     name="cobranza.proceso_control_morosidad",
 )
-def proceso_control_morosidad(self):
-    """ Tarea periódica (cada 5 min) que evalúa el estado de morosidad de todas las líneas activas y actualiza su estado"""
-    from apps.lineas.models import LineaServicio, EstadoLinea, ESTADOS_NO_GESTIONABLES
-    from apps.cobranza.models import (
-        Rubro,
-        EstadoRubro,
-        CollectionsRequestLog,
-        LogStatus,
-        ActionTaken,
+def proceso_control_morosidad(self, run_id=None):
+    """ Tarea periódica (cada 5 min) que evalúa el estado de morosidad de todas las líneas activas y actualiza su estado.
+
+    Avanza por lotes dentro de una CollectionsRun: cada lote se confirma junto
+    con su checkpoint, así un reintento o una nueva ejecución tras una caída
+    continúan desde la última línea confirmada en lugar de empezar de cero.
+    """
+    from django.conf import settings
+    from django.db import transaction
+    from apps.cobranza import ejecuciones
+    from apps.cobranza.services import evaluate_lines, en_lotes, lineas_gestionables
+
+    run = ejecuciones.tomar_ejecucion(
+        task_id=self.request.id, run_id=run_id, total=lineas_gestionables().count()
+    )
+    if run is None:
+        return {"processed": 0, "timestamp": str(timezone.now()), "run": None}
+
+    # El ``now`` de la ejecución: al reanudar se evalúa igual que al empezar
+    now = run.started_at
+    logger.info(
+        "[COBRANZA] Inicio de proceso. Ejecución: %d | Timestamp: %s | Desde línea: %d",
+        run.pk, now, run.ultima_linea_id,
     )
-
-    now = timezone.now()
-    logger.info("[COBRANZA] Inicio de proceso. Timestamp: %s", now)
 
     lineas = (
-        LineaServicio.objects.select_related("cliente")
-        .filter(is_active=True)
-        .exclude(estado_linea__in=list(ESTADOS_NO_GESTIONABLES))
+        lineas_gestionables()
+        .filter(pk__gt=run.ultima_linea_id)
+        .order_by("pk")
+        .values_list("pk", flat=True)
     )
+    logger.info("[COBRANZA] Líneas a procesar: %d", run.total - run.procesadas)
 
-    total = lineas.count()
-    logger.info("[COBRANZA] Líneas a procesar: %d", total)
-
-    for linea in lineas:
-        log = CollectionsRequestLog(
-            linea_servicio=linea,
-            started_at=now,
-            status=LogStatus.SUCCESS,
+    lote = settings.COBRANZA_LOTE_LINEAS
+    try:
+        for ids in en_lotes(lineas.iterator(chunk_size=lote), lote):
+            with transaction.atomic():
+                evaluate_lines(ids, now, run=run)
+                ejecuciones.registrar_avance(run, ids[-1], len(ids))
+    except SoftTimeLimitExceeded:
+        # Sin reintento: la próxima ejecución programada continúa desde el checkpoint
+        ejecuciones.liberar_ejecucion(run)
+        logger.warning(
+            "[COBRANZA] Ejecución %d cortada por límite de tiempo en la línea %d (%d procesadas).",
+            run.pk, run.ultima_linea_id, run.procesadas,
+        )
+        return {"processed": run.procesadas, "timestamp": str(now), "run": run.pk, "completa": False}
+    except Exception as exc:
+        ejecuciones.liberar_ejecucion(run)
+        logger.exception(
+            "[COBRANZA] Ejecución %d interrumpida en la línea %d: %s", run.pk, run.ultima_linea_id, exc
+        )
+        raise self.retry(exc=exc, kwargs={"run_id": run.pk})
+
+    ejecuciones.completar_ejecucion(run)
+    logger.info("[COBRANZA] Proceso finalizado. Total procesadas: %d", run.procesadas)
+    return {"processed": run.procesadas, "timestamp": str(now), "run": run.pk, "completa": True}
+
+
+def clave_reevaluacion(linea_id):
+    return f"cobranza:reevaluar:{linea_id}"
+
+
+def programar_reevaluacion(linea_id):
+    """
+    Encola reevaluar_linea para la línea dentro de COBRANZA_REEVALUACION_DEBOUNCE
+    segundos. Si ya hay una pendiente no encola otra: una ráfaga de cambios
+    sobre la misma línea se resuelve con una sola evaluación.
+    """
+    from django.conf import settings
+    from django.core.cache import cache
+
+    debounce = settings.COBRANZA_REEVALUACION_DEBOUNCE
+    clave = clave_reevaluacion(linea_id)
+    # La clave caduca sola por si el mensaje se pierde antes de ejecutarse
+    if not cache.add(clave, 1, debounce + 60):
+        return False
+    try:
+        reevaluar_linea.apply_async(args=[linea_id], countdown=debounce)
+    except Exception as exc:
+        cache.delete(clave)
+        logger.warning(
+            "[COBRANZA] No se pudo programar la reevaluación de la línea %d: %s", linea_id, exc
         )
+        return False
+    return True
 
-        try:
-            with transaction.atomic():
-                rubros_vencidos = Rubro.objects.filter(
-                    linea_servicio=linea,
-                    estado_rubro=EstadoRubro.NO_PAGADO,
-                    fecha_vencimiento__lt=now,
-                )
-
-                unpaid_count = rubros_vencidos.count()
-                saldo = rubros_vencidos.aggregate(total=Sum("valor_total"))["total"] or 0
-
-                log.unpaid_count = unpaid_count
-
-                linea.saldo_vencido = saldo
-
-                action = ActionTaken.NONE
-
-                if unpaid_count > 0:
-                    if linea.estado_linea != EstadoLinea.SUSPENDIDO:
-                        LineaServicio.objects.filter(pk=linea.pk).update(
-                            estado_linea=EstadoLinea.SUSPENDIDO,
-                            saldo_vencido=saldo,
-                            modified_at=now,
-                        )
-                        action = ActionTaken.SUSPEND
-                        logger.info(
-                            "[COBRANZA] Línea %d SUSPENDIDA. Rubros vencidos: %d | Saldo: %s",
-                            linea.pk, unpaid_count, saldo,
-                        )
-                    else:
-                        LineaServicio.objects.filter(pk=linea.pk).update(
-                            saldo_vencido=saldo,
-                            modified_at=now,
-                        )
-                        logger.debug(
-                            "[COBRANZA] Línea %d ya suspendida. Saldo actualizado: %s",
-                            linea.pk, saldo,
-                        )
-                else:
-                    if linea.estado_linea == EstadoLinea.SUSPENDIDO:
-                        LineaServicio.objects.filter(pk=linea.pk).update(
-                            estado_linea=EstadoLinea.ACTIVO,
-                            saldo_vencido=0,
-                            modified_at=now,
-                        )
-                        action = ActionTaken.UNSUSPEND
-                        logger.info(
-                            "[COBRANZA] Línea %d REACTIVADA. Sin deuda pendiente.",
-                            linea.pk,
-                        )
-                    else:
-                        LineaServicio.objects.filter(pk=linea.pk).update(
-                            saldo_vencido=0,
-                            modified_at=now,
-                        )
-
-                log.action_taken = action
-                log.finished_at = timezone.now()
-                log.status = LogStatus.SUCCESS
-                log.save()
-
-        except Exception as exc:
-            logger.exception(
-                "[COBRANZA] Error procesando línea %d: %s", linea.pk, exc
-            )
-            log.status = LogStatus.FAILED
-            log.error_message = str(exc)
-            log.finished_at = timezone.now()
-            log.save()
-
-    logger.info("[COBRANZA] Proceso finalizado. Total procesadas: %d", total)
-    return {"processed": total, "timestamp": str(now)}
+
+@shared_task(name="cobranza.reevaluar_linea")
+def reevaluar_linea(linea_id):
+    """Reevalúa una línea tras cambios en sus rubros, sin esperar al proceso periódico"""
+    from django.core.cache import cache
+    from apps.cobranza.services import evaluate_lines
+
+    # Antes de leer: un cambio que llegue durante la evaluación programa otra
+    cache.delete(clave_reevaluacion(linea_id))
+
+    decisiones = evaluate_lines([linea_id], timezone.now())
+    if not decisiones:
+        return {"linea": linea_id, "action": None}
+    return {"linea": linea_id, "action": decisiones[0].action}
+
+
+@shared_task(name="cobranza.mantener_particiones_logs")
+def mantener_particiones_logs():
+    """Tarea diaria: crea las particiones futuras de logs y purga las vencidas"""
+    from django.conf import settings
+    from apps.cobranza import particiones
+
+    if not particiones.esta_particionada():
+        logger.warning("[COBRANZA] La tabla de logs no está particionada; nada que mantener.")
+        return {"creadas": [], "purgadas": []}
+
+    creadas = particiones.asegurar_particiones(settings.COBRANZA_LOGS_MESES_ADELANTE)
+    purgadas = particiones.purgar_particiones(
+        settings.COBRANZA_LOGS_RETENCION_MESES,
+        archivar=settings.COBRANZA_LOGS_ARCHIVAR,
+    )
+    return {"creadas": creadas, "purgadas": purgadas}
+
+
+@shared_task(name="cobranza.archivar_rubros")
+def archivar_rubros():
+    """Tarea diaria: mueve los rubros liquidados antiguos a RubroArchivado"""
+    from apps.cobranza import archivo
+
+    total = archivo.archivar_rubros()
+    return {"archivados": total}
+
+
+@shared_task(name="cobranza.actualizar_resumen_antiguedad")
+def actualizar_resumen_antiguedad():
+    """Tarea horaria: recalcula el snapshot de antigüedad de cartera del día"""
+    from apps.cobranza import reportes
+
+    filas = reportes.actualizar_resumen_antiguedad()
+    return {"filas": filas}
@@ -1,8 +1,15 @@
 from rest_framework.routers import DefaultRouter
-from .views import RubroViewSet, CollectionsRequestLogViewSet
+from .views import (
+    RubroViewSet,
+    CollectionsRequestLogViewSet,
+    ResumenAntiguedadViewSet,
+    PoliticaCobranzaViewSet,
+)
 
 router = DefaultRouter()
 router.register(r"rubros", RubroViewSet, basename="rubro")
 router.register(r"cobranza-logs", CollectionsRequestLogViewSet, basename="cobranza-log")
+router.register(r"politicas-cobranza", PoliticaCobranzaViewSet, basename="politica-cobranza")
+router.register(r"reportes/antiguedad", ResumenAntiguedadViewSet, basename="reporte-antiguedad")
 
 urlpatterns = router.urls
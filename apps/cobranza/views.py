@@ -1,28 +1,127 @@
+import json
+
+from django.db.models import BooleanField, Value
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+from django_filters.utils import translate_validation
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.settings import api_settings
+
+from .models import (
+    Rubro,
+    RubroArchivado,
+    CollectionsRequestLog,
+    ResumenAntiguedad,
+    PoliticaCobranza,
+)
+from .serializers import (
+    RubroSerializer,
+    RubroHistoricoSerializer,
+    CollectionsRequestLogSerializer,
+    ResumenAntiguedadSerializer,
+    SimulacionCobranzaSerializer,
+    PoliticaCobranzaSerializer,
+)
+from .filters import (
+    RubroFilter,
+    RubroArchivadoFilter,
+    CollectionsRequestLogFilter,
+    ResumenAntiguedadFilter,
+)
+from core.viewsets import VersionETagMixin
 
-from .models import Rubro, CollectionsRequestLog
-from .serializers import RubroSerializer, CollectionsRequestLogSerializer
+from . import archivo, services
 from .tasks import proceso_control_morosidad
 
 
-class RubroViewSet(viewsets.ModelViewSet):
-    """CRUD de Rubros"""
+class RubroViewSet(VersionETagMixin, viewsets.ModelViewSet):
+    """
+    CRUD de Rubros. Updates con control optimista: ETag / If-Match.
+
+    Los rubros liquidados antiguos viven en RubroArchivado. El listado los
+    incluye cuando se pide un rango histórico (fecha_vencimiento_desde/hasta
+    anterior al corte de archivo) o con ?historico=true; el detalle los busca
+    allí si el id ya no está en la tabla vigente.
+    """
 
     queryset = Rubro.objects.select_related("linea_servicio").all()
     serializer_class = RubroSerializer
+    filterset_class = RubroFilter
 
     def get_permissions(self):
         if self.action == "destroy":
             return [IsAdminUser()]
-        return [IsAuthenticated()]
+        # Respeta permission_classes de las acciones (ejecutar/simular: solo admin)
+        return super().get_permissions()
 
     def update(self, request, *args, **kwargs):
         kwargs["partial"] = True
         return super().update(request, *args, **kwargs)
 
+    def _incluye_archivo(self, request):
+        if request.query_params.get("historico", "").lower() in ("1", "true"):
+            return True
+        filtro = RubroFilter(request.query_params, queryset=Rubro.objects.none())
+        if not filtro.is_valid():
+            return False
+        corte = archivo.fecha_corte()
+        desde = filtro.form.cleaned_data.get("fecha_vencimiento_desde")
+        hasta = filtro.form.cleaned_data.get("fecha_vencimiento_hasta")
+        return bool((desde and desde < corte) or (hasta and hasta <= corte))
+
+    def _filtrar(self, filterset_class, queryset):
+        filtro = filterset_class(self.request.query_params, queryset=queryset, request=self.request)
+        if not filtro.is_valid():
+            raise translate_validation(filtro.errors)
+        return filtro.qs
+
+    def _orden_historico(self, request):
+        """Términos de ?ordering= para la unión (con -id de desempate); None si alguno no aplica"""
+        param = request.query_params.get(api_settings.ORDERING_PARAM, "")
+        terminos = [t.strip() for t in param.split(",") if t.strip()]
+        if not terminos:
+            return archivo.ORDEN_HISTORICO
+        if any(t.lstrip("-") not in archivo.CAMPOS for t in terminos):
+            return None
+        if not any(t.lstrip("-") == "id" for t in terminos):
+            terminos.append("-id")
+        return terminos
+
+    def list(self, request, *args, **kwargs):
+        if not self._incluye_archivo(request):
+            return super().list(request, *args, **kwargs)
+
+        # Mismos filtros y orden en las dos ramas; el orden se aplica a la unión
+        orden = self._orden_historico(request)
+        if orden is None:
+            return Response(
+                {"ordering": f"En modo histórico solo se puede ordenar por: {', '.join(archivo.CAMPOS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        vigentes = self._filtrar(RubroFilter, self.get_queryset())
+        archivados = self._filtrar(RubroArchivadoFilter, RubroArchivado.objects.all())
+        queryset = archivo.union_historica(vigentes, archivados, orden)
+        page = self.paginate_queryset(queryset)
+        serializer = RubroHistoricoSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            archivado = (
+                RubroArchivado.objects.filter(pk=kwargs.get(self.lookup_field))
+                .values(*archivo.CAMPOS)
+                .annotate(archivado=Value(True, output_field=BooleanField()))
+                .first()
+            )
+            if archivado is None:
+                raise
+            return Response(RubroHistoricoSerializer(archivado).data)
+
     @action(detail=False, methods=["post"], url_path="ejecutar-cobranza",
             permission_classes=[IsAdminUser])
     def ejecutar_cobranza(self, request):
@@ -33,6 +132,42 @@ class RubroViewSet(viewsets.ModelViewSet):
             status=status.HTTP_202_ACCEPTED,
         )
 
+    @action(detail=False, methods=["get"], url_path="simular-cobranza",
+            permission_classes=[IsAdminUser])
+    def simular_cobranza(self, request):
+        """
+        Qué haría el proceso de morosidad en ``now`` (por defecto ahora), sin
+        escribir nada; ``dias_gracia`` reemplaza el de las políticas. Con
+        ``detalle=true`` transmite una decisión por línea en NDJSON y termina
+        con una línea de resumen.
+        """
+        params = SimulacionCobranzaSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        now = params.validated_data.get("now") or timezone.now()
+        dias_gracia = params.validated_data.get("dias_gracia")
+        decisiones = services.simulate_lines(now, dias_gracia)
+
+        if not params.validated_data["detalle"]:
+            por_accion = services.resumen_por_accion(decisiones)
+            return Response(
+                {
+                    "now": now,
+                    "dias_gracia": dias_gracia,
+                    "total": sum(por_accion.values()),
+                    "por_accion": por_accion,
+                }
+            )
+
+        def ndjson():
+            acciones = []
+            for decision in decisiones:
+                acciones.append(decision.action)
+                yield json.dumps(decision.as_dict()) + "\n"
+            por_accion = services.resumen_por_accion(acciones)
+            yield json.dumps({"total": len(acciones), "por_accion": por_accion}) + "\n"
+
+        return StreamingHttpResponse(ndjson(), content_type="application/x-ndjson")
+
 
 class CollectionsRequestLogViewSet(viewsets.ReadOnlyModelViewSet):
     """Logs de ejecución del proceso de cobranza"""
@@ -40,4 +175,44 @@ class CollectionsRequestLogViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = CollectionsRequestLog.objects.select_related("linea_servicio").all()
     serializer_class = CollectionsRequestLogSerializer
     permission_classes = [IsAuthenticated]
-    filterset_fields = ["linea_servicio", "status", "action_taken"]
+    filterset_class = CollectionsRequestLogFilter
+
+
+class ResumenAntiguedadViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Reporte de antigüedad de cartera (snapshots diarios precalculados).
+
+    Sin filtros de fecha devuelve el snapshot más reciente.
+    """
+
+    queryset = ResumenAntiguedad.objects.all()
+    serializer_class = ResumenAntiguedadSerializer
+    permission_classes = [IsAuthenticated]
+    filterset_class = ResumenAntiguedadFilter
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        params = self.request.query_params
+        if not {"fecha", "fecha_desde", "fecha_hasta"} & set(params):
+            ultima = ResumenAntiguedad.objects.order_by("-fecha").values("fecha")[:1]
+            queryset = queryset.filter(fecha=ultima)
+        return queryset
+
+
+class PoliticaCobranzaViewSet(viewsets.ModelViewSet):
+    """
+    Políticas de cobranza (días de gracia, saldo y cantidad mínimos).
+    Se asignan a clientes o líneas con su campo politica_cobranza.
+    """
+
+    queryset = PoliticaCobranza.objects.all()
+    serializer_class = PoliticaCobranzaSerializer
+
+    def get_permissions(self):
+        if self.action in ("list", "retrieve"):
+            return [IsAuthenticated()]
+        return [IsAdminUser()]
+
+    def update(self, request, *args, **kwargs):
+        kwargs["partial"] = True
+        return super().update(request, *args, **kwargs)
@@ -0,0 +1,26 @@
+from django.contrib import admin
+
+from core.admin import BaseAdmin
+from .models import HistorialEstadoLinea, LineaServicio
+
+
+@admin.register(LineaServicio)
+class LineaServicioAdmin(BaseAdmin):
+    list_display = ("id", "cliente", "linea_numero", "estado_linea", "saldo_vencido", "is_active")
+    list_filter = ("estado_linea", "is_active")
+    search_fields = ("cliente__identificacion__exact", "cliente__razon_social")
+    search_ids = ("pk",)
+    list_select_related = ("cliente",)
+    autocomplete_fields = ("cliente", "politica_cobranza")
+    readonly_fields = ("saldo_vencido",)
+    ordering = ("-pk",)
+
+
+@admin.register(HistorialEstadoLinea)
+class HistorialEstadoLineaAdmin(BaseAdmin):
+    list_display = ("created_at", "linea_servicio", "estado_anterior", "estado_nuevo", "usuario", "motivo")
+    list_filter = ("estado_nuevo",)
+    list_select_related = ("linea_servicio__cliente", "usuario")
+    raw_id_fields = ("linea_servicio", "usuario")
+    # El orden de la PK sigue al de created_at y no necesita otro índice
+    ordering = ("-pk",)
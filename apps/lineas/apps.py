@@ -5,3 +5,7 @@ class LineasConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.lineas"
     verbose_name = "Líneas de Servicio"
+
+    def ready(self):
+        """Registra el ModelCache (invalidación al guardar/eliminar)"""
+        from . import cache  # noqa: F401
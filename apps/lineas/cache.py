@@ -0,0 +1,5 @@
+from core.model_cache import ModelCache
+
+from .models import LineaServicio
+
+lineas = ModelCache(LineaServicio)
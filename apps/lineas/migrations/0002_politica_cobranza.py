@@ -0,0 +1,20 @@
+# Generated by Django 4.2.11 on 2026-10-19 15:39
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cobranza', '0006_politicacobranza'),
+        ('lineas', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lineaservicio',
+            name='politica_cobranza',
+            field=models.ForeignKey(blank=True, help_text='Prevalece sobre la política del cliente.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='lineas', to='cobranza.politicacobranza'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.11 on 2026-10-19 15:45
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('lineas', '0002_politica_cobranza'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HistorialEstadoLinea',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('modified_at', models.DateTimeField(auto_now=True)),
+                ('estado_anterior', models.CharField(choices=[('NO_INSTALADO', 'No Instalado'), ('ACTIVO', 'Activo'), ('SUSPENDIDO', 'Suspendido'), ('CANCELADO', 'Cancelado')], max_length=20)),
+                ('estado_nuevo', models.CharField(choices=[('NO_INSTALADO', 'No Instalado'), ('ACTIVO', 'Activo'), ('SUSPENDIDO', 'Suspendido'), ('CANCELADO', 'Cancelado')], max_length=20)),
+                ('motivo', models.CharField(blank=True, max_length=255)),
+                ('linea_servicio', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='historial_estados', to='lineas.lineaservicio')),
+                ('usuario', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Historial de Estado de Línea',
+                'verbose_name_plural': 'Historial de Estados de Línea',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['linea_servicio', '-created_at'], name='historial_linea_fecha_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.11 on 2026-10-19 15:48
+
+from django.db import migrations, models
+import django.db.models.manager
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lineas', '0003_historialestadolinea'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='lineaservicio',
+            options={'default_manager_name': 'all_objects', 'ordering': ['cliente', 'linea_numero'], 'verbose_name': 'Línea de Servicio', 'verbose_name_plural': 'Líneas de Servicio'},
+        ),
+        migrations.AlterModelManagers(
+            name='lineaservicio',
+            managers=[
+                ('all_objects', django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='lineaservicio',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['cliente', 'linea_numero'], name='linea_activa_cliente_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lineaservicio',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['estado_linea'], name='linea_activa_estado_idx'),
+        ),
+    ]
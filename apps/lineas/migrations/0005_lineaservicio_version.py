@@ -0,0 +1,18 @@
+# Generated by Django 4.2.11 on 2026-10-19 16:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lineas', '0004_lineaservicio_activas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lineaservicio',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.11 on 2026-10-19 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lineas', '0005_lineaservicio_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lineaservicio',
+            name='suspension_manual',
+            field=models.BooleanField(default=False, help_text='Suspendida por un operador (no por mora): la cobranza no la reactiva.'),
+        ),
+    ]
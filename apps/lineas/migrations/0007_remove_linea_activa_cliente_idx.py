@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-19 16:39
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lineas', '0006_lineaservicio_suspension_manual'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='lineaservicio',
+            name='linea_activa_cliente_idx',
+        ),
+    ]
@@ -1,6 +1,9 @@
+from django.conf import settings
 from django.db import models
 from django.core.exceptions import ValidationError
-from core.mixins import AuditDateModel
+from core.mixins import ActiveManager, AuditDateModel, CleanOnSaveModel, VersionedModel
+from core.model_cache import desde_cache
+from apps.clientes.cache import clientes
 from apps.clientes.models import Cliente
 
 
@@ -12,8 +15,16 @@ class EstadoLinea(models.TextChoices):
 
 ESTADOS_NO_GESTIONABLES = {EstadoLinea.NO_INSTALADO, EstadoLinea.CANCELADO}
 
+# Estados a los que puede pasar una línea desde cada estado (CANCELADO es final)
+TRANSICIONES_ESTADO = {
+    EstadoLinea.NO_INSTALADO: {EstadoLinea.ACTIVO, EstadoLinea.CANCELADO},
+    EstadoLinea.ACTIVO: {EstadoLinea.SUSPENDIDO, EstadoLinea.CANCELADO},
+    EstadoLinea.SUSPENDIDO: {EstadoLinea.ACTIVO, EstadoLinea.CANCELADO},
+    EstadoLinea.CANCELADO: set(),
+}
 
-class LineaServicio(AuditDateModel):
+
+class LineaServicio(CleanOnSaveModel, VersionedModel, AuditDateModel):
     cliente = models.ForeignKey(
         Cliente,
         on_delete=models.PROTECT,
@@ -35,39 +46,99 @@ class LineaServicio(AuditDateModel):
         help_text="Calculado automáticamente por la tarea de cobranza.",
     )
     is_active = models.BooleanField(default=True)
+    suspension_manual = models.BooleanField(
+        default=False,
+        help_text="Suspendida por un operador (no por mora): la cobranza no la reactiva.",
+    )
+    politica_cobranza = models.ForeignKey(
+        "cobranza.PoliticaCobranza",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="lineas",
+        help_text="Prevalece sobre la política del cliente.",
+    )
+
+    objects = ActiveManager()
+    all_objects = models.Manager()
 
     class Meta:
         verbose_name = "Línea de Servicio"
         verbose_name_plural = "Líneas de Servicio"
         unique_together = ("cliente", "linea_numero")
         ordering = ["cliente", "linea_numero"]
+        default_manager_name = "all_objects"
+        # (cliente, linea_numero) ya lo cubre el índice de unique_together
+        indexes = [
+            models.Index(
+                fields=["estado_linea"],
+                condition=models.Q(is_active=True),
+                name="linea_activa_estado_idx",
+            ),
+        ]
 
     def __str__(self):
-        return f"Línea {self.linea_numero} – {self.cliente.razon_social} [{self.estado_linea}]"
+        return f"Línea {self.linea_numero} – {self._cliente().razon_social} [{self.estado_linea}]"
+
+    def _cliente(self):
+        """
+        El cliente ya cargado o, si no, desde el ModelCache (sin consulta si está
+        cacheado). Solo para mostrar: puede estar desactualizado, no validar con él.
+        """
+        if self._meta.get_field("cliente").is_cached(self):
+            return self.cliente
+        return clientes.get(self.cliente_id)
 
     def clean(self):
         if self.linea_numero is not None and self.linea_numero < 1:
             raise ValidationError({"linea_numero": "El número de línea debe ser >= 1."})
 
         if self.estado_linea == EstadoLinea.ACTIVO and self.cliente_id:
-            try:
-                cliente = Cliente.objects.get(pk=self.cliente_id)
-                if not cliente.is_active:
-                    raise ValidationError(
-                        {
-                            "estado_linea": (
-                                "No se puede activar una línea de un cliente inactivo."
-                            )
-                        }
-                    )
-            except Cliente.DoesNotExist:
-                pass
-
-    def save(self, *args, **kwargs):
-        self.full_clean()
-        super().save(*args, **kwargs)
+            cliente = self.cliente if self._meta.get_field("cliente").is_cached(self) else None
+            # Se relee si no está cargado o si la instancia cargada salió del ModelCache
+            if cliente is None or desde_cache(cliente):
+                cliente = Cliente.all_objects.only("is_active").filter(pk=self.cliente_id).first()
+            if cliente is not None and not cliente.is_active:
+                raise ValidationError(
+                    {
+                        "estado_linea": (
+                            "No se puede activar una línea de un cliente inactivo."
+                        )
+                    }
+                )
 
     def delete(self, using=None, keep_parents=False):
         """Soft delete"""
         self.is_active = False
-        self.save(update_fields=["is_active", "modified_at"])
+        self.save(update_fields=["is_active", "modified_at"], skip_clean=True)
+
+
+class HistorialEstadoLinea(AuditDateModel):
+    """Cambio de estado de una línea hecho por una transición masiva"""
+
+    linea_servicio = models.ForeignKey(
+        LineaServicio,
+        on_delete=models.CASCADE,
+        related_name="historial_estados",
+    )
+    estado_anterior = models.CharField(max_length=20, choices=EstadoLinea.choices)
+    estado_nuevo = models.CharField(max_length=20, choices=EstadoLinea.choices)
+    usuario = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    motivo = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        verbose_name = "Historial de Estado de Línea"
+        verbose_name_plural = "Historial de Estados de Línea"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["linea_servicio", "-created_at"], name="historial_linea_fecha_idx"),
+        ]
+
+    def __str__(self):
+        return f"Línea {self.linea_servicio_id}: {self.estado_anterior} → {self.estado_nuevo}"
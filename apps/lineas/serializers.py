@@ -1,10 +1,15 @@
 from rest_framework import serializers
 from django.db import IntegrityError
+from core.fields import CachedPrimaryKeyRelatedField
 from .models import LineaServicio, EstadoLinea
+from apps.clientes.cache import clientes
 from apps.clientes.models import Cliente
 
 
 class LineaServicioSerializer(serializers.ModelSerializer):
+    cliente = CachedPrimaryKeyRelatedField(
+        model_cache=clientes, queryset=Cliente.all_objects.all(), campos_frescos=["is_active"]
+    )
     cliente_razon_social = serializers.CharField(
         source="cliente.razon_social", read_only=True
     )
@@ -20,10 +25,22 @@ class LineaServicioSerializer(serializers.ModelSerializer):
             "fecha_instalacion",
             "saldo_vencido",
             "is_active",
+            "suspension_manual",
+            "politica_cobranza",
+            "version",
             "created_at",
             "modified_at",
         ]
-        read_only_fields = ["id", "saldo_vencido", "created_at", "modified_at"]
+        read_only_fields = [
+            "id",
+            "saldo_vencido",
+            "suspension_manual",
+            "version",
+            "created_at",
+            "modified_at",
+        ]
+        # Sin esto un alta por formulario (sin la casilla) crearía el registro inactivo
+        extra_kwargs = {"is_active": {"default": True}}
 
     def validate_linea_numero(self, value):
         if value < 1:
@@ -42,6 +59,11 @@ class LineaServicioSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 {"estado_linea": "No se puede activar una línea de un cliente inactivo."}
             )
+        # Cambio de estado por un operador: igual que la transición masiva
+        if "estado_linea" in attrs and (
+            self.instance is None or attrs["estado_linea"] != self.instance.estado_linea
+        ):
+            attrs["suspension_manual"] = attrs["estado_linea"] == EstadoLinea.SUSPENDIDO
         return attrs
 
     def validate_cliente(self, value):
@@ -50,3 +72,20 @@ class LineaServicioSerializer(serializers.ModelSerializer):
                 "No se puede asociar una línea a un cliente inactivo."
             )
         return value
+
+
+class TransicionMasivaSerializer(serializers.Serializer):
+    """Líneas (por ``ids`` o por ``filtros`` del listado) y estado destino"""
+
+    estado_linea = serializers.ChoiceField(choices=EstadoLinea.choices)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, allow_empty=False
+    )
+    # Mismos parámetros que el filtro de /api/lineas/ (cliente_id, estado_linea, is_active)
+    filtros = serializers.DictField(required=False, allow_empty=False)
+    motivo = serializers.CharField(required=False, allow_blank=True, max_length=255, default="")
+
+    def validate(self, attrs):
+        if ("ids" in attrs) == ("filtros" in attrs):
+            raise serializers.ValidationError("Indique ids o filtros (uno de los dos).")
+        return attrs
@@ -0,0 +1,133 @@
+"""
+Transiciones de estado masivas de líneas (cortes por zona, bajas en lote).
+
+Por lote: una consulta bloquea las líneas y trae lo necesario para validar las
+reglas (estado actual, baja lógica, cliente activo), un UPDATE aplica el
+cambio a las que lo admiten y un bulk_create deja el HistorialEstadoLinea.
+Evita el full_clean() y la consulta al cliente de cada save().
+"""
+import logging
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .cache import lineas as lineas_cache
+from .models import LineaServicio, EstadoLinea, HistorialEstadoLinea, TRANSICIONES_ESTADO
+
+logger = logging.getLogger(__name__)
+
+APLICADA = "APLICADA"
+SIN_CAMBIO = "SIN_CAMBIO"
+RECHAZADA = "RECHAZADA"
+NO_ENCONTRADA = "NO_ENCONTRADA"
+RESULTADOS = (APLICADA, SIN_CAMBIO, RECHAZADA, NO_ENCONTRADA)
+
+
+def _resultado(linea_id, resultado, anterior=None, nuevo=None, detalle=None):
+    return {
+        "linea_id": linea_id,
+        "resultado": resultado,
+        "estado_anterior": anterior,
+        "estado_nuevo": nuevo,
+        "detalle": detalle,
+    }
+
+
+def _rechazo(estado, destino, linea_activa, cliente_activo):
+    if not linea_activa:
+        return "La línea se encuentra eliminada."
+    if destino not in TRANSICIONES_ESTADO[estado]:
+        return f"Transición no permitida: {estado} → {destino}."
+    if destino == EstadoLinea.ACTIVO and not cliente_activo:
+        return "No se puede activar una línea de un cliente inactivo."
+    return None
+
+
+def _transicionar_lote(ids, destino, usuario, motivo):
+    # all_objects: una línea eliminada se informa como rechazada, no como inexistente
+    filas = (
+        LineaServicio.all_objects.filter(pk__in=ids)
+        .select_for_update(of=("self",))
+        .order_by("pk")
+        .values_list("pk", "estado_linea", "is_active", "cliente_id", "cliente__is_active")
+    )
+    resultados, aplicar, clientes = {}, [], set()
+    for linea_id, estado, linea_activa, cliente_id, cliente_activo in filas:
+        if estado == destino:
+            resultados[linea_id] = _resultado(linea_id, SIN_CAMBIO, estado, estado)
+            continue
+        detalle = _rechazo(estado, destino, linea_activa, cliente_activo)
+        if detalle:
+            resultados[linea_id] = _resultado(linea_id, RECHAZADA, estado, estado, detalle)
+            continue
+        resultados[linea_id] = _resultado(linea_id, APLICADA, estado, destino)
+        aplicar.append((linea_id, estado))
+        clientes.add(cliente_id)
+
+    if aplicar:
+        LineaServicio.objects.filter(pk__in=[linea_id for linea_id, _ in aplicar]).update(
+            estado_linea=destino,
+            # Una suspensión de operador no la deshace la cobranza; otro destino la libera
+            suspension_manual=destino == EstadoLinea.SUSPENDIDO,
+            modified_at=timezone.now(),
+            version=F("version") + 1,
+        )
+        HistorialEstadoLinea.objects.bulk_create(
+            HistorialEstadoLinea(
+                linea_servicio_id=linea_id,
+                estado_anterior=estado,
+                estado_nuevo=destino,
+                usuario=usuario,
+                motivo=motivo,
+            )
+            for linea_id, estado in aplicar
+        )
+        ids_aplicados = [linea_id for linea_id, _ in aplicar]
+        transaction.on_commit(lambda: lineas_cache.invalidar(*ids_aplicados))
+        transaction.on_commit(lambda: _invalidar_estados_cuenta(clientes))
+
+    return [resultados.get(i) or _resultado(i, NO_ENCONTRADA) for i in ids]
+
+
+def _invalidar_estados_cuenta(clientes):
+    from apps.cobranza.estado_cuenta import invalidar_estado_cuenta
+
+    for cliente_id in clientes:
+        invalidar_estado_cuenta(cliente_id)
+
+
+def transicion_masiva(destino, ids=None, queryset=None, usuario=None, motivo=""):
+    """
+    Lleva a ``destino`` las líneas indicadas (``ids``) o las del ``queryset`` y
+    devuelve un resultado por línea, ordenados por id. Cada lote de
+    LINEAS_TRANSICION_LOTE líneas va en su propia transacción.
+    """
+    if ids is not None:
+        pendientes = iter(sorted(set(ids)))
+    else:
+        pendientes = queryset.order_by("pk").values_list("pk", flat=True).iterator(
+            chunk_size=settings.LINEAS_TRANSICION_LOTE
+        )
+
+    resultados = []
+    while lote := list(islice(pendientes, settings.LINEAS_TRANSICION_LOTE)):
+        with transaction.atomic():
+            resultados.extend(_transicionar_lote(lote, destino, usuario, motivo))
+
+    aplicadas = sum(1 for r in resultados if r["resultado"] == APLICADA)
+    logger.info(
+        "[LINEAS] Transición masiva a %s: %d de %d líneas aplicadas.",
+        destino, aplicadas, len(resultados),
+    )
+    return resultados
+
+
+def resumen_resultados(resultados):
+    """Cantidad de líneas por resultado (todos, aunque sea con 0)."""
+    conteo = {resultado: 0 for resultado in RESULTADOS}
+    for r in resultados:
+        conteo[r["resultado"]] += 1
+    return conteo
@@ -1,7 +1,19 @@
+from django.conf import settings
+from django.urls import path
 from rest_framework.routers import DefaultRouter
-from .views import LineaServicioViewSet
+from .views import LineaServicioViewSet, estado_cobranza_async
 
 router = DefaultRouter()
 router.register(r"lineas", LineaServicioViewSet, basename="linea")
 
 urlpatterns = router.urls
+
+if settings.ASYNC_VIEWS:
+    # Precede a la ruta del router
+    urlpatterns = [
+        path(
+            "lineas/<int:pk>/estado-cobranza/",
+            estado_cobranza_async,
+            name="linea-estado-cobranza-async",
+        ),
+    ] + urlpatterns
@@ -1,25 +1,42 @@
-from rest_framework import viewsets, status
+import asyncio
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from rest_framework import viewsets, status, exceptions
 from rest_framework.decorators import action
+from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.settings import api_settings
 from django.db import IntegrityError
+from django.http import HttpResponse
+from django.utils import timezone
+
+from core.renderers import ORJSONRenderer
+from core.viewsets import IncludeInactiveMixin, VersionETagMixin, incluye_inactivos
 
 from .models import LineaServicio
-from .serializers import LineaServicioSerializer
+from .serializers import LineaServicioSerializer, TransicionMasivaSerializer
 from .filters import LineaServicioFilter
+from . import services
 
 
-class LineaServicioViewSet(viewsets.ModelViewSet):
-    """ CRUD de Líneas de Servicio"""
+class LineaServicioViewSet(IncludeInactiveMixin, VersionETagMixin, viewsets.ModelViewSet):
+    """
+    CRUD de Líneas de Servicio (las eliminadas solo con ?include_inactive=1).
+    Updates con control optimista: ETag / If-Match.
+    """
 
-    queryset = LineaServicio.objects.select_related("cliente").all()
+    queryset = LineaServicio.all_objects.select_related("cliente").all()
     serializer_class = LineaServicioSerializer
+    permission_classes = [IsAuthenticated]
     filterset_class = LineaServicioFilter
 
     def get_permissions(self):
         if self.action == "destroy":
             return [IsAdminUser()]
-        return [IsAuthenticated()]
+        # Respeta permission_classes de las acciones (transición masiva: solo admin)
+        return super().get_permissions()
 
     def create(self, request, *args, **kwargs):
         try:
@@ -47,38 +64,164 @@ class LineaServicioViewSet(viewsets.ModelViewSet):
                 {"detail": "La línea ya se encuentra eliminada."},
                 status=status.HTTP_409_CONFLICT,
             )
-        instance.delete()
+        self.perform_destroy(instance)
         return Response(
             {"detail": "Línea eliminada lógicamente."},
             status=status.HTTP_200_OK,
         )
 
+    @action(detail=False, methods=["post"], url_path="transicion-masiva",
+            permission_classes=[IsAdminUser])
+    def transicion_masiva(self, request):
+        """
+        Lleva muchas líneas a un estado de una vez (suspensión por zona, bajas
+        en lote). Valida las transiciones, el cliente activo y la baja lógica;
+        devuelve el resultado de cada línea y un resumen.
+        """
+        params = TransicionMasivaSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        datos = params.validated_data
+
+        queryset = None
+        if "filtros" in datos:
+            # Un filtro desconocido se ignoraría y la transición alcanzaría a todas las líneas
+            desconocidos = set(datos["filtros"]) - set(LineaServicioFilter.base_filters)
+            if desconocidos:
+                return Response(
+                    {"filtros": f"Filtros no soportados: {', '.join(sorted(desconocidos))}."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            filtro = LineaServicioFilter(datos["filtros"], queryset=LineaServicio.objects.all())
+            if not filtro.is_valid():
+                return Response({"filtros": filtro.errors}, status=status.HTTP_400_BAD_REQUEST)
+            queryset = filtro.qs
+
+        resultados = services.transicion_masiva(
+            datos["estado_linea"],
+            ids=datos.get("ids"),
+            queryset=queryset,
+            usuario=request.user,
+            motivo=datos["motivo"],
+        )
+        return Response(
+            {
+                "estado_linea": datos["estado_linea"],
+                "total": len(resultados),
+                "por_resultado": services.resumen_resultados(resultados),
+                "resultados": resultados,
+            }
+        )
+
     @action(detail=True, methods=["get"], url_path="estado-cobranza")
     def estado_cobranza(self, request, pk=None):
         """Resumen de cobranza de la línea"""
-        from apps.cobranza.models import Rubro, CollectionsRequestLog, EstadoRubro
-        from apps.cobranza.serializers import CollectionsRequestLogSerializer
-        from django.utils import timezone
-
         linea = self.get_object()
+        no_pagados, logs, recientes = _consultas_estado_cobranza(linea.id, timezone.now())
 
-        unpaid_count = Rubro.objects.filter(
-            linea_servicio=linea,
-            estado_rubro=EstadoRubro.NO_PAGADO,
-            fecha_vencimiento__lt=timezone.now(),
-        ).count()
+        ultimos = list(recientes[:10])
+        if len(ultimos) < 10:
+            ultimos = list(logs[:10])
 
-        logs = CollectionsRequestLog.objects.filter(linea_servicio=linea).order_by(
-            "-started_at"
-        )[:10]
+        return Response(_resumen_cobranza(linea, no_pagados.count(), ultimos))
 
-        return Response(
-            {
-                "linea_id": linea.id,
-                "linea_numero": linea.linea_numero,
-                "estado_linea": linea.estado_linea,
-                "saldo_vencido": str(linea.saldo_vencido),
-                "unpaid_count": unpaid_count,
-                "ultimos_logs": CollectionsRequestLogSerializer(logs, many=True).data,
-            }
-        )
+
+def _consultas_estado_cobranza(linea_id, now):
+    from apps.cobranza.models import Rubro, CollectionsRequestLog, EstadoRubro
+
+    no_pagados = Rubro.objects.filter(
+        linea_servicio_id=linea_id,
+        estado_rubro=EstadoRubro.NO_PAGADO,
+        fecha_vencimiento__lt=now,
+    )
+    logs = CollectionsRequestLog.objects.filter(linea_servicio_id=linea_id).order_by(
+        "-started_at"
+    )
+    # Con la tarea cada 5 min, los últimos 10 logs caen en el último día:
+    # acotar started_at deja a PostgreSQL leer solo la partición reciente.
+    recientes = logs.filter(started_at__gte=now - timedelta(days=1))
+    return no_pagados, logs, recientes
+
+
+def _resumen_cobranza(linea, unpaid_count, ultimos):
+    from apps.cobranza.serializers import CollectionsRequestLogSerializer
+
+    return {
+        "linea_id": linea.id,
+        "linea_numero": linea.linea_numero,
+        "estado_linea": linea.estado_linea,
+        "saldo_vencido": str(linea.saldo_vencido),
+        "unpaid_count": unpaid_count,
+        "ultimos_logs": CollectionsRequestLogSerializer(ultimos, many=True).data,
+    }
+
+
+def _json(data, status_code=200, **headers):
+    return HttpResponse(
+        ORJSONRenderer().render(data),
+        status=status_code,
+        content_type="application/json",
+        headers=headers,
+    )
+
+
+async def _autenticar(request):
+    """Autentica con las clases de DRF; devuelve una respuesta de error o None"""
+    autenticadores = [clase() for clase in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    drf_request = Request(request, authenticators=autenticadores)
+    try:
+        # JWTAuthentication consulta el usuario en la BD: va a un hilo
+        user = await sync_to_async(lambda: drf_request.user)()
+    except exceptions.AuthenticationFailed as exc:
+        error = exc
+    else:
+        if user and user.is_authenticated:
+            return None
+        error = exceptions.NotAuthenticated()
+
+    headers = {}
+    if autenticadores:
+        headers["WWW-Authenticate"] = autenticadores[0].authenticate_header(drf_request)
+    return _json({"detail": error.detail}, status.HTTP_401_UNAUTHORIZED, **headers)
+
+
+async def _listar(queryset):
+    return [obj async for obj in queryset]
+
+
+# La acción de DRF tal como la registra el router
+_estado_cobranza_drf = LineaServicioViewSet.as_view(
+    {"get": "estado_cobranza"},
+    basename="linea",
+    detail=True,
+    **LineaServicioViewSet.estado_cobranza.kwargs,
+)
+
+
+async def estado_cobranza_async(request, pk):
+    """
+    Versión async de LineaServicioViewSet.estado_cobranza para ASGI.
+
+    Las tres consultas son independientes y se lanzan juntas; mientras esperan,
+    el worker sigue atendiendo a otros clientes que consultan el estado. Solo
+    GET es async: HEAD, OPTIONS y el 405 (con Allow) los responde la acción de
+    DRF, igual que sin ASYNC_VIEWS.
+    """
+    if request.method != "GET":
+        return await sync_to_async(_estado_cobranza_drf)(request, pk=pk)
+    error = await _autenticar(request)
+    if error is not None:
+        return error
+
+    lineas = LineaServicio.all_objects if incluye_inactivos(request.GET) else LineaServicio.objects
+    no_pagados, logs, recientes = _consultas_estado_cobranza(pk, timezone.now())
+    linea, unpaid_count, ultimos = await asyncio.gather(
+        lineas.filter(pk=pk).afirst(),
+        no_pagados.acount(),
+        _listar(recientes[:10]),
+    )
+    if linea is None:
+        return _json({"detail": "No encontrado."}, status.HTTP_404_NOT_FOUND)
+    if len(ultimos) < 10:
+        ultimos = await _listar(logs[:10])
+
+    return _json(_resumen_cobranza(linea, unpaid_count, ultimos))
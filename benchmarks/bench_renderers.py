@@ -0,0 +1,96 @@
+"""
+Benchmark: JSONRenderer de DRF vs ORJSONRenderer sobre una página de 1.000 rubros.
+
+Uso:
+    python benchmarks/bench_renderers.py [--filas 1000] [--repeticiones 50]
+
+No necesita base de datos: los rubros se construyen en memoria y se serializan
+con RubroSerializer, igual que en GET /api/rubros/.
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.utils import timezone  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from apps.cobranza.models import Rubro, EstadoRubro  # noqa: E402
+from apps.cobranza.serializers import RubroSerializer  # noqa: E402
+from core.renderers import ORJSONRenderer  # noqa: E402
+
+
+def construir_pagina(filas):
+    ahora = timezone.localtime()
+    estados = list(EstadoRubro)
+    rubros = [
+        Rubro(
+            id=i,
+            linea_servicio_id=i % 300 + 1,
+            valor_total=Decimal(i % 997) + Decimal("0.99"),
+            estado_rubro=estados[i % len(estados)],
+            fecha_emision=ahora - timedelta(days=30, minutes=i),
+            fecha_vencimiento=ahora - timedelta(minutes=i),
+            fecha_pago=ahora if i % 2 else None,
+            created_at=ahora,
+            modified_at=ahora,
+        )
+        for i in range(1, filas + 1)
+    ]
+    return {
+        "count": filas,
+        "next": None,
+        "previous": None,
+        "results": RubroSerializer(rubros, many=True).data,
+    }
+
+
+def construir_exportacion(filas):
+    """Filas con Decimal/datetime crudos, como en un export vía .values()."""
+    ahora = timezone.localtime()
+    return [
+        {
+            "id": i,
+            "linea_servicio_id": i % 300 + 1,
+            "valor_total": Decimal(i % 997) + Decimal("0.99"),
+            "saldo_vencido": Decimal("12.30"),
+            "fecha_vencimiento": ahora - timedelta(minutes=i),
+        }
+        for i in range(1, filas + 1)
+    ]
+
+
+def medir(nombre, data, repeticiones):
+    estandar, rapido = JSONRenderer(), ORJSONRenderer()
+    assert estandar.render(data) == rapido.render(data), "la salida debe ser idéntica"
+
+    t_std = min(timeit.repeat(lambda: estandar.render(data), number=repeticiones, repeat=3))
+    t_orj = min(timeit.repeat(lambda: rapido.render(data), number=repeticiones, repeat=3))
+    ms_std = t_std / repeticiones * 1000
+    ms_orj = t_orj / repeticiones * 1000
+    print(f"{nombre:<24} json: {ms_std:8.3f} ms   orjson: {ms_orj:8.3f} ms   x{ms_std / ms_orj:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filas", type=int, default=1000)
+    parser.add_argument("--repeticiones", type=int, default=50)
+    args = parser.parse_args()
+
+    medir(f"página rubros ({args.filas})", construir_pagina(args.filas), args.repeticiones)
+    medir(f"export crudo ({args.filas})", construir_exportacion(args.filas), args.repeticiones)
+
+
+if __name__ == "__main__":
+    main()
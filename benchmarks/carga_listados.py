@@ -0,0 +1,115 @@
+"""
+Prueba de carga sobre los endpoints de listado (requests/s y latencias).
+
+Uso:
+    python benchmarks/carga_listados.py --url http://localhost:8000 \\
+        --usuario admin --password admin [--concurrencia 16] [--duracion 20]
+
+Se ejecuta dos veces contra el mismo entorno para comparar servidores, p.ej.:
+    python manage.py runserver 0.0.0.0:8000 --noreload     # antes
+    gunicorn core.wsgi:application                          # después
+
+Solo usa la librería estándar: cada hilo mantiene su propia conexión HTTP
+keep-alive y recorre los endpoints en orden.
+"""
+import argparse
+import http.client
+import json
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+ENDPOINTS = (
+    "/api/clientes/",
+    "/api/lineas/",
+    "/api/rubros/",
+    "/api/cobranza-logs/",
+)
+
+
+def obtener_token(url, usuario, password):
+    partes = urlsplit(url)
+    conn = http.client.HTTPConnection(partes.hostname, partes.port or 80, timeout=10)
+    cuerpo = json.dumps({"username": usuario, "password": password})
+    conn.request("POST", "/api/auth/token/", cuerpo, {"Content-Type": "application/json"})
+    respuesta = conn.getresponse()
+    datos = respuesta.read()
+    if respuesta.status != 200:
+        raise SystemExit(f"No se pudo obtener el token ({respuesta.status}): {datos[:200]!r}")
+    return json.loads(datos)["access"]
+
+
+def trabajador(url, token, endpoints, fin, resultados, errores):
+    partes = urlsplit(url)
+    cabeceras = {"Authorization": f"Bearer {token}", "Connection": "keep-alive"}
+    conn = http.client.HTTPConnection(partes.hostname, partes.port or 80, timeout=30)
+    latencias = []
+    fallos = 0
+    i = 0
+    while time.perf_counter() < fin:
+        ruta = endpoints[i % len(endpoints)]
+        i += 1
+        inicio = time.perf_counter()
+        try:
+            conn.request("GET", ruta, headers=cabeceras)
+            respuesta = conn.getresponse()
+            respuesta.read()
+            if respuesta.status != 200:
+                fallos += 1
+                continue
+        except (OSError, http.client.HTTPException):
+            fallos += 1
+            conn.close()
+            conn = http.client.HTTPConnection(partes.hostname, partes.port or 80, timeout=30)
+            continue
+        latencias.append(time.perf_counter() - inicio)
+    conn.close()
+    resultados.extend(latencias)
+    errores.append(fallos)
+
+
+def percentil(valores, p):
+    return valores[min(len(valores) - 1, int(len(valores) * p))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--usuario", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrencia", type=int, default=16)
+    parser.add_argument("--duracion", type=float, default=20.0, help="Segundos de carga")
+    parser.add_argument("--endpoint", action="append", dest="endpoints", help="Repetible; por defecto todos los listados")
+    args = parser.parse_args()
+
+    endpoints = args.endpoints or ENDPOINTS
+    token = obtener_token(args.url, args.usuario, args.password)
+
+    resultados, errores = [], []
+    fin = time.perf_counter() + args.duracion
+    hilos = [
+        threading.Thread(target=trabajador, args=(args.url, token, endpoints, fin, resultados, errores))
+        for _ in range(args.concurrencia)
+    ]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    transcurrido = time.perf_counter() - inicio
+
+    if not resultados:
+        raise SystemExit(f"Ninguna petición tuvo éxito ({sum(errores)} errores).")
+
+    resultados.sort()
+    print(f"{len(resultados)} peticiones OK, {sum(errores)} errores en {transcurrido:.1f} s "
+          f"({args.concurrencia} conexiones, {len(endpoints)} endpoints)")
+    print(f"  requests/s : {len(resultados) / transcurrido:8.1f}")
+    print(f"  p50        : {statistics.median(resultados) * 1000:8.1f} ms")
+    print(f"  p95        : {percentil(resultados, 0.95) * 1000:8.1f} ms")
+    print(f"  p99        : {percentil(resultados, 0.99) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Base de los ModelAdmin de tablas grandes (rubros, logs, líneas).
+
+El changelist del admin hace dos COUNT(*) por página: el del listado filtrado
+y el total. BaseAdmin omite el total (show_full_result_count) y usa
+EstimatedCountPaginator para el primero.
+
+La búsqueda por ids va en ``search_ids`` y no en search_fields: ``=id`` es
+``UPPER(id::text) = UPPER(...)``, que ningún índice resuelve.
+"""
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+
+
+def estimar_filas(model, using="default"):
+    """
+    Filas estimadas de la tabla según las estadísticas de PostgreSQL
+    (pg_class.reltuples; en una tabla particionada, la suma de sus particiones).
+    None si no hay estimación.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT CASE WHEN c.relkind = 'p' THEN (
+                SELECT SUM(GREATEST(h.reltuples, 0))
+                FROM pg_inherits i JOIN pg_class h ON h.oid = i.inhrelid
+                WHERE i.inhparent = c.oid
+            ) ELSE GREATEST(c.reltuples, 0) END
+            FROM pg_class c
+            WHERE c.oid = %s::regclass
+            """,
+            [connection.ops.quote_name(model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    return int(row[0]) if row and row[0] is not None else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Sin filtros usa la estimación de estimar_filas() si supera
+    ADMIN_CONTEO_MAXIMO; por debajo cuenta. Con filtros (búsqueda, list_filter,
+    date_hierarchy) cuenta como mucho ADMIN_CONTEO_MAXIMO filas: las páginas
+    más allá no se ofrecen, se llega a ellas afinando el filtro.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet):
+            return super().count
+        maximo = settings.ADMIN_CONTEO_MAXIMO
+        if not queryset.query.where:
+            estimado = estimar_filas(queryset.model, using=queryset.db)
+            if estimado is not None and estimado > maximo:
+                return estimado
+            return queryset.count()
+        return queryset.order_by()[:maximo].count()
+
+
+# Mayor valor de un bigint: un término más largo no es un id
+_ID_MAXIMO = 2**63 - 1
+
+
+class BaseAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+    # Campos enteros (pk, FKs) comparados con el término solo si es numérico
+    search_ids = ()
+
+    def get_search_fields(self, request):
+        # Con solo search_ids también se muestra el buscador
+        return super().get_search_fields(request) or self.search_ids
+
+    def get_search_results(self, request, queryset, search_term):
+        if not self.search_ids:
+            return super().get_search_results(request, queryset, search_term)
+        termino = search_term.strip()
+        if not termino:
+            return queryset, False
+        if self.search_fields:
+            resultado, duplicados = super().get_search_results(request, queryset, search_term)
+        else:
+            resultado, duplicados = queryset.none(), False
+        if termino.isascii() and termino.isdigit() and int(termino) <= _ID_MAXIMO:
+            por_id = reduce(or_, (Q(**{campo: int(termino)}) for campo in self.search_ids))
+            resultado = resultado | queryset.filter(por_id)
+        return resultado, duplicados
@@ -0,0 +1,12 @@
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+# Bajo ASGI se sirven las versiones async de los endpoints de sondeo
+os.environ.setdefault("ASYNC_VIEWS", "True")
+# Django 4.2 bajo ASGI ejecuta el ORM síncrono de cada petición en un hilo
+# nuevo: una conexión persistente nunca se reutiliza y queda abierta hasta
+# agotar max_connections. Se cierran al terminar cada petición; el pooling
+# lo hace pgbouncer (DB_PGBOUNCER).
+os.environ["DB_CONN_MAX_AGE"] = "0"
+application = get_asgi_application()
@@ -0,0 +1,78 @@
+"""
+Catálogos para los clientes de la API: valores posibles de los estados y
+acciones, transiciones de línea permitidas y políticas de cobranza.
+
+Cambian solo con un deploy o al editar una política, así que se sirven desde
+la caché compartida; las señales de PoliticaCobranza la invalidan y la clave
+lleva el id de la release.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import path
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from core.db_router import usar_primaria
+from core.release import id_release
+
+CACHE_KEY = "catalogos:{}"
+
+
+def _opciones(choices):
+    return [{"valor": valor, "nombre": str(nombre)} for valor, nombre in choices.choices]
+
+
+def construir_catalogos():
+    from apps.cobranza.models import (
+        ActionTaken,
+        EstadoRubro,
+        LogStatus,
+        PoliticaCobranza,
+        RunStatus,
+    )
+    from apps.lineas.models import EstadoLinea, TRANSICIONES_ESTADO
+
+    politicas = PoliticaCobranza.objects.order_by("nombre").values(
+        "id", "nombre", "dias_gracia", "monto_minimo", "cantidad_minima"
+    )
+    return {
+        "estados_linea": _opciones(EstadoLinea),
+        "transiciones_linea": {
+            origen.value: sorted(destino.value for destino in destinos)
+            for origen, destinos in TRANSICIONES_ESTADO.items()
+        },
+        "estados_rubro": _opciones(EstadoRubro),
+        "acciones_cobranza": _opciones(ActionTaken),
+        "estados_log": _opciones(LogStatus),
+        "estados_ejecucion": _opciones(RunStatus),
+        "politicas_cobranza": [
+            {**politica, "monto_minimo": str(politica["monto_minimo"])} for politica in politicas
+        ],
+    }
+
+
+def obtener_catalogos(regenerar=False):
+    """Catálogos cacheados; regenerar=True los construye de nuevo y reemplaza los guardados"""
+    key = CACHE_KEY.format(id_release())
+    data = None if regenerar else cache.get(key)
+    if data is None:
+        with usar_primaria():
+            data = construir_catalogos()
+        cache.set(key, data, settings.CACHE_CATALOGOS_TTL)
+    return data
+
+
+def invalidar_catalogos():
+    cache.delete(CACHE_KEY.format(id_release()))
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def catalogos(request):
+    return Response(obtener_catalogos())
+
+
+urlpatterns = [
+    path("", catalogos, name="catalogos"),
+]
@@ -1,8 +1,49 @@
+import logging
 import os
 from celery import Celery
+from celery.signals import worker_init, worker_process_init
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
+logger = logging.getLogger(__name__)
+
 app = Celery("isp_service")
 app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
+
+
+def calentar_conexiones(**kwargs):
+    """Abre por adelantado las conexiones a BD de cada proceso del worker"""
+    from django.db import connections
+
+    for conn in connections.all():
+        try:
+            conn.ensure_connection()
+        except Exception as exc:
+            logger.warning("No se pudo abrir la conexión '%s': %s", conn.alias, exc)
+
+
+@worker_init.connect
+def _registrar_calentamiento(**kwargs):
+    # Se registra aquí, después del fixup de Django de Celery, para correr
+    # tras el cierre de las conexiones heredadas del proceso padre.
+    worker_process_init.connect(calentar_conexiones, weak=False)
+
+
+@app.task(name="core.limpiar_resultados")
+def limpiar_resultados():
+    """Tarea diaria: borra los resultados de tareas vencidos (result_expires)"""
+    from django.apps import apps
+
+    expira = app.conf.result_expires
+    # Backend de BD: borra los vencidos. Redis: no hace nada, caducan por TTL.
+    app.backend.cleanup()
+    borrados = 0
+    if apps.is_installed("django_celery_results"):
+        from django_celery_results.models import GroupResult, TaskResult
+
+        # Restos en la BD aunque el backend actual sea otro
+        for modelo in (TaskResult, GroupResult):
+            borrados += modelo.objects.get_all_expired(expira).delete()[0]
+    logger.info("Resultados de tareas vencidos eliminados: %d", borrados)
+    return {"borrados": borrados}
@@ -0,0 +1,104 @@
+"""
+Enrutado de lecturas a la réplica de PostgreSQL.
+
+Solo se lee de la réplica dentro de usar_replica() (el middleware lo activa en
+las peticiones GET/HEAD/OPTIONS; los reportes pueden usarlo explícitamente).
+Todo lo demás (escrituras, tareas Celery, lecturas dentro de una petición que
+escribe) va a la primaria. Si la réplica no está configurada o su retraso
+supera REPLICA_MAX_LAG_SECONDS, también se lee de la primaria.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger(__name__)
+
+_leer_de_replica = ContextVar("leer_de_replica", default=False)
+_retraso = {"segundos": None, "consultado_en": 0.0}
+
+
+@contextmanager
+def usar_replica():
+    token = _leer_de_replica.set(True)
+    try:
+        yield
+    finally:
+        _leer_de_replica.reset(token)
+
+
+@contextmanager
+def usar_primaria():
+    token = _leer_de_replica.set(False)
+    try:
+        yield
+    finally:
+        _leer_de_replica.reset(token)
+
+
+def replica_configurada():
+    return settings.DATABASE_REPLICA_ALIAS in settings.DATABASES
+
+
+def retraso_replica():
+    """Segundos de retraso de la réplica (None si no se pudo medir), cacheado por proceso."""
+    ahora = time.monotonic()
+    if ahora - _retraso["consultado_en"] < settings.REPLICA_LAG_CHECK_SECONDS:
+        return _retraso["segundos"]
+
+    segundos = None
+    try:
+        with connections[settings.DATABASE_REPLICA_ALIAS].cursor() as cursor:
+            # Sin walreceiver transmitiendo las dos LSN se detienen y parecerían
+            # iguales: NULL (se lee de la primaria). status es NULL sin
+            # pg_read_all_stats; entonces alcanza con que el proceso exista.
+            cursor.execute(
+                """
+                SELECT CASE
+                    WHEN NOT pg_is_in_recovery() THEN 0
+                    WHEN NOT EXISTS (
+                        SELECT 1 FROM pg_stat_wal_receiver
+                        WHERE COALESCE(status, 'streaming') = 'streaming'
+                    ) THEN NULL
+                    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+                END
+                """
+            )
+            valor = cursor.fetchone()[0]
+        if valor is None:
+            logger.warning("La réplica no está recibiendo WAL; se lee de la primaria.")
+        else:
+            segundos = float(valor)
+    except Exception as exc:
+        logger.warning("No se pudo medir el retraso de la réplica: %s", exc)
+
+    _retraso.update(segundos=segundos, consultado_en=ahora)
+    return segundos
+
+
+def replica_disponible():
+    if not replica_configurada():
+        return False
+    retraso = retraso_replica()
+    return retraso is not None and retraso <= settings.REPLICA_MAX_LAG_SECONDS
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _leer_de_replica.get() and replica_disponible():
+            return settings.DATABASE_REPLICA_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplica y primaria contienen los mismos datos
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != settings.DATABASE_REPLICA_ALIAS
@@ -0,0 +1,37 @@
+from rest_framework import serializers
+
+from core.model_cache import desde_cache
+
+
+class CachedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField que resuelve la instancia con un ModelCache.
+
+    ``campos_frescos``: campos que validan la escritura (p. ej. is_active). Si la
+    instancia salió de la caché se releen de la BD, para no validar con una copia
+    vieja; el resto de la instancia (lo que se muestra) queda de la caché.
+    """
+
+    def __init__(self, model_cache, campos_frescos=(), **kwargs):
+        self.model_cache = model_cache
+        self.campos_frescos = tuple(campos_frescos)
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        obj = self.model_cache.get(pk)
+        if obj is None:
+            self.fail("does_not_exist", pk_value=data)
+        if self.campos_frescos and desde_cache(obj):
+            valores = self.get_queryset().filter(pk=pk).values(*self.campos_frescos).first()
+            if valores is None:
+                self.fail("does_not_exist", pk_value=data)
+            for campo, valor in valores.items():
+                setattr(obj, campo, valor)
+            obj._state.desde_cache = False
+        return obj
@@ -1,32 +1,117 @@
+"""
+Sondas de salud.
+
+    /health/live/   el proceso responde (no toca dependencias)
+    /health/ready/  PostgreSQL y Redis disponibles
+    /health/        alias de ready
+    /health/caches/ contadores de hits/misses de los ModelCache de este proceso
+
+El resultado de las pruebas de ready se guarda en memoria del proceso durante
+HEALTH_CACHE_SECONDS: una ráfaga de sondas de balanceadores genera como mucho
+una prueba por proceso y periodo.
+"""
+import asyncio
+import os
+import threading
+import time
+
+from asgiref.sync import sync_to_async
 from django.urls import path
 from django.http import JsonResponse
 from django.db import connection
-import redis
 from django.conf import settings
 
+from . import model_cache
+from .redis_client import get_async_redis, get_redis
 
-def healthcheck(request):
-    status = {"status": "ok", "db": "ok", "redis": "ok"}
-    http_status = 200
+_sondeo = {"resultado": None, "en": 0.0}
+_lock = threading.Lock()
 
+
+def _probar_db():
     try:
         connection.ensure_connection()
     except Exception as e:
-        status["db"] = str(e)
-        status["status"] = "degraded"
-        http_status = 503
+        return str(e)
+    return "ok"
+
 
+def _probar_redis():
     try:
-        r = redis.from_url(settings.CELERY_BROKER_URL)
-        r.ping()
+        get_redis().ping()
     except Exception as e:
-        status["redis"] = str(e)
+        return str(e)
+    return "ok"
+
+
+async def _probar_redis_async():
+    try:
+        await get_async_redis().ping()
+    except Exception as e:
+        return str(e)
+    return "ok"
+
+
+def _vigente():
+    if time.monotonic() - _sondeo["en"] < settings.HEALTH_CACHE_SECONDS:
+        return _sondeo["resultado"]
+    return None
+
+
+def _guardar(resultado):
+    _sondeo.update(resultado=resultado, en=time.monotonic())
+    return resultado
+
+
+def sondear():
+    """(db, redis) con el resultado cacheado; un solo hilo prueba a la vez."""
+    resultado = _vigente()
+    if resultado is None:
+        with _lock:
+            resultado = _vigente() or _guardar((_probar_db(), _probar_redis()))
+    return resultado
+
+
+async def sondear_async():
+    resultado = _vigente()
+    if resultado is None:
+        resultado = _guardar(
+            tuple(await asyncio.gather(sync_to_async(_probar_db)(), _probar_redis_async()))
+        )
+    return resultado
+
+
+def _respuesta(db, redis_status):
+    status = {"status": "ok", "db": db, "redis": redis_status}
+    http_status = 200
+    if db != "ok" or redis_status != "ok":
         status["status"] = "degraded"
         http_status = 503
-
     return JsonResponse(status, status=http_status)
 
 
+def liveness(request):
+    return JsonResponse({"status": "ok"})
+
+
+def caches(request):
+    return JsonResponse({"pid": os.getpid(), "model_cache": model_cache.estadisticas()})
+
+
+def healthcheck(request):
+    return _respuesta(*sondear())
+
+
+async def healthcheck_async(request):
+    """Igual que healthcheck, con ambas pruebas en paralelo y sin bloquear el loop"""
+    return _respuesta(*await sondear_async())
+
+
+readiness = healthcheck_async if settings.ASYNC_VIEWS else healthcheck
+
 urlpatterns = [
-    path("", healthcheck, name="healthcheck"),
+    path("", readiness, name="healthcheck"),
+    path("live/", liveness, name="health-live"),
+    path("ready/", readiness, name="health-ready"),
+    path("caches/", caches, name="health-caches"),
 ]
@@ -0,0 +1,98 @@
+import hashlib
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+
+from .db_router import replica_configurada, usar_replica
+
+logger = logging.getLogger(__name__)
+
+METODOS_SEGUROS = ("GET", "HEAD", "OPTIONS")
+CACHES_POR_PROCESO = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def cache_compartida():
+    return settings.CACHES["default"]["BACKEND"] not in CACHES_POR_PROCESO
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Sirve las lecturas seguras desde la réplica.
+
+    Tras una escritura, el mismo cliente (identificado por su cabecera
+    Authorization, su sesión o su IP) queda fijado a la primaria durante
+    REPLICA_STICKY_SECONDS para que lea lo que acaba de escribir.
+    Funciona tanto bajo WSGI como bajo ASGI sin forzar vistas async a hilos.
+
+    La marca se guarda en la caché de Django: para que valga entre workers y
+    servidores la caché tiene que ser compartida (Redis, ver CACHES). Con una
+    caché por proceso (LocMemCache) solo vale en el worker que atendió la
+    escritura.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        if replica_configurada() and not cache_compartida():
+            logger.warning(
+                "La caché no es compartida entre procesos: la lectura tras una "
+                "escritura solo se garantiza en el mismo worker."
+            )
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        if not replica_configurada():
+            return self.get_response(request)
+
+        key = self._pin_key(request)
+
+        if request.method not in METODOS_SEGUROS:
+            response = self.get_response(request)
+            if response.status_code < 400:
+                cache.set(key, time.time(), settings.REPLICA_STICKY_SECONDS)
+            return response
+
+        if cache.get(key) is not None:
+            return self.get_response(request)
+
+        with usar_replica():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        if not replica_configurada():
+            return await self.get_response(request)
+
+        key = self._pin_key(request)
+
+        if request.method not in METODOS_SEGUROS:
+            response = await self.get_response(request)
+            if response.status_code < 400:
+                await cache.aset(key, time.time(), settings.REPLICA_STICKY_SECONDS)
+            return response
+
+        if await cache.aget(key) is not None:
+            return await self.get_response(request)
+
+        with usar_replica():
+            return await self.get_response(request)
+
+    @staticmethod
+    def _pin_key(request):
+        cliente = (
+            request.META.get("HTTP_AUTHORIZATION")
+            or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+            or request.META.get("REMOTE_ADDR", "")
+        )
+        return "replica:pin:" + hashlib.sha1(cliente.encode()).hexdigest()
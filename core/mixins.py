@@ -7,3 +7,90 @@ class AuditDateModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class ActiveManager(models.Manager):
+    """
+    Solo las filas activas: las eliminadas lógicamente (is_active=False) quedan
+    fuera de listados, búsquedas y conteos. Se declara como ``objects`` junto a
+    ``all_objects = models.Manager()`` para administración y auditoría.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_active=True)
+
+
+class CleanOnSaveModel(models.Model):
+    """
+    Ejecuta full_clean() en cada save(), sin repetir lo que ya está garantizado:
+
+    - unique/unique_together y constraints: los valida la BD (y el serializer).
+    - FKs con la instancia relacionada ya cargada: se sabe que existe.
+
+    save(skip_clean=True) es el camino rápido para escrituras internas de
+    confianza (tareas, importaciones masivas, soft delete).
+    """
+
+    class Meta:
+        abstract = True
+
+    def _fks_cargadas(self):
+        return [
+            f.name
+            for f in self._meta.concrete_fields
+            if f.is_relation and f.is_cached(self)
+        ]
+
+    def save(self, *args, skip_clean=False, **kwargs):
+        if not skip_clean:
+            self.full_clean(
+                exclude=self._fks_cargadas(),
+                validate_unique=False,
+                validate_constraints=False,
+            )
+        super().save(*args, **kwargs)
+
+
+class ConflictoVersion(Exception):
+    """La fila cambió desde que se leyó la instancia (ver VersionedModel)"""
+
+
+class VersionedModel(models.Model):
+    """
+    Control de concurrencia optimista: cada UPDATE de save() lleva
+    ``WHERE version = <leída>`` e incrementa la versión. Si otro escritor la
+    cambió entre medio no se actualiza nada y se lanza ConflictoVersion, sin
+    bloquear la fila (como con IntegrityError, dentro de una transacción hay
+    que guardar en un atomic() propio para poder seguir). Las escrituras masivas (update/bulk_update) deben
+    incrementarla ellas mismas: ``version=F("version") + 1``.
+    """
+
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not self._state.adding:
+            kwargs["update_fields"] = {*update_fields, "version"}
+        super().save(*args, **kwargs)
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        if self._state.adding:
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        leida = self.version
+        values = [
+            (field, model, leida + 1 if field.attname == "version" else valor)
+            for field, model, valor in values
+        ]
+        actualizada = super()._do_update(
+            base_qs.filter(version=leida), using, pk_val, values, update_fields, forced_update
+        )
+        if actualizada:
+            self.version = leida + 1
+        elif base_qs.filter(pk=pk_val).exists():
+            raise ConflictoVersion(
+                f"{self._meta.label} {pk_val} fue modificado por otro proceso (versión {leida})."
+            )
+        return actualizada
@@ -0,0 +1,229 @@
+"""
+Cache-aside de instancias de modelos leídas por id (o por un campo único).
+
+Dos niveles: un LRU en memoria del proceso con TTL corto y la caché de Django
+(compartida entre procesos) con TTL más largo; si ninguno la tiene, se lee de
+la BD. Guardar o eliminar (también el soft delete) invalida ambos niveles al
+confirmarse la transacción; las escrituras masivas (update/bulk_update) deben
+llamar a invalidar() ellas mismas. Otros procesos pueden ver una instancia
+desactualizada como mucho MODEL_CACHE_LOCAL_TTL segundos.
+
+Cada lectura devuelve una copia: quien la modifique no altera la caché. Los
+fallos de caché leen siempre de la primaria: una réplica atrasada volvería a
+cachear la fila recién invalidada.
+
+Cada pk tiene una generación en la caché compartida que invalidar() renueva, y
+cada entrada guarda la generación vigente antes de leer la BD: una lectura
+anterior a un commit que se guarda después de su invalidación queda descartada.
+"""
+import copy
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .db_router import usar_primaria
+
+_registro = {}
+
+
+class _LRU:
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, clave):
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                return None
+            expira, valor = entrada
+            if expira < time.monotonic():
+                del self._datos[clave]
+                return None
+            self._datos.move_to_end(clave)
+            return valor
+
+    def set(self, clave, valor):
+        with self._lock:
+            self._datos[clave] = (time.monotonic() + self.ttl, valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.maxsize:
+                self._datos.popitem(last=False)
+
+    def delete(self, clave):
+        with self._lock:
+            self._datos.pop(clave, None)
+
+    def clear(self):
+        with self._lock:
+            self._datos.clear()
+
+    def __len__(self):
+        return len(self._datos)
+
+
+class ModelCache:
+    """
+    ``get(pk)``, ``get_many(ids)`` y ``get_by(campo, valor)`` para los campos
+    únicos indicados. Lee con ``all_objects`` si el modelo lo tiene: las
+    instancias eliminadas lógicamente también se resuelven.
+    """
+
+    def __init__(self, model, campos_unicos=()):
+        self.model = model
+        self.campos_unicos = tuple(campos_unicos)
+        self.nombre = model._meta.label_lower
+        self._local = _LRU(settings.MODEL_CACHE_LOCAL_MAXSIZE, settings.MODEL_CACHE_LOCAL_TTL)
+        self._contadores = {"hits_local": 0, "hits_compartida": 0, "misses": 0}
+        self._lock = threading.Lock()
+
+        uid = f"model_cache:{self.nombre}"
+        post_save.connect(self._al_escribir, sender=model, weak=False, dispatch_uid=uid)
+        post_delete.connect(self._al_escribir, sender=model, weak=False, dispatch_uid=uid)
+        _registro[self.nombre] = self
+
+    def __deepcopy__(self, memo):
+        # Es único por modelo (p. ej. DRF copia los kwargs de sus campos)
+        return self
+
+    @property
+    def _manager(self):
+        return getattr(self.model, "all_objects", self.model._default_manager)
+
+    def _clave(self, pk):
+        return f"mc:{self.nombre}:{pk}"
+
+    def _clave_generacion(self, pk):
+        return f"mc:{self.nombre}:gen:{pk}"
+
+    def _clave_campo(self, campo, valor):
+        return f"mc:{self.nombre}:{campo}:{valor}"
+
+    def _contar(self, contador, cantidad=1):
+        if cantidad:
+            with self._lock:
+                self._contadores[contador] += cantidad
+
+    def get(self, pk):
+        """Instancia con ese pk, o None si no existe"""
+        return self.get_many([pk]).get(pk)
+
+    def get_many(self, ids):
+        """{pk: instancia} de los ids que existen, con una consulta como mucho"""
+        encontrados, pendientes, faltan = {}, [], []
+        for pk in dict.fromkeys(ids):
+            obj = self._local.get(pk)
+            if obj is None:
+                pendientes.append(pk)
+            else:
+                encontrados[pk] = obj
+        self._contar("hits_local", len(encontrados))
+
+        if pendientes:
+            claves = {self._clave(pk): pk for pk in pendientes}
+            claves_generacion = {self._clave_generacion(pk): pk for pk in pendientes}
+            compartidos = cache.get_many([*claves, *claves_generacion])
+            generaciones = {pk: compartidos.get(clave) for clave, pk in claves_generacion.items()}
+            hits = 0
+            for clave, pk in claves.items():
+                entrada = compartidos.get(clave)
+                # Guardada con otra generación: leída antes de la última invalidación
+                if entrada is not None and entrada[0] == generaciones[pk]:
+                    self._local.set(pk, entrada[1])
+                    encontrados[pk] = entrada[1]
+                    hits += 1
+            self._contar("hits_compartida", hits)
+
+            faltan = [pk for pk in pendientes if pk not in encontrados]
+            self._contar("misses", len(faltan))
+            if faltan:
+                with usar_primaria():
+                    leidos = {obj.pk: obj for obj in self._manager.filter(pk__in=faltan)}
+                self._guardar(leidos.values(), generaciones)
+                encontrados.update(leidos)
+
+        copias = {}
+        for pk, obj in encontrados.items():
+            copias[pk] = copy.copy(obj)
+            # Las leídas ahora de la BD están al día; las demás pueden no estarlo
+            copias[pk]._state.desde_cache = pk not in faltan
+        return copias
+
+    def get_by(self, campo, valor):
+        """Instancia cuyo ``campo`` (uno de campos_unicos) vale ``valor``"""
+        if campo not in self.campos_unicos:
+            raise ValueError(f"{campo} no es un campo único cacheado de {self.nombre}")
+        pk = cache.get(self._clave_campo(campo, valor))
+        if pk is not None:
+            obj = self.get(pk)
+            # El índice puede haber quedado viejo si el campo cambió
+            if obj is not None and getattr(obj, campo) == valor:
+                return obj
+        self._contar("misses")
+        # Solo el pk: la instancia se cachea por get(), que conoce su generación
+        with usar_primaria():
+            pk = self._manager.filter(**{campo: valor}).values_list("pk", flat=True).first()
+        if pk is None:
+            return None
+        cache.set(self._clave_campo(campo, valor), pk, settings.MODEL_CACHE_TTL)
+        return self.get(pk)
+
+    def _guardar(self, objs, generaciones):
+        valores = {}
+        for obj in objs:
+            obj._state.fields_cache = {}
+            self._local.set(obj.pk, obj)
+            valores[self._clave(obj.pk)] = (generaciones.get(obj.pk), obj)
+            for campo in self.campos_unicos:
+                valores[self._clave_campo(campo, getattr(obj, campo))] = obj.pk
+        if valores:
+            cache.set_many(valores, settings.MODEL_CACHE_TTL)
+
+    def invalidar(self, *ids):
+        for pk in ids:
+            self._local.delete(pk)
+        generacion = uuid.uuid4().hex
+        # Dura más que las entradas: una guardada con la generación anterior no vuelve a valer
+        cache.set_many(
+            {self._clave_generacion(pk): generacion for pk in ids}, settings.MODEL_CACHE_TTL * 2
+        )
+        cache.delete_many([self._clave(pk) for pk in ids])
+
+    def _al_escribir(self, sender, instance, **kwargs):
+        pk = instance.pk
+        self._local.delete(pk)
+        transaction.on_commit(lambda: self.invalidar(pk))
+
+    def limpiar_local(self):
+        self._local.clear()
+
+    def estadisticas(self):
+        with self._lock:
+            datos = dict(self._contadores)
+        lecturas = sum(datos.values())
+        datos["tamano_local"] = len(self._local)
+        datos["ratio_hits"] = round((lecturas - datos["misses"]) / lecturas, 4) if lecturas else None
+        return datos
+
+
+def desde_cache(obj):
+    """True si la instancia salió de la caché (y no de una lectura de la BD)"""
+    return getattr(obj._state, "desde_cache", False)
+
+
+def estadisticas():
+    """Contadores de cada ModelCache de este proceso"""
+    return {nombre: model_cache.estadisticas() for nombre, model_cache in _registro.items()}
+
+
+def limpiar_locales():
+    for model_cache in _registro.values():
+        model_cache.limpiar_local()
@@ -0,0 +1,56 @@
+"""
+Clientes Redis compartidos por todo el proceso.
+
+Health checks, cachés, locks y rate limits deben pedir el cliente aquí en lugar
+de crear uno con redis.from_url en cada llamada: así reutilizan las conexiones
+del pool. redis-py rehace el pool tras un fork, de modo que es seguro con
+preload_app de gunicorn y con los workers de Celery.
+
+El cliente asíncrono se guarda por event loop: una conexión de redis.asyncio
+queda atada al loop que la creó y no se puede reutilizar desde otro.
+"""
+import asyncio
+import threading
+import weakref
+
+import redis
+from django.conf import settings
+from redis import asyncio as aioredis
+
+_clientes = {}
+_clientes_async = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def _opciones():
+    return {
+        "max_connections": settings.REDIS_MAX_CONNECTIONS,
+        "socket_timeout": settings.REDIS_SOCKET_TIMEOUT,
+        "socket_connect_timeout": settings.REDIS_SOCKET_TIMEOUT,
+        "health_check_interval": 30,
+    }
+
+
+def get_redis(url=None):
+    """Cliente redis síncrono sobre el pool compartido de la URL (REDIS_URL por defecto)."""
+    url = url or settings.REDIS_URL
+    cliente = _clientes.get(url)
+    if cliente is None:
+        with _lock:
+            cliente = _clientes.get(url)
+            if cliente is None:
+                cliente = redis.Redis(connection_pool=redis.ConnectionPool.from_url(url, **_opciones()))
+                _clientes[url] = cliente
+    return cliente
+
+
+def get_async_redis(url=None):
+    """Cliente redis.asyncio (con su pool de conexiones) del event loop actual."""
+    url = url or settings.REDIS_URL
+    loop = asyncio.get_running_loop()
+    por_url = _clientes_async.setdefault(loop, {})
+    cliente = por_url.get(url)
+    if cliente is None:
+        cliente = aioredis.from_url(url, **_opciones())
+        por_url[url] = cliente
+    return cliente
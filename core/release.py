@@ -0,0 +1,24 @@
+"""
+Identificador del código desplegado, para las claves de caché que solo cambian
+con un deploy (catálogos y schema OpenAPI): cada release usa sus propias claves
+y nunca sirve lo que cacheó la anterior.
+
+Es RELEASE_ID (p. ej. el sha del commit, desde el pipeline) o, si no está
+definido, un hash de los .py de apps/ y core/.
+"""
+import hashlib
+from functools import lru_cache
+
+from django.conf import settings
+
+
+@lru_cache(maxsize=None)
+def id_release():
+    if settings.RELEASE_ID:
+        return settings.RELEASE_ID
+    digest = hashlib.sha1()
+    for carpeta in ("apps", "core"):
+        for ruta in sorted((settings.BASE_DIR / carpeta).rglob("*.py")):
+            digest.update(str(ruta.relative_to(settings.BASE_DIR)).encode())
+            digest.update(ruta.read_bytes())
+    return digest.hexdigest()[:12]
@@ -0,0 +1,48 @@
+"""
+Schema OpenAPI cacheado.
+
+Generar el schema recorre todas las vistas y serializers, y solo cambia con un
+deploy. Se guarda el dict generado (por release, versión e idioma) en la caché
+compartida; cada petición solo lo renderiza a YAML o JSON. Se genera sin la
+petición (schema público), así es igual para todos y se puede precalentar.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import translation
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.views import SpectacularAPIView
+from rest_framework.response import Response
+
+from core.release import id_release
+
+
+def _clave(version):
+    return f"schema:{id_release()}:{version or '-'}:{translation.get_language() or '-'}"
+
+
+def obtener_schema(version=None, regenerar=False):
+    """Schema cacheado; regenerar=True lo genera de nuevo y reemplaza el guardado"""
+    schema = None if regenerar else cache.get(_clave(version))
+    if schema is None:
+        generator = spectacular_settings.DEFAULT_GENERATOR_CLASS(api_version=version)
+        schema = generator.get_schema(request=None, public=True)
+        cache.set(_clave(version), schema, settings.CACHE_SCHEMA_TTL)
+    return schema
+
+
+def invalidar_schema(version=None):
+    cache.delete(_clave(version))
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """SpectacularAPIView que sirve el schema desde obtener_schema()"""
+
+    def _get_schema_response(self, request):
+        # Variantes con urlconf/patrones/settings propios o schema no público: sin caché
+        if not self.serve_public or self.urlconf or self.patterns or self.custom_settings:
+            return super()._get_schema_response(request)
+        version = self.api_version or request.version or self._get_version_parameter(request)
+        return Response(
+            data=obtener_schema(version),
+            headers={"Content-Disposition": f'inline; filename="{self._get_filename(request, version)}"'},
+        )
@@ -1,3 +1,4 @@
+from decimal import Decimal
 from pathlib import Path
 from decouple import config, Csv
 
@@ -29,6 +30,7 @@ MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "core.middleware.ReplicaRoutingMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
@@ -54,6 +56,13 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "core.wsgi.application"
+ASGI_APPLICATION = "core.asgi.application"
+
+# Versiones async de healthcheck y estado-cobranza (core/asgi.py lo activa por defecto)
+ASYNC_VIEWS = config("ASYNC_VIEWS", default=False, cast=bool)
+
+# Segundos que se reutiliza el resultado de las pruebas de /health/ready/
+HEALTH_CACHE_SECONDS = config("HEALTH_CACHE_SECONDS", default=5, cast=float)
 
 DATABASES = {
     "default": {
@@ -63,9 +72,32 @@ DATABASES = {
         "PASSWORD": config("POSTGRES_PASSWORD", default="isp_pass"),
         "HOST": config("POSTGRES_HOST", default="db"),
         "PORT": config("POSTGRES_PORT", default="5432"),
+        # Conexiones persistentes (web y Celery) con verificación antes de reutilizarlas
+        "CONN_MAX_AGE": config("DB_CONN_MAX_AGE", default=60, cast=int),
+        "CONN_HEALTH_CHECKS": config("DB_CONN_HEALTH_CHECKS", default=True, cast=bool),
+        # pgbouncer en modo transacción no conserva cursores entre transacciones
+        "DISABLE_SERVER_SIDE_CURSORS": config("DB_PGBOUNCER", default=False, cast=bool),
+        "OPTIONS": {
+            "connect_timeout": config("DB_CONNECT_TIMEOUT", default=5, cast=int),
+        },
     }
 }
 
+# Réplica de lectura (opcional): se activa definiendo POSTGRES_REPLICA_HOST
+DATABASE_REPLICA_ALIAS = "replica"
+if config("POSTGRES_REPLICA_HOST", default=""):
+    DATABASES[DATABASE_REPLICA_ALIAS] = {
+        **DATABASES["default"],
+        "HOST": config("POSTGRES_REPLICA_HOST"),
+        "PORT": config("POSTGRES_REPLICA_PORT", default=DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["core.db_router.ReplicaRouter"]
+REPLICA_MAX_LAG_SECONDS = config("REPLICA_MAX_LAG_SECONDS", default=5, cast=float)
+REPLICA_LAG_CHECK_SECONDS = config("REPLICA_LAG_CHECK_SECONDS", default=2, cast=float)
+REPLICA_STICKY_SECONDS = config("REPLICA_STICKY_SECONDS", default=10, cast=int)
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -94,6 +126,15 @@ REST_FRAMEWORK = {
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "core.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
@@ -107,15 +148,134 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
 }
 
+# Redis (clientes compartidos de core/redis_client.py)
+REDIS_URL = config("REDIS_URL", default=config("CELERY_BROKER_URL", default="redis://redis:6379/0"))
+REDIS_MAX_CONNECTIONS = config("REDIS_MAX_CONNECTIONS", default=50, cast=int)
+REDIS_SOCKET_TIMEOUT = config("REDIS_SOCKET_TIMEOUT", default=2, cast=float)
+
+# Caché compartida entre procesos web y workers (base de ModelCache, estados de
+# cuenta, catálogos y schema). Subir CACHE_VERSION invalida todas las claves.
+CACHE_URL = config("CACHE_URL", default="redis://redis:6379/2")
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": CACHE_URL,
+        "KEY_PREFIX": "isp",
+        "VERSION": config("CACHE_VERSION", default=1, cast=int),
+        "TIMEOUT": 300,
+        "OPTIONS": {
+            "max_connections": REDIS_MAX_CONNECTIONS,
+            "socket_timeout": REDIS_SOCKET_TIMEOUT,
+            "socket_connect_timeout": REDIS_SOCKET_TIMEOUT,
+        },
+    }
+}
+# Catálogos (/api/catalogos/) y schema OpenAPI: cambian con un deploy o al editar políticas.
+# Sus claves llevan RELEASE_ID (sin definir: hash del código, ver core/release.py)
+RELEASE_ID = config("RELEASE_ID", default="")
+CACHE_CATALOGOS_TTL = config("CACHE_CATALOGOS_TTL", default=86400, cast=int)
+CACHE_SCHEMA_TTL = config("CACHE_SCHEMA_TTL", default=86400, cast=int)
+
+# Admin: filas que se cuentan con COUNT(*); por encima, estimación (core/admin.py)
+ADMIN_CONTEO_MAXIMO = config("ADMIN_CONTEO_MAXIMO", default=10000, cast=int)
+
+# ModelCache (core/model_cache.py): TTL en la caché compartida y LRU por proceso
+MODEL_CACHE_TTL = config("MODEL_CACHE_TTL", default=300, cast=int)
+MODEL_CACHE_LOCAL_TTL = config("MODEL_CACHE_LOCAL_TTL", default=30, cast=int)
+MODEL_CACHE_LOCAL_MAXSIZE = config("MODEL_CACHE_LOCAL_MAXSIZE", default=2048, cast=int)
+
 # Celery
 CELERY_BROKER_URL = config("CELERY_BROKER_URL", default="redis://redis:6379/0")
 CELERY_RESULT_BACKEND = config("CELERY_RESULT_BACKEND", default="redis://redis:6379/1")
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
+# Resultados: solo los guardan las tareas que lo piden (ignore_result=False);
+# se comprimen, sin args/kwargs, y caducan a los CELERY_RESULT_EXPIRES segundos
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_RESULT_EXTENDED = False
+CELERY_RESULT_COMPRESSION = config("CELERY_RESULT_COMPRESSION", default="zlib") or None
+CELERY_RESULT_EXPIRES = config("CELERY_RESULT_EXPIRES", default=86400, cast=int)
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 
+# Colas de Celery: un proceso largo (periódica) o un trabajo masivo no deja
+# esperando a las reevaluaciones por eventos. Cada cola tiene su worker en
+# docker-compose; lo no enrutado va a la cola por defecto ("celery").
+CELERY_TASK_DEFAULT_QUEUE = "celery"
+CELERY_TASK_ROUTES = {
+    "cobranza.reevaluar_linea": {"queue": "cobranza_eventos"},
+    "cobranza.proceso_control_morosidad": {"queue": "cobranza_periodica"},
+    "cobranza.actualizar_resumen_antiguedad": {"queue": "cobranza_periodica"},
+    "cobranza.mantener_particiones_logs": {"queue": "cobranza_masiva"},
+    "cobranza.archivar_rubros": {"queue": "cobranza_masiva"},
+    "core.limpiar_resultados": {"queue": "cobranza_masiva"},
+}
+
+# Por cola: límites de tiempo (soft lanza SoftTimeLimitExceeded, el duro mata
+# el proceso) y acks_late. Todas las tareas enrutadas son idempotentes o
+# retoman su checkpoint, así que si un worker cae a mitad se reentregan.
+CELERY_COLAS = {
+    "cobranza_eventos": {
+        "acks_late": True,
+        "soft_time_limit": config("CELERY_EVENTOS_SOFT_TIME_LIMIT", default=30, cast=int),
+        "time_limit": config("CELERY_EVENTOS_TIME_LIMIT", default=60, cast=int),
+    },
+    "cobranza_periodica": {
+        "acks_late": True,
+        "soft_time_limit": config("CELERY_PERIODICA_SOFT_TIME_LIMIT", default=1500, cast=int),
+        "time_limit": config("CELERY_PERIODICA_TIME_LIMIT", default=1800, cast=int),
+    },
+    "cobranza_masiva": {
+        "acks_late": True,
+        "soft_time_limit": config("CELERY_MASIVA_SOFT_TIME_LIMIT", default=3300, cast=int),
+        "time_limit": config("CELERY_MASIVA_TIME_LIMIT", default=3600, cast=int),
+    },
+}
+CELERY_TASK_ANNOTATIONS = {
+    tarea: CELERY_COLAS[ruta["queue"]] for tarea, ruta in CELERY_TASK_ROUTES.items()
+}
+# Límite para lo no enrutado
+CELERY_TASK_SOFT_TIME_LIMIT = config("CELERY_TASK_SOFT_TIME_LIMIT", default=300, cast=int)
+CELERY_TASK_TIME_LIMIT = config("CELERY_TASK_TIME_LIMIT", default=360, cast=int)
+# Con acks_late, cada proceso reserva un solo mensaje; el worker de eventos lo sube con --prefetch-multiplier
+CELERY_WORKER_PREFETCH_MULTIPLIER = config("CELERY_WORKER_PREFETCH_MULTIPLIER", default=1, cast=int)
+# Redis reentrega lo no confirmado tras visibility_timeout: debe superar el límite más largo
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    "visibility_timeout": max(cola["time_limit"] for cola in CELERY_COLAS.values()) + 300,
+}
+
+# Cobranza: particiones mensuales de CollectionsRequestLog
+COBRANZA_LOGS_MESES_ADELANTE = config("COBRANZA_LOGS_MESES_ADELANTE", default=3, cast=int)
+COBRANZA_LOGS_RETENCION_MESES = config("COBRANZA_LOGS_RETENCION_MESES", default=6, cast=int)
+COBRANZA_LOGS_ARCHIVAR = config("COBRANZA_LOGS_ARCHIVAR", default=False, cast=bool)
+
+# Cobranza: archivo de rubros PAGADO/ANULADO antiguos
+COBRANZA_ARCHIVO_MESES = config("COBRANZA_ARCHIVO_MESES", default=12, cast=int)
+COBRANZA_ARCHIVO_LOTE = config("COBRANZA_ARCHIVO_LOTE", default=1000, cast=int)
+
+# Cobranza: caché del estado de cuenta por cliente (segundos)
+COBRANZA_ESTADO_CUENTA_TTL = config("COBRANZA_ESTADO_CUENTA_TTL", default=3600, cast=int)
+
+# Cobranza: reglas por defecto para líneas sin PoliticaCobranza (ni en su cliente)
+COBRANZA_DIAS_GRACIA = config("COBRANZA_DIAS_GRACIA", default=0, cast=int)
+COBRANZA_MONTO_MINIMO = config("COBRANZA_MONTO_MINIMO", default="0", cast=Decimal)
+COBRANZA_CANTIDAD_MINIMA = config("COBRANZA_CANTIDAD_MINIMA", default=1, cast=int)
+
+# Cobranza: líneas evaluadas por consulta/transacción en el proceso periódico
+COBRANZA_LOTE_LINEAS = config("COBRANZA_LOTE_LINEAS", default=500, cast=int)
+
+# Líneas: líneas validadas y actualizadas por transacción en las transiciones masivas
+LINEAS_TRANSICION_LOTE = config("LINEAS_TRANSICION_LOTE", default=1000, cast=int)
+
+# Cobranza: segundos que se agrupan los cambios de rubros de una línea antes de reevaluarla
+COBRANZA_REEVALUACION_DEBOUNCE = config("COBRANZA_REEVALUACION_DEBOUNCE", default=10, cast=int)
+
+# Cobranza: lease de una ejecución del proceso (si vence, otro worker la retoma) y
+# antigüedad máxima para reanudarla en vez de abandonarla y empezar otra
+COBRANZA_RUN_LEASE_SECONDS = config("COBRANZA_RUN_LEASE_SECONDS", default=600, cast=int)
+COBRANZA_RUN_REANUDAR_MAX_SECONDS = config("COBRANZA_RUN_REANUDAR_MAX_SECONDS", default=3600, cast=int)
+
 # DRF Spectacular (OpenAPI docs)
 SPECTACULAR_SETTINGS = {
     "TITLE": "Billing-Service API",
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from drf_spectacular.views import SpectacularAPIView
+from core.schema import CachedSpectacularAPIView
 try:
     from drf_spectacular.views import SpectacularSwaggerUIView
 except ImportError:
@@ -18,9 +18,10 @@ urlpatterns = [
     path("api/", include("apps.clientes.urls")),
     path("api/", include("apps.lineas.urls")),
     path("api/", include("apps.cobranza.urls")),
+    path("api/catalogos/", include("core.catalogos")),
 
     # OpenAPI docs
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("api/schema/", CachedSpectacularAPIView.as_view(), name="schema"),
     path("api/docs/", SpectacularSwaggerUIView.as_view(url_name="schema"), name="swagger-ui"),
 
     # Healthcheck
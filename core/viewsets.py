@@ -0,0 +1,98 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from core.mixins import ConflictoVersion
+
+VALORES_VERDADEROS = ("1", "true")
+
+
+def incluye_inactivos(params):
+    """?include_inactive=1 (o true) en los parámetros de la petición"""
+    return params.get("include_inactive", "").lower() in VALORES_VERDADEROS
+
+
+class IncludeInactiveMixin:
+    """
+    Para viewsets de modelos con ActiveManager, con ``queryset`` declarado
+    sobre ``all_objects``.
+
+    Listado y detalle se restringen a las filas activas (is_active=True, como
+    ``objects``); con ?include_inactive=1 ven todas. destroy siempre ve todas,
+    para responder 409 a una segunda eliminación en vez de 404.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "destroy" or incluye_inactivos(self.request.query_params):
+            return queryset
+        return queryset.filter(is_active=True)
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "El recurso fue modificado; vuelva a obtenerlo e intente de nuevo."
+    default_code = "precondition_failed"
+
+
+class VersionConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "El recurso fue modificado por otro proceso; vuelva a obtenerlo e intente de nuevo."
+    default_code = "version_conflict"
+
+
+def _etag(version):
+    return f'"{version}"'
+
+
+def _versiones_if_match(valor):
+    """Versiones de un If-Match (``"3"``, ``W/"3"``, listas); None si es ``*``"""
+    etiquetas = [etiqueta.strip() for etiqueta in valor.split(",")]
+    if "*" in etiquetas:
+        return None
+    return {etiqueta.removeprefix("W/").strip('"') for etiqueta in etiquetas}
+
+
+class VersionETagMixin:
+    """
+    Para viewsets de modelos con VersionedModel (y ``version`` en el serializer).
+
+    El detalle y la respuesta de update llevan ``ETag: "<version>"``. Un update
+    con If-Match que no coincide con la versión actual responde 412 antes de
+    validar; si otro escritor cambia la fila entre la lectura y el UPDATE
+    condicional, 412 con If-Match y 409 sin él.
+    """
+
+    def get_object(self):
+        obj = super().get_object()
+        if_match = self.request.headers.get("If-Match")
+        if self.action in ("update", "partial_update") and if_match:
+            versiones = _versiones_if_match(if_match)
+            if versiones is not None and str(obj.version) not in versiones:
+                raise PreconditionFailed()
+        return obj
+
+    def perform_update(self, serializer):
+        try:
+            super().perform_update(serializer)
+        except ConflictoVersion:
+            if self.request.headers.get("If-Match"):
+                raise PreconditionFailed()
+            raise VersionConflict()
+
+    def perform_destroy(self, instance):
+        # La baja lógica también es un save() condicionado por la versión
+        try:
+            super().perform_destroy(instance)
+        except ConflictoVersion:
+            raise VersionConflict()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if (
+            self.action in ("retrieve", "update", "partial_update")
+            and response.status_code == status.HTTP_200_OK
+            and isinstance(response.data, dict)
+            and "version" in response.data
+        ):
+            response["ETag"] = _etag(response.data["version"])
+        return response
@@ -0,0 +1,10 @@
+#!/bin/sh
+# Se ejecuta una sola vez al inicializar el volumen de la primaria
+# (docker-entrypoint-initdb.d): crea el rol de replicación y lo habilita en pg_hba.
+set -e
+
+psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" <<-SQL
+    CREATE ROLE replicator WITH REPLICATION LOGIN PASSWORD '${REPLICATION_PASSWORD:-replicator}';
+SQL
+
+echo "host replication replicator all scram-sha-256" >> "$PGDATA/pg_hba.conf"
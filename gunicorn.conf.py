@@ -0,0 +1,52 @@
+"""
+Configuración de gunicorn para producción.
+
+    gunicorn core.wsgi:application                # WSGI (gthread)
+    GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker gunicorn core.asgi:application
+
+gunicorn carga este archivo automáticamente desde el directorio de trabajo.
+Todos los valores se pueden ajustar con variables de entorno GUNICORN_*.
+"""
+import multiprocessing
+import os
+
+
+def _entero(nombre, defecto):
+    valor = os.environ.get(nombre)
+    return int(valor) if valor else defecto
+
+
+_cpus = multiprocessing.cpu_count()
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+
+# (2 x CPU) + 1 procesos; cada uno con varios hilos porque casi todo el tiempo
+# de una petición se pasa esperando a PostgreSQL.
+workers = _entero("GUNICORN_WORKERS", _cpus * 2 + 1)
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = _entero("GUNICORN_THREADS", 4) if worker_class == "gthread" else 1
+
+# Django se importa una sola vez en el maestro y los workers lo heredan por fork
+preload_app = os.environ.get("GUNICORN_PRELOAD", "True").lower() in ("1", "true", "yes")
+
+# Reciclado de workers para acotar el crecimiento de memoria
+max_requests = _entero("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = _entero("GUNICORN_MAX_REQUESTS_JITTER", 100)
+
+timeout = _entero("GUNICORN_TIMEOUT", 30)
+graceful_timeout = _entero("GUNICORN_GRACEFUL_TIMEOUT", 30)
+keepalive = _entero("GUNICORN_KEEPALIVE", 5)
+
+# Vacío desactiva el log de accesos
+accesslog = os.environ.get("GUNICORN_ACCESSLOG", "-") or None
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOGLEVEL", "info")
+
+
+def pre_fork(server, worker):
+    # Con preload_app el maestro puede haber abierto conexiones al cargar
+    # Django (p.ej. en AppConfig.ready()): se cierran antes del fork para que
+    # ningún worker herede un socket compartido.
+    from django.db import connections
+
+    connections.close_all()
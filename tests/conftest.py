@@ -0,0 +1,31 @@
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+from core.model_cache import limpiar_locales
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _cache_local():
+    """Caché en memoria en vez de Redis: los tests no necesitan el servidor"""
+    with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _cache_limpia(_cache_local):
+    """Cada test arranca con la caché vacía (estado de cuenta, ModelCache, etc.)"""
+    cache.clear()
+    limpiar_locales()
+    yield
+    cache.clear()
+    limpiar_locales()
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _celery_eager():
+    """Las tareas encoladas se ejecutan en el proceso del test, sin broker"""
+    from core.celery import app
+
+    app.conf.task_always_eager = True
+    app.conf.task_eager_propagates = True
@@ -5,7 +5,7 @@ from datetime import timedelta
 
 from apps.clientes.models import Cliente
 from apps.lineas.models import LineaServicio, EstadoLinea
-from apps.cobranza.models import Rubro, EstadoRubro
+from apps.cobranza.models import Rubro, EstadoRubro, PoliticaCobranza
 
 
 class ClienteFactory(DjangoModelFactory):
@@ -40,3 +40,13 @@ class RubroFactory(DjangoModelFactory):
     estado_rubro = EstadoRubro.NO_PAGADO
     fecha_emision = factory.LazyFunction(lambda: timezone.now() - timedelta(days=30))
     fecha_vencimiento = factory.LazyFunction(lambda: timezone.now() - timedelta(days=1))
+
+
+class PoliticaCobranzaFactory(DjangoModelFactory):
+    class Meta:
+        model = PoliticaCobranza
+
+    nombre = factory.Sequence(lambda n: f"Política {n}")
+    dias_gracia = 0
+    monto_minimo = 0
+    cantidad_minima = 1
@@ -0,0 +1,128 @@
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.clientes.models import Cliente
+from apps.cobranza.models import CollectionsRequestLog
+from core.admin import EstimatedCountPaginator, estimar_filas
+from .factories import ClienteFactory, LineaServicioFactory, RubroFactory
+
+
+@pytest.fixture
+def admin_client(client, db):
+    client.force_login(User.objects.create_superuser("admin", "admin@test.com", "admin123"))
+    return client
+
+
+def _analizar(model):
+    with connection.cursor() as cursor:
+        cursor.execute(f'ANALYZE "{model._meta.db_table}"')
+
+
+@pytest.mark.django_db
+class TestChangelists:
+    @pytest.mark.parametrize(
+        "nombre",
+        [
+            "clientes_cliente",
+            "lineas_lineaservicio",
+            "lineas_historialestadolinea",
+            "cobranza_politicacobranza",
+            "cobranza_rubro",
+            "cobranza_collectionsrun",
+            "cobranza_collectionsrequestlog",
+        ],
+    )
+    def test_changelist(self, admin_client, nombre):
+        response = admin_client.get(reverse(f"admin:{nombre}_changelist"))
+        assert response.status_code == 200
+
+    def test_rubros_sin_consulta_por_fila(self, admin_client, django_assert_max_num_queries):
+        for linea in LineaServicioFactory.create_batch(5):
+            RubroFactory.create_batch(2, linea_servicio=linea)
+        with django_assert_max_num_queries(10):
+            response = admin_client.get(reverse("admin:cobranza_rubro_changelist"))
+        assert response.status_code == 200
+
+    def test_logs_sin_consulta_por_fila(self, admin_client, django_assert_max_num_queries):
+        ahora = timezone.now()
+        CollectionsRequestLog.objects.bulk_create(
+            CollectionsRequestLog(linea_servicio=linea, started_at=ahora)
+            for linea in LineaServicioFactory.create_batch(5)
+        )
+        with django_assert_max_num_queries(10):
+            response = admin_client.get(reverse("admin:cobranza_collectionsrequestlog_changelist"))
+        assert response.status_code == 200
+
+    def test_autocomplete_lineas(self, admin_client):
+        linea = LineaServicioFactory(cliente=ClienteFactory(identificacion="0903369387"))
+        response = admin_client.get(
+            reverse("admin:autocomplete"),
+            {"app_label": "cobranza", "model_name": "rubro", "field_name": "linea_servicio", "term": "0903369387"},
+        )
+        assert response.status_code == 200
+        assert [r["id"] for r in response.json()["results"]] == [str(linea.pk)]
+
+    def test_busqueda_de_rubros_por_id_sin_upper(self, admin_client, django_assert_max_num_queries):
+        rubro = RubroFactory()
+        otro = RubroFactory(linea_servicio=LineaServicioFactory(cliente=ClienteFactory(identificacion="55")))
+        url = reverse("admin:cobranza_rubro_changelist")
+        with django_assert_max_num_queries(10) as consultas:
+            response = admin_client.get(url, {"q": str(rubro.pk)})
+        assert [r.pk for r in response.context["cl"].result_list] == [rubro.pk]
+        assert not any("UPPER" in q["sql"] for q in consultas.captured_queries)
+
+        # Identificación exacta del cliente, o id de la línea
+        response = admin_client.get(url, {"q": "55"})
+        assert otro.pk in [r.pk for r in response.context["cl"].result_list]
+        response = admin_client.get(url, {"q": str(rubro.linea_servicio_id)})
+        assert rubro.pk in [r.pk for r in response.context["cl"].result_list]
+
+    def test_busqueda_no_numerica_ignora_los_ids(self, admin_client):
+        RubroFactory()
+        response = admin_client.get(
+            reverse("admin:cobranza_collectionsrequestlog_changelist"), {"q": "abc"}
+        )
+        assert response.status_code == 200
+        assert list(response.context["cl"].result_list) == []
+
+
+@pytest.mark.django_db
+class TestEstimatedCountPaginator:
+    def test_sin_filtros_usa_la_estimacion(self, settings, django_assert_num_queries):
+        settings.ADMIN_CONTEO_MAXIMO = 2
+        ClienteFactory.create_batch(5)
+        _analizar(Cliente)
+        paginator = EstimatedCountPaginator(Cliente.all_objects.order_by("-pk"), 2)
+        with django_assert_num_queries(1) as consultas:
+            assert paginator.count == 5
+        assert "reltuples" in consultas.captured_queries[0]["sql"]
+
+    def test_bajo_el_maximo_cuenta(self, settings):
+        settings.ADMIN_CONTEO_MAXIMO = 100
+        ClienteFactory.create_batch(3)
+        assert EstimatedCountPaginator(Cliente.all_objects.all(), 2).count == 3
+
+    def test_con_filtros_cuenta_hasta_el_maximo(self, settings):
+        settings.ADMIN_CONTEO_MAXIMO = 2
+        ClienteFactory.create_batch(5)
+        assert EstimatedCountPaginator(Cliente.all_objects.filter(is_active=True), 1).count == 2
+
+    def test_tabla_particionada_suma_particiones(self):
+        ahora = timezone.now()
+        CollectionsRequestLog.objects.bulk_create(
+            CollectionsRequestLog(linea_servicio=linea, started_at=ahora)
+            for linea in LineaServicioFactory.create_batch(3)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = %s::regclass",
+                [CollectionsRequestLog._meta.db_table],
+            )
+            for (particion,) in cursor.fetchall():
+                cursor.execute(f'ANALYZE "{particion}"')
+        assert estimar_filas(CollectionsRequestLog) == 3
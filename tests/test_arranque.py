@@ -0,0 +1,57 @@
+import json
+from io import StringIO
+
+import pytest
+from django.apps import apps
+from django.core.management import call_command
+from django_celery_beat.models import PeriodicTask
+
+from apps.cobranza.beat import TAREAS_PERIODICAS, sincronizar_tareas
+from apps.cobranza.management.commands.perfil_arranque import _importaciones
+
+NOMBRES = [nombre for nombre, *_ in TAREAS_PERIODICAS]
+
+
+@pytest.mark.django_db
+class TestTareasPeriodicas:
+    def test_ready_sin_consultas(self, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            apps.get_app_config("cobranza").ready()
+
+    def test_registradas_por_la_migracion(self):
+        assert PeriodicTask.objects.filter(name__in=NOMBRES).count() == len(NOMBRES)
+
+    def test_sincronizar_idempotente(self):
+        PeriodicTask.objects.filter(name=NOMBRES[0]).delete()
+        PeriodicTask.objects.filter(name=NOMBRES[1]).update(enabled=False, task="otra")
+
+        assert sincronizar_tareas() == (1, len(NOMBRES) - 1)
+        call_command("sincronizar_beat", stdout=StringIO())
+
+        tareas = PeriodicTask.objects.filter(name__in=NOMBRES)
+        assert tareas.count() == len(NOMBRES)
+        pausada = tareas.get(name=NOMBRES[1])
+        assert pausada.task == TAREAS_PERIODICAS[1][1]
+        # La pausa hecha desde el admin se respeta; la tarea recreada nace habilitada
+        assert not pausada.enabled
+        assert tareas.get(name=NOMBRES[0]).enabled
+
+
+class TestPerfilArranque:
+    def test_importaciones_por_app(self):
+        salida = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:      1500 |       1500 | apps.cobranza.models",
+            "import time:       500 |       2000 | apps.cobranza",
+            "import time:      3000 |       3000 |   django.contrib.admin.sites",
+            "import time:      2000 |       2000 | celery.app",
+        ])
+        prefijos = [("django.contrib.admin", "admin"), ("apps.cobranza", "cobranza")]
+        assert _importaciones(salida, prefijos) == {"cobranza": 0.002, "admin": 0.003, "(celery)": 0.002}
+
+    def test_arranque_sin_consultas(self):
+        salida = StringIO()
+        call_command("perfil_arranque", "--json", stdout=salida)
+        resultado = json.loads(salida.getvalue())
+        assert resultado["consultas_totales"] == 0
+        assert {fila["app"] for fila in resultado["apps"]}
@@ -0,0 +1,94 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core import catalogos, schema
+from core.release import id_release
+from .factories import PoliticaCobranzaFactory
+
+
+@pytest.fixture
+def auth_client(db):
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user("u", "u@t.com", "pass"))
+    return client
+
+
+@pytest.mark.django_db
+class TestCatalogos:
+    def test_segunda_peticion_sin_consultas(self, auth_client, django_assert_num_queries):
+        PoliticaCobranzaFactory(nombre="Estándar", monto_minimo=10)
+        response = auth_client.get(reverse("catalogos"))
+        assert response.status_code == 200
+        assert response.data["politicas_cobranza"][0]["monto_minimo"] == "10.00"
+        assert "ACTIVO" in response.data["transiciones_linea"]["SUSPENDIDO"]
+        with django_assert_num_queries(0):
+            assert auth_client.get(reverse("catalogos")).data == response.data
+
+    def test_editar_politica_invalida(self, auth_client, django_capture_on_commit_callbacks):
+        politica = PoliticaCobranzaFactory(nombre="Estándar")
+        auth_client.get(reverse("catalogos"))
+        with django_capture_on_commit_callbacks(execute=True):
+            politica.nombre = "Corporativa"
+            politica.save()
+        response = auth_client.get(reverse("catalogos"))
+        assert response.data["politicas_cobranza"][0]["nombre"] == "Corporativa"
+
+    def test_requiere_autenticacion(self, client):
+        assert client.get(reverse("catalogos")).status_code == 401
+
+
+@pytest.mark.django_db
+class TestSchemaCacheado:
+    def test_se_genera_una_vez(self, client, monkeypatch):
+        client.get(reverse("schema"))
+        monkeypatch.setattr(
+            "drf_spectacular.generators.SchemaGenerator.get_schema",
+            lambda *a, **kw: pytest.fail("el schema debe salir de la caché"),
+        )
+        response = client.get(reverse("schema"), HTTP_ACCEPT="application/vnd.oai.openapi+json")
+        assert response.status_code == 200
+        assert response.json()["info"]["title"] == "Billing-Service API"
+        assert "/api/catalogos/" in response.json()["paths"]
+
+
+@pytest.mark.django_db
+class TestComandoCaches:
+    def test_calentar_y_vaciar(self):
+        call_command("caches", "calentar")
+        assert cache.get(catalogos.CACHE_KEY.format(id_release())) is not None
+        assert cache.get(schema._clave(None)) is not None
+
+        call_command("caches", "vaciar")
+        assert cache.get(catalogos.CACHE_KEY.format(id_release())) is None
+        assert cache.get(schema._clave(None)) is None
+
+    def test_calentar_reemplaza_lo_cacheado(self, monkeypatch):
+        call_command("caches", "calentar")
+        # Lo que cambiaría un deploy: catálogos y schema generados distintos
+        monkeypatch.setattr(catalogos, "construir_catalogos", lambda: {"nuevo": True})
+        monkeypatch.setattr(
+            "drf_spectacular.generators.SchemaGenerator.get_schema",
+            lambda *a, **kw: {"openapi": "nuevo"},
+        )
+        call_command("caches", "calentar")
+        assert cache.get(catalogos.CACHE_KEY.format(id_release())) == {"nuevo": True}
+        assert cache.get(schema._clave(None)) == {"openapi": "nuevo"}
+
+    def test_otra_release_no_usa_lo_cacheado(self, settings):
+        call_command("caches", "calentar")
+        settings.RELEASE_ID = "r2"
+        id_release.cache_clear()
+        try:
+            assert cache.get(catalogos.CACHE_KEY.format(id_release())) is None
+            assert cache.get(schema._clave(None)) is None
+        finally:
+            id_release.cache_clear()
+
+    def test_vaciar_todo(self):
+        cache.set("otra", 1)
+        call_command("caches", "vaciar", "--todo")
+        assert cache.get("otra") is None
@@ -111,3 +111,119 @@ class TestClienteDetail:
         url = reverse("cliente-detail", args=[cliente.pk])
         response = admin_client.delete(url)
         assert response.status_code == status.HTTP_409_CONFLICT
+
+
+@pytest.mark.django_db
+class TestClientesInactivos:
+    def test_listado_excluye_eliminados(self, auth_client):
+        activo = ClienteFactory()
+        ClienteFactory(is_active=False)
+        response = auth_client.get(reverse("cliente-list"))
+        assert [c["id"] for c in response.data["results"]] == [activo.pk]
+
+    def test_include_inactive(self, auth_client):
+        ClienteFactory()
+        eliminado = ClienteFactory(is_active=False)
+        response = auth_client.get(reverse("cliente-list") + "?include_inactive=1")
+        assert response.data["count"] == 2
+
+        url = reverse("cliente-detail", args=[eliminado.pk])
+        assert auth_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+        assert auth_client.get(url + "?include_inactive=1").status_code == status.HTTP_200_OK
+
+    def test_managers(self):
+        ClienteFactory()
+        ClienteFactory(is_active=False)
+        assert Cliente.objects.count() == 1
+        assert Cliente.all_objects.count() == 2
+
+    def test_identificacion_de_eliminado_sigue_ocupada(self, auth_client):
+        ClienteFactory(identificacion="0903369387", is_active=False)
+        url = reverse("cliente-list")
+        response = auth_client.post(url, {"identificacion": "0903369387", "razon_social": "Otro"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "identificacion" in response.data
+
+
+@pytest.mark.django_db
+class TestEstadoCuenta:
+    def _crear_rubros(self, cliente):
+        from datetime import timedelta
+        from decimal import Decimal
+        from django.utils import timezone
+        from apps.cobranza.models import EstadoRubro
+        from .factories import LineaServicioFactory, RubroFactory
+
+        now = timezone.now()
+        linea1 = LineaServicioFactory(cliente=cliente, linea_numero=1)
+        linea2 = LineaServicioFactory(cliente=cliente, linea_numero=2)
+        RubroFactory(linea_servicio=linea1, valor_total=Decimal("10.00"), estado_rubro=EstadoRubro.PAGADO)
+        RubroFactory(linea_servicio=linea1, valor_total=Decimal("20.00"), estado_rubro=EstadoRubro.NO_PAGADO)
+        RubroFactory(linea_servicio=linea1, valor_total=Decimal("99.00"), estado_rubro=EstadoRubro.ANULADO)
+        RubroFactory(
+            linea_servicio=linea2,
+            valor_total=Decimal("30.00"),
+            fecha_emision=now,
+            fecha_vencimiento=now + timedelta(days=5),
+        )
+        return linea1, linea2
+
+    def test_totales_por_linea(self, auth_client):
+        cliente = ClienteFactory()
+        linea1, linea2 = self._crear_rubros(cliente)
+        response = auth_client.get(reverse("cliente-estado-cuenta", args=[cliente.pk]))
+        assert response.status_code == status.HTTP_200_OK
+        data = response.data
+        assert data["total_facturado"] == "60.00"
+        assert data["total_pagado"] == "10.00"
+        assert data["vencido"] == "20.00"
+        assert data["pendiente"] == "30.00"
+        assert data["proximo_vencimiento"] is not None
+        assert [l["linea_id"] for l in data["lineas"]] == [linea1.pk, linea2.pk]
+        assert data["lineas"][0]["vencido"] == "20.00"
+        assert data["lineas"][1]["pendiente"] == "30.00"
+
+    def test_respuesta_cacheada_hasta_escritura_de_rubro(
+        self, auth_client, django_assert_num_queries, django_capture_on_commit_callbacks
+    ):
+        from apps.cobranza.models import EstadoRubro
+
+        cliente = ClienteFactory()
+        linea1, _ = self._crear_rubros(cliente)
+        url = reverse("cliente-estado-cuenta", args=[cliente.pk])
+        auth_client.get(url)
+
+        # Solo el get_object del cliente
+        with django_assert_num_queries(1):
+            assert auth_client.get(url).data["vencido"] == "20.00"
+
+        rubro = linea1.rubros.get(estado_rubro=EstadoRubro.NO_PAGADO)
+        rubro.estado_rubro = EstadoRubro.PAGADO
+        with django_capture_on_commit_callbacks(execute=True):
+            rubro.save()
+
+        data = auth_client.get(url).data
+        assert data["vencido"] == "0.00"
+        assert data["total_pagado"] == "30.00"
+
+    def test_cambio_de_estado_de_linea_invalida(self, auth_client, django_capture_on_commit_callbacks):
+        from apps.cobranza.services import evaluate_lines
+        from apps.lineas.models import EstadoLinea, LineaServicio
+
+        cliente = ClienteFactory()
+        linea1, linea2 = self._crear_rubros(cliente)
+        LineaServicio.objects.filter(pk__in=[linea1.pk, linea2.pk]).update(estado_linea=EstadoLinea.ACTIVO)
+        url = reverse("cliente-estado-cuenta", args=[cliente.pk])
+        assert auth_client.get(url).data["lineas"][0]["estado_linea"] == EstadoLinea.ACTIVO
+
+        # La cobranza suspende la línea con deuda vencida (bulk_update)
+        with django_capture_on_commit_callbacks(execute=True):
+            evaluate_lines([linea1.pk, linea2.pk])
+        assert auth_client.get(url).data["lineas"][0]["estado_linea"] == EstadoLinea.SUSPENDIDO
+
+        # PATCH de una línea
+        with django_capture_on_commit_callbacks(execute=True):
+            auth_client.patch(
+                reverse("linea-detail", args=[linea2.pk]), {"estado_linea": EstadoLinea.CANCELADO}, format="json"
+            )
+        assert auth_client.get(url).data["lineas"][1]["estado_linea"] == EstadoLinea.CANCELADO
@@ -0,0 +1,87 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.test import RequestFactory
+from django.urls import reverse
+
+from core import health
+from core.health import healthcheck, healthcheck_async
+
+# Puerto sin servicio: la prueba de Redis falla al instante
+REDIS_CAIDO = "redis://127.0.0.1:1/0"
+
+
+@pytest.fixture(autouse=True)
+def _redis_caido(settings):
+    settings.REDIS_URL = REDIS_CAIDO
+    health._sondeo.update(resultado=None, en=0.0)
+    yield
+    health._sondeo.update(resultado=None, en=0.0)
+
+
+@pytest.mark.django_db
+class TestHealthcheck:
+    def test_sincrono_degradado_sin_redis(self):
+        response = healthcheck(RequestFactory().get("/health/"))
+        data = json.loads(response.content)
+        assert response.status_code == 503
+        assert data["db"] == "ok"
+        assert data["status"] == "degraded"
+
+    def test_async_prueba_db_y_redis(self):
+        response = async_to_sync(healthcheck_async)(RequestFactory().get("/health/"))
+        data = json.loads(response.content)
+        assert response.status_code == 503
+        assert data["db"] == "ok"
+        assert data["redis"] != "ok"
+
+    def test_liveness_no_toca_dependencias(self, client, django_assert_num_queries, monkeypatch):
+        monkeypatch.setattr(health, "_probar_redis", lambda: pytest.fail("no debe probar Redis"))
+        with django_assert_num_queries(0):
+            response = client.get(reverse("health-live"))
+        assert response.status_code == 200
+
+    def test_readiness_cachea_el_sondeo(self, client, monkeypatch):
+        llamadas = []
+        monkeypatch.setattr(health, "_probar_db", lambda: llamadas.append("db") or "ok")
+        monkeypatch.setattr(health, "_probar_redis", lambda: llamadas.append("redis") or "ok")
+        for _ in range(5):
+            response = client.get(reverse("health-ready"))
+        assert response.status_code == 200
+        assert llamadas == ["db", "redis"]
+
+    def test_readiness_vuelve_a_probar_al_expirar(self, client, settings, monkeypatch):
+        settings.HEALTH_CACHE_SECONDS = 0
+        llamadas = []
+        monkeypatch.setattr(health, "_probar_db", lambda: llamadas.append("db") or "ok")
+        monkeypatch.setattr(health, "_probar_redis", lambda: "ok")
+        client.get(reverse("health-ready"))
+        client.get(reverse("health-ready"))
+        assert llamadas == ["db", "db"]
+
+
+class TestRedisClient:
+    def test_reutiliza_el_cliente_por_url(self):
+        from core.redis_client import get_redis
+
+        assert get_redis(REDIS_CAIDO) is get_redis(REDIS_CAIDO)
+        assert get_redis(REDIS_CAIDO) is not get_redis("redis://127.0.0.1:2/0")
+
+
+class TestAsgi:
+    def test_sin_conexiones_persistentes(self):
+        codigo = "import core.asgi; from django.conf import settings; print(settings.DATABASES['default']['CONN_MAX_AGE'])"
+        salida = subprocess.run(
+            [sys.executable, "-c", codigo],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "DB_CONN_MAX_AGE": "60"},
+        )
+        assert salida.stdout.strip() == "0"
@@ -1,12 +1,23 @@
+import json
+
 import pytest
+from asgiref.sync import async_to_sync
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.test import RequestFactory
 from django.urls import reverse
 from rest_framework import status
 from django.contrib.auth.models import User
 from rest_framework.test import APIClient
 
-from apps.lineas.models import LineaServicio, EstadoLinea
+from apps.lineas.models import LineaServicio, EstadoLinea, HistorialEstadoLinea
 from apps.clientes.models import Cliente
-from .factories import ClienteFactory, LineaServicioFactory
+from apps.clientes.cache import clientes
+from apps.lineas.views import LineaServicioViewSet, estado_cobranza_async
+from apps.lineas import services
+from core.mixins import ConflictoVersion
+from rest_framework_simplejwt.tokens import AccessToken
+from .factories import ClienteFactory, LineaServicioFactory, RubroFactory
 
 
 @pytest.fixture
@@ -26,6 +37,17 @@ def auth_client(api_client, auth_user):
     return api_client
 
 
+@pytest.fixture
+def admin_user(db):
+    return User.objects.create_superuser("admin", "admin@test.com", "admin123")
+
+
+@pytest.fixture
+def admin_client(api_client, admin_user):
+    api_client.force_authenticate(user=admin_user)
+    return api_client
+
+
 @pytest.mark.django_db
 class TestLineaServicio:
     def test_create_linea(self, auth_client):
@@ -85,6 +107,19 @@ class TestLineaServicio:
         response = auth_client.get(url)
         assert response.data["count"] == 2
 
+    def test_listado_excluye_eliminadas(self, auth_client):
+        activa = LineaServicioFactory()
+        LineaServicioFactory(is_active=False)
+        response = auth_client.get(reverse("linea-list"))
+        assert [l["id"] for l in response.data["results"]] == [activa.pk]
+        response = auth_client.get(reverse("linea-list") + "?include_inactive=1")
+        assert response.data["count"] == 2
+
+    def test_delete_ya_eliminada_returns_409(self, admin_client):
+        linea = LineaServicioFactory(is_active=False)
+        response = admin_client.delete(reverse("linea-detail", args=[linea.pk]))
+        assert response.status_code == status.HTTP_409_CONFLICT
+
     def test_estado_cobranza_endpoint(self, auth_client):
         linea = LineaServicioFactory()
         url = reverse("linea-estado-cobranza", args=[linea.pk])
@@ -93,3 +128,309 @@ class TestLineaServicio:
         assert "unpaid_count" in response.data
         assert "saldo_vencido" in response.data
         assert "ultimos_logs" in response.data
+
+
+@pytest.mark.django_db
+class TestLineaServicioValidacion:
+    def test_create_query_count(self, auth_client, django_assert_num_queries):
+        cliente = ClienteFactory()
+        url = reverse("linea-list")
+        data = {"cliente": cliente.pk, "linea_numero": 1, "estado_linea": EstadoLinea.ACTIVO}
+        # cliente + unique_together del serializer + INSERT
+        with django_assert_num_queries(3):
+            response = auth_client.post(url, data)
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def test_update_query_count(self, auth_client, django_assert_num_queries):
+        linea = LineaServicioFactory(estado_linea=EstadoLinea.NO_INSTALADO)
+        url = reverse("linea-detail", args=[linea.pk])
+        # get_object (con select_related) + UPDATE: clean() reutiliza ese cliente
+        with django_assert_num_queries(2):
+            response = auth_client.patch(url, {"estado_linea": EstadoLinea.ACTIVO})
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_save_sin_cliente_cargado_valida_cliente_inactivo(self):
+        cliente = ClienteFactory(is_active=False)
+        linea = LineaServicio(
+            cliente_id=cliente.pk, linea_numero=1, estado_linea=EstadoLinea.ACTIVO
+        )
+        with pytest.raises(ValidationError):
+            linea.save()
+
+    def test_save_no_confia_en_el_cliente_cacheado(self):
+        cliente = ClienteFactory()
+        clientes.get(cliente.pk)
+        # Desactivado sin señales: el ModelCache sigue viéndolo activo
+        Cliente.all_objects.filter(pk=cliente.pk).update(is_active=False)
+        # Instancia cargada en la FK, pero sacada de la caché: se relee
+        linea = LineaServicio(
+            cliente=clientes.get(cliente.pk), linea_numero=1, estado_linea=EstadoLinea.ACTIVO
+        )
+        with pytest.raises(ValidationError):
+            linea.save()
+
+    def test_alta_no_confia_en_el_cliente_cacheado(self, auth_client, django_assert_num_queries):
+        cliente = ClienteFactory()
+        clientes.get(cliente.pk)
+        Cliente.all_objects.filter(pk=cliente.pk).update(is_active=False)
+        data = {"cliente": cliente.pk, "linea_numero": 1, "estado_linea": EstadoLinea.NO_INSTALADO}
+        # is_active fresco (el resto del cliente sale de la caché); no llega al INSERT
+        with django_assert_num_queries(1):
+            response = auth_client.post(reverse("linea-list"), data)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "cliente" in response.data
+
+    def test_save_valida_linea_numero(self):
+        linea = LineaServicio(cliente=ClienteFactory(), linea_numero=0)
+        with pytest.raises(ValidationError):
+            linea.save()
+
+    def test_skip_clean_no_consulta_cliente(self, django_assert_num_queries):
+        linea = LineaServicioFactory(estado_linea=EstadoLinea.ACTIVO)
+        linea = LineaServicio.objects.get(pk=linea.pk)
+        linea.estado_linea = EstadoLinea.SUSPENDIDO
+        with django_assert_num_queries(1):
+            linea.save(update_fields=["estado_linea", "modified_at"], skip_clean=True)
+
+
+@pytest.mark.django_db
+class TestEstadoCobranzaAsync:
+    def _get(self, pk, user=None, query=""):
+        headers = {}
+        if user is not None:
+            headers["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(user)}"
+        request = RequestFactory().get(f"/api/lineas/{pk}/estado-cobranza/{query}", **headers)
+        return async_to_sync(estado_cobranza_async)(request, pk=pk)
+
+    def test_mismo_resumen_que_la_vista_sincrona(self, auth_client, auth_user):
+        from apps.cobranza.models import EstadoRubro
+        from django.utils import timezone
+        from datetime import timedelta
+
+        linea = LineaServicioFactory()
+        RubroFactory(
+            linea_servicio=linea,
+            estado_rubro=EstadoRubro.NO_PAGADO,
+            fecha_vencimiento=timezone.now() - timedelta(days=3),
+        )
+        response = self._get(linea.pk, auth_user)
+        assert response.status_code == status.HTTP_200_OK
+        sync = auth_client.get(reverse("linea-estado-cobranza", args=[linea.pk]))
+        assert json.loads(response.content) == json.loads(sync.content)
+        assert json.loads(response.content)["unpaid_count"] == 1
+
+    def test_sin_token_401(self):
+        linea = LineaServicioFactory()
+        response = self._get(linea.pk)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.headers["WWW-Authenticate"].startswith("Bearer")
+
+    def test_linea_inexistente_404(self, auth_user):
+        response = self._get(999999, auth_user)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_linea_eliminada_solo_con_include_inactive(self, auth_user):
+        linea = LineaServicioFactory(is_active=False)
+        assert self._get(linea.pk, auth_user).status_code == status.HTTP_404_NOT_FOUND
+        response = self._get(linea.pk, auth_user, "?include_inactive=1")
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_otros_metodos_como_la_accion_de_drf(self, auth_user):
+        linea = LineaServicioFactory()
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(auth_user)}"}
+        url = f"/api/lineas/{linea.pk}/estado-cobranza/"
+
+        def llamar(metodo):
+            request = getattr(RequestFactory(), metodo)(url, **headers)
+            response = async_to_sync(estado_cobranza_async)(request, pk=linea.pk)
+            return response.render() if hasattr(response, "render") else response
+
+        assert llamar("head").status_code == status.HTTP_200_OK
+        options = llamar("options")
+        assert options.status_code == status.HTTP_200_OK
+        assert "GET" in options["Allow"]
+        post = llamar("post")
+        assert post.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+        assert "GET" in post["Allow"]
+
+
+@pytest.mark.django_db
+class TestTransicionMasiva:
+    url = reverse("linea-transicion-masiva")
+
+    def _post(self, client, data):
+        return client.post(self.url, data, format="json")
+
+    def test_solo_admin(self, auth_client):
+        linea = LineaServicioFactory()
+        response = self._post(auth_client, {"ids": [linea.pk], "estado_linea": EstadoLinea.SUSPENDIDO})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_resultados_por_linea(self, admin_client, admin_user):
+        activa = LineaServicioFactory(estado_linea=EstadoLinea.ACTIVO)
+        suspendida = LineaServicioFactory(estado_linea=EstadoLinea.SUSPENDIDO)
+        cancelada = LineaServicioFactory(estado_linea=EstadoLinea.CANCELADO)
+        eliminada = LineaServicioFactory(estado_linea=EstadoLinea.ACTIVO, is_active=False)
+
+        response = self._post(
+            admin_client,
+            {
+                "ids": [activa.pk, suspendida.pk, cancelada.pk, eliminada.pk, 999999],
+                "estado_linea": EstadoLinea.SUSPENDIDO,
+                "motivo": "Caída zona norte",
+            },
+        )
+        assert response.status_code == status.HTTP_200_OK
+        resultados = {r["linea_id"]: r["resultado"] for r in response.data["resultados"]}
+        assert resultados == {
+            activa.pk: "APLICADA",
+            suspendida.pk: "SIN_CAMBIO",
+            cancelada.pk: "RECHAZADA",
+            eliminada.pk: "RECHAZADA",
+            999999: "NO_ENCONTRADA",
+        }
+        assert response.data["por_resultado"] == {
+            "APLICADA": 1, "SIN_CAMBIO": 1, "RECHAZADA": 2, "NO_ENCONTRADA": 1,
+        }
+
+        activa.refresh_from_db()
+        cancelada.refresh_from_db()
+        assert activa.estado_linea == EstadoLinea.SUSPENDIDO
+        assert cancelada.estado_linea == EstadoLinea.CANCELADO
+        historial = HistorialEstadoLinea.objects.get()
+        assert historial.linea_servicio_id == activa.pk
+        assert historial.estado_anterior == EstadoLinea.ACTIVO
+        assert historial.usuario == admin_user
+        assert historial.motivo == "Caída zona norte"
+
+    def test_no_activa_lineas_de_cliente_inactivo(self, admin_client):
+        linea = LineaServicioFactory(
+            estado_linea=EstadoLinea.SUSPENDIDO, cliente=ClienteFactory(is_active=False)
+        )
+        response = self._post(admin_client, {"ids": [linea.pk], "estado_linea": EstadoLinea.ACTIVO})
+        resultado = response.data["resultados"][0]
+        assert resultado["resultado"] == "RECHAZADA"
+        assert "cliente inactivo" in resultado["detalle"]
+        linea.refresh_from_db()
+        assert linea.estado_linea == EstadoLinea.SUSPENDIDO
+
+    def test_por_filtros_con_consultas_por_lote(self, admin_client, settings, django_assert_num_queries):
+        settings.LINEAS_TRANSICION_LOTE = 2
+        cliente = ClienteFactory()
+        lineas = [
+            LineaServicioFactory(cliente=cliente, linea_numero=n, estado_linea=EstadoLinea.ACTIVO)
+            for n in range(1, 4)
+        ]
+        otra = LineaServicioFactory(estado_linea=EstadoLinea.ACTIVO)
+
+        # 1 ids filtrados + por lote (2): savepoint, SELECT FOR UPDATE, UPDATE, INSERT, release
+        with django_assert_num_queries(11):
+            response = self._post(
+                admin_client,
+                {"filtros": {"cliente_id": cliente.pk}, "estado_linea": EstadoLinea.CANCELADO},
+            )
+        assert response.data["por_resultado"]["APLICADA"] == 3
+        assert LineaServicio.objects.filter(
+            pk__in=[l.pk for l in lineas], estado_linea=EstadoLinea.CANCELADO
+        ).count() == 3
+        otra.refresh_from_db()
+        assert otra.estado_linea == EstadoLinea.ACTIVO
+
+    def test_filtro_desconocido_400(self, admin_client):
+        LineaServicioFactory(estado_linea=EstadoLinea.ACTIVO)
+        response = self._post(
+            admin_client, {"filtros": {"zona": "norte"}, "estado_linea": EstadoLinea.SUSPENDIDO}
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not HistorialEstadoLinea.objects.exists()
+
+    def test_ids_o_filtros(self, admin_client):
+        response = self._post(admin_client, {"estado_linea": EstadoLinea.SUSPENDIDO})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestConcurrenciaOptimista:
+    def _url(self, linea):
+        return reverse("linea-detail", args=[linea.pk])
+
+    def test_etag_e_if_match(self, auth_client):
+        linea = LineaServicioFactory(fecha_instalacion=None)
+        response = auth_client.get(self._url(linea))
+        assert response["ETag"] == '"1"'
+
+        response = auth_client.patch(
+            self._url(linea), {"fecha_instalacion": "2025-01-10"}, format="json", HTTP_IF_MATCH='"1"'
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] == '"2"'
+        assert response.data["version"] == 2
+
+    def test_if_match_viejo_412(self, auth_client):
+        linea = LineaServicioFactory(estado_linea=EstadoLinea.ACTIVO)
+        etag = auth_client.get(self._url(linea))["ETag"]
+        # La cobranza suspende la línea entre la lectura y la escritura del cliente
+        services.transicion_masiva(EstadoLinea.SUSPENDIDO, ids=[linea.pk])
+
+        response = auth_client.patch(
+            self._url(linea), {"estado_linea": EstadoLinea.ACTIVO}, format="json", HTTP_IF_MATCH=etag
+        )
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        linea.refresh_from_db()
+        assert linea.estado_linea == EstadoLinea.SUSPENDIDO
+        assert linea.version == 2
+
+    def test_if_match_comodin_y_debil(self, auth_client):
+        linea = LineaServicioFactory()
+        for if_match in ("*", 'W/"2", "1"'):
+            response = auth_client.patch(
+                self._url(linea), {"linea_numero": linea.linea_numero}, format="json", HTTP_IF_MATCH=if_match
+            )
+            assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.django_db(transaction=True)
+    def test_escritura_concurrente_409(self, auth_client, monkeypatch):
+        linea = LineaServicioFactory(estado_linea=EstadoLinea.ACTIVO)
+        get_object = LineaServicioViewSet.get_object
+
+        def leer_y_suspender(viewset):
+            obj = get_object(viewset)
+            # La cobranza escribe después de la lectura del PATCH
+            services.transicion_masiva(EstadoLinea.SUSPENDIDO, ids=[obj.pk])
+            return obj
+
+        monkeypatch.setattr(LineaServicioViewSet, "get_object", leer_y_suspender)
+        response = auth_client.patch(self._url(linea), {"fecha_instalacion": "2025-01-10"}, format="json")
+        assert response.status_code == status.HTTP_409_CONFLICT
+        linea.refresh_from_db()
+        assert linea.estado_linea == EstadoLinea.SUSPENDIDO
+
+    @pytest.mark.django_db(transaction=True)
+    def test_baja_concurrente_409(self, admin_client, monkeypatch):
+        linea = LineaServicioFactory(estado_linea=EstadoLinea.ACTIVO)
+        get_object = LineaServicioViewSet.get_object
+
+        def leer_y_suspender(viewset):
+            obj = get_object(viewset)
+            services.transicion_masiva(EstadoLinea.SUSPENDIDO, ids=[obj.pk])
+            return obj
+
+        monkeypatch.setattr(LineaServicioViewSet, "get_object", leer_y_suspender)
+        response = admin_client.delete(self._url(linea))
+        assert response.status_code == status.HTTP_409_CONFLICT
+        linea.refresh_from_db()
+        assert linea.is_active
+
+    def test_instancia_vieja_no_pisa(self):
+        linea = LineaServicioFactory(estado_linea=EstadoLinea.ACTIVO)
+        vieja = LineaServicio.all_objects.get(pk=linea.pk)
+        linea.estado_linea = EstadoLinea.SUSPENDIDO
+        linea.save()
+        assert linea.version == 2
+
+        vieja.fecha_instalacion = None
+        with pytest.raises(ConflictoVersion), transaction.atomic():
+            vieja.save()
+        # El soft delete también incrementa la versión
+        linea.delete()
+        assert LineaServicio.all_objects.get(pk=linea.pk).version == 3
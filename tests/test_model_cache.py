@@ -0,0 +1,101 @@
+import pytest
+from django.urls import reverse
+
+from apps.clientes.cache import clientes
+from apps.clientes.models import Cliente
+from apps.lineas.cache import lineas
+from apps.lineas.models import EstadoLinea, LineaServicio
+from core.model_cache import limpiar_locales
+from .factories import ClienteFactory, LineaServicioFactory
+
+
+@pytest.mark.django_db
+class TestModelCache:
+    def test_segunda_lectura_sin_consulta(self, django_assert_num_queries):
+        cliente = ClienteFactory()
+        with django_assert_num_queries(1):
+            assert clientes.get(cliente.pk).razon_social == cliente.razon_social
+        with django_assert_num_queries(0):
+            assert clientes.get(cliente.pk).pk == cliente.pk
+
+    def test_cache_compartida_entre_procesos(self, django_assert_num_queries):
+        cliente = ClienteFactory()
+        clientes.get(cliente.pk)
+        # Otro proceso: LRU vacío, pero la caché de Django ya la tiene
+        limpiar_locales()
+        antes = clientes.estadisticas()["hits_compartida"]
+        with django_assert_num_queries(0):
+            clientes.get(cliente.pk)
+        assert clientes.estadisticas()["hits_compartida"] == antes + 1
+
+    def test_get_many_una_consulta_para_los_que_faltan(self, django_assert_num_queries):
+        a, b, c = ClienteFactory.create_batch(3)
+        clientes.get(a.pk)
+        with django_assert_num_queries(1):
+            encontrados = clientes.get_many([a.pk, b.pk, c.pk, 999999])
+        assert set(encontrados) == {a.pk, b.pk, c.pk}
+
+    def test_get_by_identificacion(self, django_assert_num_queries):
+        cliente = ClienteFactory(identificacion="0903369387")
+        assert clientes.get_by("identificacion", "0903369387").pk == cliente.pk
+        with django_assert_num_queries(0):
+            assert clientes.get_by("identificacion", "0903369387").pk == cliente.pk
+
+    def test_guardar_y_soft_delete_invalidan(self, django_capture_on_commit_callbacks):
+        cliente = ClienteFactory(razon_social="Antes")
+        clientes.get(cliente.pk)
+        cliente.razon_social = "Después"
+        with django_capture_on_commit_callbacks(execute=True):
+            cliente.save()
+        assert clientes.get(cliente.pk).razon_social == "Después"
+
+        with django_capture_on_commit_callbacks(execute=True):
+            cliente.delete()
+        assert clientes.get(cliente.pk).is_active is False
+
+    def test_lectura_previa_a_la_invalidacion_no_queda_cacheada(self, monkeypatch):
+        cliente = ClienteFactory(razon_social="Antes")
+        guardar = clientes._guardar
+
+        def commit_concurrente(objs, generaciones):
+            # Otro proceso confirma e invalida entre la lectura y el set_many
+            Cliente.all_objects.filter(pk=cliente.pk).update(razon_social="Después")
+            clientes.invalidar(cliente.pk)
+            guardar(objs, generaciones)
+
+        monkeypatch.setattr(clientes, "_guardar", commit_concurrente)
+        assert clientes.get(cliente.pk).razon_social == "Antes"
+        monkeypatch.undo()
+
+        limpiar_locales()
+        assert clientes.get(cliente.pk).razon_social == "Después"
+
+    def test_devuelve_copias(self):
+        cliente = ClienteFactory(razon_social="Original")
+        clientes.get(cliente.pk).razon_social = "Modificada"
+        assert clientes.get(cliente.pk).razon_social == "Original"
+
+    def test_str_de_linea_usa_la_cache(self, django_assert_num_queries):
+        linea = LineaServicioFactory()
+        # Sin el cliente cargado en la instancia
+        linea = LineaServicio.objects.get(pk=linea.pk)
+        cliente = clientes.get(linea.cliente_id)
+        with django_assert_num_queries(0):
+            assert cliente.razon_social in str(linea)
+
+    def test_transicion_masiva_invalida_las_lineas(self, django_capture_on_commit_callbacks):
+        from apps.lineas.services import transicion_masiva
+
+        linea = LineaServicioFactory(estado_linea=EstadoLinea.ACTIVO)
+        assert lineas.get(linea.pk).estado_linea == EstadoLinea.ACTIVO
+        with django_capture_on_commit_callbacks(execute=True):
+            transicion_masiva(EstadoLinea.SUSPENDIDO, ids=[linea.pk])
+        assert lineas.get(linea.pk).estado_linea == EstadoLinea.SUSPENDIDO
+
+    def test_contadores_expuestos(self, client):
+        cliente = ClienteFactory()
+        clientes.get(cliente.pk)
+        clientes.get(cliente.pk)
+        data = client.get(reverse("health-caches")).json()
+        stats = data["model_cache"]["clientes.cliente"]
+        assert stats["misses"] >= 1 and stats["hits_local"] >= 1
@@ -0,0 +1,78 @@
+import pytest
+from datetime import timedelta
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from apps.cobranza import particiones
+from apps.cobranza.models import CollectionsRequestLog
+from .factories import LineaServicioFactory
+
+
+def _filas(tabla):
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT COUNT(*) FROM "{tabla}"')
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+class TestParticionesLogs:
+    def test_tabla_particionada_con_meses_futuros(self):
+        assert particiones.esta_particionada()
+        existentes = particiones.particiones_existentes()
+        for meses in range(4):
+            assert particiones.inicio_mes(timezone.now(), meses) in existentes
+
+    def test_crear_particion_mueve_filas_de_default(self):
+        antiguo = timezone.now() - timedelta(days=900)
+        log = CollectionsRequestLog.objects.create(
+            linea_servicio=LineaServicioFactory(), started_at=antiguo
+        )
+        assert _filas(particiones.PARTICION_DEFAULT) == 1
+
+        assert particiones.crear_particion(antiguo) is True
+        assert particiones.crear_particion(antiguo) is False
+
+        nombre = particiones.nombre_particion(particiones.inicio_mes(antiguo))
+        assert _filas(particiones.PARTICION_DEFAULT) == 0
+        assert _filas(nombre) == 1
+        assert CollectionsRequestLog.objects.filter(pk=log.pk).exists()
+
+    def test_purga_elimina_particiones_vencidas(self):
+        linea = LineaServicioFactory()
+        antiguo = timezone.now() - timedelta(days=900)
+        particiones.crear_particion(antiguo)
+        CollectionsRequestLog.objects.create(linea_servicio=linea, started_at=antiguo)
+        reciente = CollectionsRequestLog.objects.create(
+            linea_servicio=linea, started_at=timezone.now()
+        )
+        # En producción la purga corre en su propia transacción; aquí hay que
+        # validar antes la FK diferida de los inserts del test.
+        with connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+        purgadas = particiones.purgar_particiones(retencion_meses=12)
+
+        assert purgadas == [particiones.nombre_particion(particiones.inicio_mes(antiguo))]
+        assert list(CollectionsRequestLog.objects.values_list("pk", flat=True)) == [reciente.pk]
+
+    def test_comando_archiva_en_lugar_de_eliminar(self):
+        antiguo = timezone.now() - timedelta(days=900)
+        particiones.crear_particion(antiguo)
+        call_command("particiones_logs", "--retencion", "12", "--archivar", stdout=None)
+
+        mes = particiones.inicio_mes(antiguo)
+        assert mes not in particiones.particiones_existentes()
+        assert _filas(f"{particiones.TABLA}_archivo_p{mes:%Y%m}") == 0
+
+    def test_comando_no_archivar_pisa_el_setting(self, settings):
+        settings.COBRANZA_LOGS_ARCHIVAR = True
+        antiguo = timezone.now() - timedelta(days=900)
+        particiones.crear_particion(antiguo)
+        call_command("particiones_logs", "--retencion", "12", "--no-archivar", stdout=None)
+
+        mes = particiones.inicio_mes(antiguo)
+        assert mes not in particiones.particiones_existentes()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s)", [f"{particiones.TABLA}_archivo_p{mes:%Y%m}"])
+            assert cursor.fetchone()[0] is None
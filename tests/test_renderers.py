@@ -0,0 +1,76 @@
+import io
+import pytest
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.cobranza.models import Rubro, EstadoRubro
+from apps.cobranza.serializers import RubroSerializer
+from core import parsers, renderers
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+
+GYE = ZoneInfo("America/Guayaquil")
+
+
+def _payload():
+    emision = datetime(2026, 3, 1, 8, 30, 15, 123456, tzinfo=GYE)
+    rubro = Rubro(
+        id=7,
+        linea_servicio_id=3,
+        valor_total=Decimal("1250.50"),
+        estado_rubro=EstadoRubro.NO_PAGADO,
+        fecha_emision=emision,
+        fecha_vencimiento=emision + timedelta(days=30),
+        created_at=emision,
+        modified_at=emision,
+    )
+    return {
+        "count": 1,
+        "results": [RubroSerializer(rubro).data],
+        "saldo_vencido": Decimal("99.90"),
+        "generado": timezone.localtime(datetime(2026, 3, 2, 12, 0, tzinfo=dt_timezone.utc), GYE),
+        "utc": datetime(2026, 3, 2, 12, 0, tzinfo=dt_timezone.utc),
+        "fecha": date(2026, 3, 2),
+        "razon_social": "Telecomunicaciones Ñandú S.A. ",
+        "estados": (EstadoRubro.PAGADO, EstadoRubro.ANULADO),
+    }
+
+
+class TestORJSONRenderer:
+    def test_bytes_identicos_a_drf(self):
+        data = _payload()
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_indentacion_usa_renderer_estandar(self):
+        data = _payload()
+        media_type = "application/json; indent=4"
+        assert ORJSONRenderer().render(data, media_type) == JSONRenderer().render(data, media_type)
+
+    def test_entero_grande_usa_renderer_estandar(self):
+        data = {"valor": 2 ** 70}
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_sin_orjson_usa_renderer_estandar(self, monkeypatch):
+        monkeypatch.setattr(renderers, "orjson", None)
+        data = _payload()
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+class TestORJSONParser:
+    def test_parse_igual_que_drf(self):
+        body = '{"linea_servicio": 3, "valor_total": "10.50", "razon_social": "Ñandú"}'.encode()
+        assert ORJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+
+    def test_json_invalido_lanza_parse_error(self):
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"valor": NaN}'))
+
+    def test_sin_orjson_usa_parser_estandar(self, monkeypatch):
+        monkeypatch.setattr(parsers, "orjson", None)
+        assert ORJSONParser().parse(io.BytesIO(b'{"a": 1}')) == {"a": 1}
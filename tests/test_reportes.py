@@ -0,0 +1,111 @@
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.db.models import Sum
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.lineas.models import EstadoLinea
+from apps.cobranza.models import EstadoRubro, ResumenAntiguedad, Rubro, TramoAntiguedad
+from apps.cobranza.reportes import actualizar_resumen_antiguedad
+from .factories import LineaServicioFactory, RubroFactory
+
+
+@pytest.fixture
+def auth_client(db):
+    client = APIClient()
+    client.force_authenticate(user=User.objects.create_user("u", "u@t.com", "pass"))
+    return client
+
+
+def _rubro(linea, dias_vencido, valor, estado=EstadoRubro.NO_PAGADO):
+    vencimiento = timezone.now() - timedelta(days=dias_vencido)
+    return RubroFactory(
+        linea_servicio=linea,
+        estado_rubro=estado,
+        valor_total=Decimal(valor),
+        fecha_emision=vencimiento - timedelta(days=30),
+        fecha_vencimiento=vencimiento,
+    )
+
+
+@pytest.mark.django_db
+class TestResumenAntiguedad:
+    def test_agrupa_por_tramo_y_estados(self):
+        activa = LineaServicioFactory(estado_linea=EstadoLinea.ACTIVO)
+        suspendida = LineaServicioFactory(estado_linea=EstadoLinea.SUSPENDIDO)
+        _rubro(activa, -5, "10.00")
+        _rubro(activa, 10, "20.00")
+        _rubro(suspendida, 15, "5.00")
+        _rubro(suspendida, 45, "30.00")
+        _rubro(suspendida, 200, "40.00")
+        _rubro(suspendida, 200, "99.00", estado=EstadoRubro.PAGADO)
+
+        actualizar_resumen_antiguedad()
+
+        resumen = {
+            (r.tramo, r.estado_linea): (r.cantidad, r.monto)
+            for r in ResumenAntiguedad.objects.filter(fecha=timezone.localdate())
+        }
+        assert resumen == {
+            (TramoAntiguedad.POR_VENCER, EstadoLinea.ACTIVO): (1, Decimal("10.00")),
+            (TramoAntiguedad.D0_30, EstadoLinea.ACTIVO): (1, Decimal("20.00")),
+            (TramoAntiguedad.D0_30, EstadoLinea.SUSPENDIDO): (1, Decimal("5.00")),
+            (TramoAntiguedad.D31_60, EstadoLinea.SUSPENDIDO): (1, Decimal("30.00")),
+            (TramoAntiguedad.D90_MAS, EstadoLinea.SUSPENDIDO): (1, Decimal("40.00")),
+        }
+
+    def test_cada_estado_usa_su_indice_parcial(self):
+        from django.db import connection
+        from apps.cobranza.reportes import tramo_antiguedad
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        for estado, indice in (
+            (EstadoRubro.NO_PAGADO, "rubro_impago_linea_venc_idx"),
+            (EstadoRubro.VENCIDO, "rubro_vencido_linea_venc_idx"),
+        ):
+            plan = (
+                Rubro.objects.filter(estado_rubro=estado)
+                .annotate(tramo=tramo_antiguedad(timezone.now()))
+                .values("tramo")
+                .annotate(monto=Sum("valor_total"))
+                .order_by()
+                .explain()
+            )
+            assert indice in plan
+
+    def test_recalculo_reemplaza_solo_el_dia(self):
+        linea = LineaServicioFactory()
+        rubro = _rubro(linea, 10, "20.00")
+        ayer = timezone.now() - timedelta(days=1)
+        actualizar_resumen_antiguedad(now=ayer)
+        actualizar_resumen_antiguedad()
+
+        rubro.estado_rubro = EstadoRubro.PAGADO
+        rubro.save()
+        actualizar_resumen_antiguedad()
+
+        assert not ResumenAntiguedad.objects.filter(fecha=timezone.localdate()).exists()
+        assert ResumenAntiguedad.objects.filter(fecha=timezone.localdate(ayer)).count() == 1
+
+    def test_endpoint_devuelve_ultimo_snapshot(self, auth_client):
+        linea = LineaServicioFactory()
+        _rubro(linea, 10, "20.00")
+        actualizar_resumen_antiguedad(now=timezone.now() - timedelta(days=1))
+        actualizar_resumen_antiguedad()
+
+        response = auth_client.get(reverse("reporte-antiguedad-list"))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 1
+        assert response.data["results"][0]["fecha"] == timezone.localdate().isoformat()
+        assert response.data["results"][0]["monto"] == "20.00"
+
+        response = auth_client.get(
+            reverse("reporte-antiguedad-list"),
+            {"fecha_desde": (timezone.localdate() - timedelta(days=7)).isoformat()},
+        )
+        assert response.data["count"] == 2
@@ -0,0 +1,136 @@
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from apps.clientes.models import Cliente
+from core import db_router
+from core.db_router import ReplicaRouter, usar_primaria, usar_replica
+from core.middleware import ReplicaRoutingMiddleware
+
+
+@pytest.fixture
+def replica(monkeypatch, settings):
+    settings.DATABASE_REPLICA_ALIAS = "replica"
+    monkeypatch.setattr(db_router, "replica_configurada", lambda: True)
+    monkeypatch.setattr("core.middleware.replica_configurada", lambda: True)
+    monkeypatch.setattr(db_router, "retraso_replica", lambda: 0.0)
+
+
+def _middleware():
+    destinos = []
+
+    def get_response(request):
+        destinos.append(ReplicaRouter().db_for_read(Cliente))
+        return HttpResponse(status=201 if request.method == "POST" else 200)
+
+    return ReplicaRoutingMiddleware(get_response), destinos
+
+
+class TestReplicaRouter:
+    def test_lecturas_a_primaria_por_defecto(self, replica):
+        assert ReplicaRouter().db_for_read(Cliente) == "default"
+
+    def test_lecturas_a_replica_dentro_del_contexto(self, replica):
+        with usar_replica():
+            assert ReplicaRouter().db_for_read(Cliente) == "replica"
+            with usar_primaria():
+                assert ReplicaRouter().db_for_read(Cliente) == "default"
+        assert ReplicaRouter().db_for_write(Cliente) == "default"
+
+    def test_replica_atrasada_vuelve_a_primaria(self, replica, monkeypatch, settings):
+        settings.REPLICA_MAX_LAG_SECONDS = 5
+        monkeypatch.setattr(db_router, "retraso_replica", lambda: 30.0)
+        with usar_replica():
+            assert ReplicaRouter().db_for_read(Cliente) == "default"
+
+    def test_retraso_medido_en_un_servidor_primario(self, db, settings, monkeypatch):
+        settings.DATABASE_REPLICA_ALIAS = "default"
+        monkeypatch.setattr(db_router, "_retraso", {"segundos": None, "consultado_en": 0.0})
+        assert db_router.retraso_replica() == 0.0
+
+    def test_replica_sin_walreceiver_vuelve_a_primaria(self, settings, monkeypatch):
+        class Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, sql):
+                assert "pg_stat_wal_receiver" in sql
+
+            def fetchone(self):
+                return (None,)
+
+        class Conexion:
+            def cursor(self):
+                return Cursor()
+
+        settings.DATABASE_REPLICA_ALIAS = "replica"
+        monkeypatch.setattr(db_router, "connections", {"replica": Conexion()})
+        monkeypatch.setattr(db_router, "replica_configurada", lambda: True)
+        monkeypatch.setattr(db_router, "_retraso", {"segundos": None, "consultado_en": 0.0})
+        assert db_router.retraso_replica() is None
+        assert db_router.replica_disponible() is False
+
+    def test_sin_replica_configurada(self):
+        with usar_replica():
+            assert ReplicaRouter().db_for_read(Cliente) == "default"
+
+    def test_no_migra_la_replica(self, replica):
+        assert ReplicaRouter().allow_migrate("replica", "clientes") is False
+        assert ReplicaRouter().allow_migrate("default", "clientes") is True
+
+
+class TestReplicaRoutingMiddleware:
+    def test_get_lee_de_replica_y_escritura_fija_primaria(self, replica):
+        middleware, destinos = _middleware()
+        rf = RequestFactory()
+        auth = {"HTTP_AUTHORIZATION": "Bearer abc"}
+
+        middleware(rf.get("/api/clientes/", **auth))
+        middleware(rf.post("/api/clientes/", **auth))
+        middleware(rf.get("/api/clientes/", **auth))
+        middleware(rf.get("/api/clientes/", HTTP_AUTHORIZATION="Bearer otro"))
+
+        assert destinos == ["replica", "default", "default", "replica"]
+
+
+@pytest.mark.django_db
+class TestCachesLeenDePrimaria:
+    """Lo que se cachea no se lee de la réplica aunque la petición sea un GET"""
+
+    def _destinos(self, funcion):
+        destinos = []
+
+        def registrar(execute, sql, params, many, context):
+            destinos.append(ReplicaRouter().db_for_read(Cliente))
+            return execute(sql, params, many, context)
+
+        from django.db import connection
+
+        with connection.execute_wrapper(registrar), usar_replica():
+            funcion()
+        return destinos
+
+    def test_model_cache(self, replica):
+        from apps.clientes.cache import clientes
+        from .factories import ClienteFactory
+
+        cliente = ClienteFactory(identificacion="0903369387")
+        destinos = self._destinos(lambda: (clientes.get(cliente.pk), clientes.get_by("identificacion", "x")))
+        assert destinos and set(destinos) == {"default"}
+
+    def test_estado_cuenta(self, replica):
+        from apps.cobranza.estado_cuenta import obtener_estado_cuenta
+        from .factories import ClienteFactory
+
+        cliente = ClienteFactory()
+        destinos = self._destinos(lambda: obtener_estado_cuenta(cliente.pk))
+        assert destinos and set(destinos) == {"default"}
+
+    def test_catalogos(self, replica):
+        from core.catalogos import obtener_catalogos
+
+        destinos = self._destinos(obtener_catalogos)
+        assert destinos and set(destinos) == {"default"}
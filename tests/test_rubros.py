@@ -0,0 +1,175 @@
+import pytest
+from decimal import Decimal
+from django.core.exceptions import ValidationError
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.cobranza.models import Rubro, EstadoRubro
+from .factories import LineaServicioFactory, RubroFactory
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def auth_client(api_client, db):
+    api_client.force_authenticate(user=User.objects.create_user("u", "u@t.com", "pass"))
+    return api_client
+
+
+@pytest.mark.django_db
+class TestRubroValidacion:
+    def test_create_query_count(self, auth_client, django_assert_num_queries):
+        linea = LineaServicioFactory()
+        now = timezone.now()
+        data = {
+            "linea_servicio": linea.pk,
+            "valor_total": "15.00",
+            "fecha_emision": now.isoformat(),
+            "fecha_vencimiento": (now + timedelta(days=30)).isoformat(),
+        }
+        # linea_servicio + INSERT: la FK ya cargada no se vuelve a validar
+        with django_assert_num_queries(2):
+            response = auth_client.post(reverse("rubro-list"), data)
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def test_update_query_count(self, auth_client, django_assert_num_queries):
+        rubro = RubroFactory()
+        url = reverse("rubro-detail", args=[rubro.pk])
+        with django_assert_num_queries(2):
+            response = auth_client.patch(url, {"estado_rubro": EstadoRubro.PAGADO})
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_save_valida_valor_total(self):
+        rubro = RubroFactory.build(
+            linea_servicio=LineaServicioFactory(), valor_total=Decimal("0")
+        )
+        with pytest.raises(ValidationError):
+            rubro.save()
+
+    def test_save_valida_fk_no_cargada(self):
+        rubro = RubroFactory.build(linea_servicio=None)
+        rubro.linea_servicio_id = 999999
+        with pytest.raises(ValidationError):
+            rubro.save()
+        assert not Rubro.objects.exists()
+
+
+@pytest.mark.django_db
+class TestArchivoRubros:
+    def _rubro_antiguo(self, linea, estado=EstadoRubro.PAGADO):
+        vencimiento = timezone.now() - timedelta(days=800)
+        return RubroFactory(
+            linea_servicio=linea,
+            estado_rubro=estado,
+            fecha_emision=vencimiento - timedelta(days=30),
+            fecha_vencimiento=vencimiento,
+        )
+
+    def test_archiva_solo_liquidados_antiguos(self):
+        from apps.cobranza import archivo
+        from apps.cobranza.models import RubroArchivado
+
+        linea = LineaServicioFactory()
+        pagado = self._rubro_antiguo(linea)
+        anulado = self._rubro_antiguo(linea, EstadoRubro.ANULADO)
+        impago = self._rubro_antiguo(linea, EstadoRubro.NO_PAGADO)
+        reciente = RubroFactory(linea_servicio=linea, estado_rubro=EstadoRubro.PAGADO)
+
+        assert archivo.archivar_rubros(lote=1) == 2
+
+        assert set(Rubro.objects.values_list("pk", flat=True)) == {impago.pk, reciente.pk}
+        assert set(RubroArchivado.objects.values_list("pk", flat=True)) == {pagado.pk, anulado.pk}
+        assert RubroArchivado.objects.get(pk=pagado.pk).valor_total == pagado.valor_total
+
+    def test_listado_historico_incluye_archivados(self, auth_client):
+        from apps.cobranza import archivo
+
+        linea = LineaServicioFactory()
+        archivado = self._rubro_antiguo(linea)
+        vigente = RubroFactory(linea_servicio=linea)
+        archivo.archivar_rubros()
+
+        response = auth_client.get(reverse("rubro-list"))
+        assert [r["id"] for r in response.data["results"]] == [vigente.pk]
+
+        desde = (timezone.now() - timedelta(days=1000)).isoformat()
+        response = auth_client.get(reverse("rubro-list"), {"fecha_vencimiento_desde": desde})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 2
+        assert [(r["id"], r["archivado"]) for r in response.data["results"]] == [
+            (vigente.pk, False),
+            (archivado.pk, True),
+        ]
+        assert response.data["results"][1]["valor_total"] == str(archivado.valor_total)
+
+    def test_listado_historico_ordering_en_ambas_ramas(self, auth_client):
+        from apps.cobranza import archivo
+
+        linea = LineaServicioFactory()
+        archivado = self._rubro_antiguo(linea)
+        archivado.valor_total = Decimal("50.00")
+        archivado.save()
+        barato = RubroFactory(linea_servicio=linea, valor_total=Decimal("5.00"))
+        caro = RubroFactory(linea_servicio=linea, valor_total=Decimal("90.00"))
+        otra_linea = self._rubro_antiguo(LineaServicioFactory())
+        archivo.archivar_rubros()
+
+        params = {"historico": "1", "ordering": "valor_total", "linea_servicio": linea.pk}
+        response = auth_client.get(reverse("rubro-list"), params)
+        assert response.status_code == status.HTTP_200_OK
+        assert [r["id"] for r in response.data["results"]] == [barato.pk, archivado.pk, caro.pk]
+        assert otra_linea.pk not in [r["id"] for r in response.data["results"]]
+
+        params["ordering"] = "-valor_total"
+        response = auth_client.get(reverse("rubro-list"), params)
+        assert [r["id"] for r in response.data["results"]] == [caro.pk, archivado.pk, barato.pk]
+
+    def test_listado_historico_rechaza_orden_no_disponible(self, auth_client):
+        response = auth_client.get(reverse("rubro-list"), {"historico": "1", "ordering": "version"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        response = auth_client.get(reverse("rubro-list"), {"historico": "1", "estado_rubro": "X"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_detalle_de_rubro_archivado(self, auth_client):
+        from apps.cobranza import archivo
+
+        archivado = self._rubro_antiguo(LineaServicioFactory())
+        archivo.archivar_rubros()
+
+        response = auth_client.get(reverse("rubro-detail", args=[archivado.pk]))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["archivado"] is True
+        assert auth_client.get(reverse("rubro-detail", args=[0])).status_code == 404
+
+
+@pytest.mark.django_db
+class TestRubroVersion:
+    def test_if_match_viejo_412(self, auth_client):
+        rubro = RubroFactory(valor_total=Decimal("10.00"))
+        url = reverse("rubro-detail", args=[rubro.pk])
+        etag = auth_client.get(url)["ETag"]
+        auth_client.patch(url, {"estado_rubro": EstadoRubro.PAGADO}, format="json", HTTP_IF_MATCH=etag)
+
+        response = auth_client.patch(url, {"valor_total": "20.00"}, format="json", HTTP_IF_MATCH=etag)
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        rubro.refresh_from_db()
+        assert (rubro.valor_total, rubro.estado_rubro, rubro.version) == (Decimal("10.00"), EstadoRubro.PAGADO, 2)
+
+
+@pytest.mark.django_db
+class TestRubroSenales:
+    def test_save_sin_cargar_la_linea_no_consulta(self, django_assert_num_queries):
+        rubro = RubroFactory()
+        rubro = Rubro.objects.get(pk=rubro.pk)
+        rubro.save(skip_clean=True)  # llena el ModelCache de la línea
+        rubro = Rubro.objects.get(pk=rubro.pk)
+        # Solo el UPDATE
+        with django_assert_num_queries(1):
+            rubro.save(skip_clean=True)
@@ -0,0 +1,263 @@
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from django.utils import timezone
+
+from apps.lineas.models import EstadoLinea
+from apps.cobranza.models import EstadoRubro, CollectionsRequestLog, LogStatus, ActionTaken
+from apps.cobranza import services
+from apps.cobranza.services import Decision, evaluate_lines
+from .factories import ClienteFactory, LineaServicioFactory, RubroFactory, PoliticaCobranzaFactory
+
+
+def vencido(linea, valor="10.00"):
+    return RubroFactory(
+        linea_servicio=linea,
+        estado_rubro=EstadoRubro.NO_PAGADO,
+        fecha_vencimiento=timezone.now() - timedelta(days=2),
+        valor_total=Decimal(valor),
+    )
+
+
+@pytest.mark.django_db
+class TestEvaluateLines:
+    def test_decisiones_del_lote(self):
+        activa = LineaServicioFactory(estado_linea=EstadoLinea.ACTIVO)
+        vencido(activa, "40.00")
+        vencido(activa, "2.50")
+        suspendida = LineaServicioFactory(estado_linea=EstadoLinea.SUSPENDIDO)
+        cancelada = LineaServicioFactory(estado_linea=EstadoLinea.CANCELADO)
+
+        decisiones = evaluate_lines([activa.pk, suspendida.pk, cancelada.pk])
+
+        assert decisiones == [
+            Decision(activa.pk, EstadoLinea.ACTIVO, EstadoLinea.SUSPENDIDO,
+                     ActionTaken.SUSPEND, Decimal("42.50"), 2),
+            Decision(suspendida.pk, EstadoLinea.SUSPENDIDO, EstadoLinea.ACTIVO,
+                     ActionTaken.UNSUSPEND, Decimal("0"), 0),
+        ]
+        activa.refresh_from_db()
+        assert activa.estado_linea == EstadoLinea.SUSPENDIDO
+        assert activa.saldo_vencido == Decimal("42.50")
+        assert CollectionsRequestLog.objects.count() == 2
+
+    def test_consultas_constantes_por_lote(self, django_assert_num_queries):
+        lineas = [LineaServicioFactory(estado_linea=EstadoLinea.ACTIVO) for _ in range(5)]
+        for linea in lineas[:3]:
+            vencido(linea)
+        # SAVEPOINT + FOR UPDATE + agregado + bulk_update + bulk_create + RELEASE
+        with django_assert_num_queries(6) as consultas:
+            decisiones = evaluate_lines([l.pk for l in lineas])
+        assert [d.action for d in decisiones].count(ActionTaken.SUSPEND) == 3
+        # Las filas se bloquean antes de leer su estado para decidir
+        assert "FOR UPDATE" in consultas.captured_queries[1]["sql"]
+
+    def test_sin_cambios_no_actualiza_lineas(self, django_assert_num_queries):
+        linea = LineaServicioFactory(estado_linea=EstadoLinea.ACTIVO)
+        # SAVEPOINT + FOR UPDATE + agregado + bulk_create de logs + RELEASE
+        with django_assert_num_queries(5):
+            evaluate_lines([linea.pk])
+
+    def test_dry_run_no_escribe(self):
+        linea = LineaServicioFactory(estado_linea=EstadoLinea.ACTIVO)
+        vencido(linea)
+        (decision,) = evaluate_lines([linea.pk], dry_run=True)
+        assert decision.action == ActionTaken.SUSPEND
+        linea.refresh_from_db()
+        assert linea.estado_linea == EstadoLinea.ACTIVO
+        assert not CollectionsRequestLog.objects.exists()
+
+    def test_suspension_masiva_no_se_reactiva(self):
+        from apps.lineas.services import transicion_masiva
+
+        manual = LineaServicioFactory(estado_linea=EstadoLinea.ACTIVO)
+        vencido(manual, "5.00")
+        transicion_masiva(EstadoLinea.SUSPENDIDO, ids=[manual.pk], motivo="Corte de zona")
+        # Saldada la deuda la línea sigue suspendida: el corte no es de la cobranza
+        manual.rubros.update(estado_rubro=EstadoRubro.PAGADO)
+
+        (decision,) = evaluate_lines([manual.pk])
+        assert decision.action == ActionTaken.NONE
+        assert decision.estado_nuevo == EstadoLinea.SUSPENDIDO
+        manual.refresh_from_db()
+        assert manual.estado_linea == EstadoLinea.SUSPENDIDO
+        assert manual.suspension_manual
+
+        transicion_masiva(EstadoLinea.ACTIVO, ids=[manual.pk])
+        manual.refresh_from_db()
+        assert not manual.suspension_manual
+
+    def test_error_en_lote_se_aisla_por_linea(self, monkeypatch):
+        sana = LineaServicioFactory(estado_linea=EstadoLinea.SUSPENDIDO)
+        rota = LineaServicioFactory(estado_linea=EstadoLinea.ACTIVO)
+        decidir = services._decidir
+
+        def falla_en_rota(linea):
+            if linea.pk == rota.pk:
+                raise RuntimeError("boom")
+            return decidir(linea)
+
+        monkeypatch.setattr(services, "_decidir", falla_en_rota)
+        decisiones = {d.linea_id: d for d in evaluate_lines([sana.pk, rota.pk])}
+
+        assert decisiones[sana.pk].action == ActionTaken.UNSUSPEND
+        assert decisiones[rota.pk].status == LogStatus.FAILED
+        sana.refresh_from_db()
+        assert sana.estado_linea == EstadoLinea.ACTIVO
+        log = CollectionsRequestLog.objects.get(linea_servicio=rota)
+        assert log.status == LogStatus.FAILED
+        assert log.error_message == "boom"
+
+    def test_lista_vacia(self, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            assert evaluate_lines([]) == []
+
+
+@pytest.mark.django_db
+class TestSimulacion:
+    def test_simula_sin_escribir(self, django_assert_num_queries):
+        linea = LineaServicioFactory(estado_linea=EstadoLinea.ACTIVO)
+        vencido(linea)
+        LineaServicioFactory(estado_linea=EstadoLinea.SUSPENDIDO)
+        with django_assert_num_queries(1):
+            resumen = services.resumen_por_accion(services.simulate_lines())
+        assert resumen == {"NONE": 0, "SUSPEND": 1, "UNSUSPEND": 1}
+        linea.refresh_from_db()
+        assert linea.estado_linea == EstadoLinea.ACTIVO
+        assert not CollectionsRequestLog.objects.exists()
+
+    def test_dias_gracia(self):
+        linea = LineaServicioFactory(estado_linea=EstadoLinea.ACTIVO)
+        vencido(linea)  # vencido hace 2 días
+        assert [d.action for d in services.simulate_lines(dias_gracia=5)] == [ActionTaken.NONE]
+        assert [d.action for d in services.simulate_lines(dias_gracia=1)] == [ActionTaken.SUSPEND]
+
+    def test_now_hipotetico(self):
+        linea = LineaServicioFactory(estado_linea=EstadoLinea.ACTIVO)
+        RubroFactory(
+            linea_servicio=linea,
+            estado_rubro=EstadoRubro.NO_PAGADO,
+            fecha_vencimiento=timezone.now() + timedelta(days=3),
+        )
+        futuro = timezone.now() + timedelta(days=4)
+        (decision,) = services.simulate_lines(now=futuro)
+        assert decision.action == ActionTaken.SUSPEND
+
+    def test_endpoint_resumen_y_ndjson(self):
+        from django.contrib.auth.models import User
+        from rest_framework.test import APIClient
+
+        admin = User.objects.create_superuser("admin", "a@t.com", "pass")
+        client = APIClient()
+        client.force_authenticate(user=admin)
+        linea = LineaServicioFactory(estado_linea=EstadoLinea.ACTIVO)
+        vencido(linea, "12.00")
+
+        response = client.get("/api/rubros/simular-cobranza/")
+        assert response.status_code == 200
+        assert response.data["total"] == 1
+        assert response.data["por_accion"]["SUSPEND"] == 1
+
+        response = client.get("/api/rubros/simular-cobranza/?detalle=true&dias_gracia=0")
+        assert response["Content-Type"] == "application/x-ndjson"
+        import json
+        lineas = [json.loads(l) for l in b"".join(response.streaming_content).splitlines()]
+        assert lineas[0]["linea_id"] == linea.pk
+        assert lineas[0]["saldo"] == "12.00"
+        assert lineas[-1] == {"total": 1, "por_accion": {"NONE": 0, "SUSPEND": 1, "UNSUSPEND": 0}}
+        linea.refresh_from_db()
+        assert linea.estado_linea == EstadoLinea.ACTIVO
+
+    def test_endpoint_solo_admin(self):
+        from django.contrib.auth.models import User
+        from rest_framework.test import APIClient
+
+        client = APIClient()
+        client.force_authenticate(user=User.objects.create_user("u", "u@t.com", "pass"))
+        assert client.get("/api/rubros/simular-cobranza/").status_code == 403
+
+    def test_comando(self):
+        from io import StringIO
+        from django.core.management import call_command
+
+        vencido(LineaServicioFactory(estado_linea=EstadoLinea.ACTIVO))
+        out = StringIO()
+        call_command("simular_cobranza", "--dias-gracia", "1", stdout=out)
+        assert "SUSPEND    1" in out.getvalue()
+        assert not CollectionsRequestLog.objects.exists()
+
+
+@pytest.mark.django_db
+class TestPoliticas:
+    def _accion(self, linea):
+        (decision,) = evaluate_lines([linea.pk], dry_run=True)
+        return decision.action
+
+    def test_dias_gracia_de_la_politica(self):
+        linea = LineaServicioFactory(politica_cobranza=PoliticaCobranzaFactory(dias_gracia=5))
+        vencido(linea)  # hace 2 días, dentro de la gracia
+        assert self._accion(linea) == ActionTaken.NONE
+
+    def test_monto_minimo(self):
+        linea = LineaServicioFactory(politica_cobranza=PoliticaCobranzaFactory(monto_minimo=Decimal("20")))
+        vencido(linea, "15.00")
+        assert self._accion(linea) == ActionTaken.NONE
+        vencido(linea, "5.00")
+        assert self._accion(linea) == ActionTaken.SUSPEND
+
+    def test_cantidad_minima(self):
+        linea = LineaServicioFactory(politica_cobranza=PoliticaCobranzaFactory(cantidad_minima=2))
+        vencido(linea)
+        assert self._accion(linea) == ActionTaken.NONE
+        vencido(linea)
+        assert self._accion(linea) == ActionTaken.SUSPEND
+
+    def test_politica_del_cliente_y_precedencia_de_la_linea(self):
+        cliente = ClienteFactory(politica_cobranza=PoliticaCobranzaFactory(dias_gracia=30))
+        del_cliente = LineaServicioFactory(cliente=cliente)
+        propia = LineaServicioFactory(
+            cliente=cliente, politica_cobranza=PoliticaCobranzaFactory(dias_gracia=0)
+        )
+        vencido(del_cliente)
+        vencido(propia)
+        assert self._accion(del_cliente) == ActionTaken.NONE
+        assert self._accion(propia) == ActionTaken.SUSPEND
+
+    def test_defaults_de_settings(self, settings):
+        settings.COBRANZA_DIAS_GRACIA = 3
+        linea = LineaServicioFactory()
+        vencido(linea)
+        assert self._accion(linea) == ActionTaken.NONE
+
+    def test_deuda_bajo_el_minimo_reactiva_y_conserva_saldo(self):
+        linea = LineaServicioFactory(
+            estado_linea=EstadoLinea.SUSPENDIDO,
+            politica_cobranza=PoliticaCobranzaFactory(monto_minimo=Decimal("50")),
+        )
+        vencido(linea, "10.00")
+        (decision,) = evaluate_lines([linea.pk])
+        assert decision.action == ActionTaken.UNSUSPEND
+        linea.refresh_from_db()
+        assert linea.estado_linea == EstadoLinea.ACTIVO
+        assert linea.saldo_vencido == Decimal("10.00")
+
+    def test_una_consulta_con_politicas(self, django_assert_num_queries):
+        politica = PoliticaCobranzaFactory(dias_gracia=1)
+        lineas = [LineaServicioFactory(politica_cobranza=politica) for _ in range(3)]
+        with django_assert_num_queries(1):
+            list(services.simulate_lines())
+        assert len(lineas) == 3
+
+    def test_api_politicas_solo_admin_escribe(self):
+        from django.contrib.auth.models import User
+        from rest_framework.test import APIClient
+
+        client = APIClient()
+        client.force_authenticate(user=User.objects.create_user("u", "u@t.com", "pass"))
+        assert client.get("/api/politicas-cobranza/").status_code == 200
+        data = {"nombre": "Residencial", "dias_gracia": 5}
+        assert client.post("/api/politicas-cobranza/", data).status_code == 403
+        client.force_authenticate(user=User.objects.create_superuser("a", "a@t.com", "pass"))
+        response = client.post("/api/politicas-cobranza/", data)
+        assert response.status_code == 201
+        assert response.data["cantidad_minima"] == 1
@@ -126,3 +126,231 @@ class TestProcesoControlMorosidad:
         self._run_task()
         linea.refresh_from_db()
         assert linea.saldo_vencido == Decimal("100.00")
+
+
+@pytest.mark.django_db
+class TestReevaluacionPorEventos:
+    """Cambios en rubros programan la reevaluación de su línea"""
+
+    def test_pago_reactiva_la_linea_sin_esperar_al_proceso(self, django_capture_on_commit_callbacks):
+        linea = LineaServicioFactory(estado_linea=EstadoLinea.SUSPENDIDO)
+        rubro = RubroFactory(linea_servicio=linea, estado_rubro=EstadoRubro.NO_PAGADO)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            rubro.estado_rubro = EstadoRubro.PAGADO
+            rubro.fecha_pago = timezone.now()
+            rubro.save()
+
+        linea.refresh_from_db()
+        assert linea.estado_linea == EstadoLinea.ACTIVO
+        log = CollectionsRequestLog.objects.get(linea_servicio=linea)
+        assert log.action_taken == ActionTaken.UNSUSPEND
+
+    def test_rafaga_de_cambios_se_agrupa(self, monkeypatch):
+        from apps.cobranza import tasks
+
+        encoladas = []
+        monkeypatch.setattr(
+            tasks.reevaluar_linea, "apply_async", lambda **kwargs: encoladas.append(kwargs)
+        )
+        linea = LineaServicioFactory()
+        assert tasks.programar_reevaluacion(linea.pk) is True
+        assert tasks.programar_reevaluacion(linea.pk) is False
+        assert encoladas == [{"args": [linea.pk], "countdown": 10}]
+
+        # Al ejecutarse libera la clave: el siguiente cambio vuelve a programar
+        tasks.reevaluar_linea(linea.pk)
+        assert tasks.programar_reevaluacion(linea.pk) is True
+
+    def test_fallo_del_broker_no_bloquea_nuevos_intentos(self, monkeypatch):
+        from apps.cobranza import tasks
+
+        def broker_caido(**kwargs):
+            raise ConnectionError("broker caído")
+
+        monkeypatch.setattr(tasks.reevaluar_linea, "apply_async", broker_caido)
+        linea = LineaServicioFactory()
+        assert tasks.programar_reevaluacion(linea.pk) is False
+        monkeypatch.setattr(tasks.reevaluar_linea, "apply_async", lambda **kwargs: None)
+        assert tasks.programar_reevaluacion(linea.pk) is True
+
+    def test_linea_no_gestionable_no_se_procesa(self):
+        from apps.cobranza.tasks import reevaluar_linea
+
+        linea = LineaServicioFactory(estado_linea=EstadoLinea.NO_INSTALADO)
+        assert reevaluar_linea(linea.pk)["action"] is None
+        assert not CollectionsRequestLog.objects.filter(linea_servicio=linea).exists()
+
+
+@pytest.mark.django_db
+class TestEjecucionesCobranza:
+    """Checkpoint por lote: reintentos y reejecuciones continúan donde quedó la ejecución"""
+
+    @pytest.fixture(autouse=True)
+    def _lotes_de_una_linea(self, settings):
+        settings.COBRANZA_LOTE_LINEAS = 1
+
+    def _lineas_morosas(self, cantidad=3):
+        lineas = LineaServicioFactory.create_batch(cantidad, estado_linea=EstadoLinea.ACTIVO)
+        for linea in lineas:
+            RubroFactory(
+                linea_servicio=linea,
+                estado_rubro=EstadoRubro.NO_PAGADO,
+                fecha_vencimiento=timezone.now() - timedelta(days=1),
+            )
+        return sorted(lineas, key=lambda linea: linea.pk)
+
+    def test_ejecucion_completa(self):
+        from apps.cobranza.models import CollectionsRun, RunStatus
+        from apps.cobranza.tasks import proceso_control_morosidad
+
+        lineas = self._lineas_morosas()
+        resultado = proceso_control_morosidad()
+
+        run = CollectionsRun.objects.get(pk=resultado["run"])
+        assert run.status == RunStatus.COMPLETADA
+        assert run.procesadas == run.total == 3
+        assert run.ultima_linea_id == lineas[-1].pk
+        assert run.logs.count() == 3
+
+    def test_reintento_continua_desde_el_checkpoint(self, monkeypatch):
+        from apps.cobranza import services
+        from apps.cobranza.models import CollectionsRun, RunStatus
+        from apps.cobranza.tasks import proceso_control_morosidad
+
+        lineas = self._lineas_morosas()
+        original = services.evaluate_lines
+        llamadas = []
+
+        def cae_en_el_segundo_lote(ids, now, **kwargs):
+            llamadas.append(ids)
+            if len(llamadas) == 2:
+                raise RuntimeError("worker caído")
+            return original(ids, now, **kwargs)
+
+        monkeypatch.setattr(services, "evaluate_lines", cae_en_el_segundo_lote)
+        with pytest.raises(RuntimeError):
+            proceso_control_morosidad()
+
+        run = CollectionsRun.objects.get()
+        assert run.status == RunStatus.EN_CURSO
+        assert run.ultima_linea_id == lineas[0].pk
+        assert run.procesadas == 1
+
+        monkeypatch.setattr(services, "evaluate_lines", original)
+        resultado = proceso_control_morosidad(run_id=run.pk)
+
+        run.refresh_from_db()
+        assert resultado["run"] == run.pk
+        assert run.status == RunStatus.COMPLETADA
+        assert run.procesadas == 3
+        # Cada línea evaluada una sola vez en la ejecución, con el mismo started_at
+        assert sorted(run.logs.values_list("linea_servicio_id", flat=True)) == [l.pk for l in lineas]
+        assert set(run.logs.values_list("started_at", flat=True)) == {run.started_at}
+
+    def test_lote_repetido_no_duplica_logs(self):
+        from apps.cobranza.models import CollectionsRun
+        from apps.cobranza.services import evaluate_lines
+
+        linea = self._lineas_morosas(1)[0]
+        run = CollectionsRun.objects.create(started_at=timezone.now())
+        evaluate_lines([linea.pk], run.started_at, run=run)
+        evaluate_lines([linea.pk], run.started_at, run=run)
+        assert run.logs.count() == 1
+
+    def test_lease_vigente_omite_la_segunda_ejecucion(self):
+        from apps.cobranza.models import CollectionsRun
+        from apps.cobranza.tasks import proceso_control_morosidad
+
+        self._lineas_morosas(1)
+        CollectionsRun.objects.create(
+            started_at=timezone.now(), lease_hasta=timezone.now() + timedelta(minutes=5)
+        )
+        assert proceso_control_morosidad()["run"] is None
+        assert not CollectionsRequestLog.objects.exists()
+
+    def test_ejecucion_antigua_se_abandona(self):
+        from apps.cobranza.models import CollectionsRun, RunStatus
+        from apps.cobranza.tasks import proceso_control_morosidad
+
+        self._lineas_morosas(1)
+        vieja = CollectionsRun.objects.create(started_at=timezone.now() - timedelta(hours=2))
+        resultado = proceso_control_morosidad()
+
+        vieja.refresh_from_db()
+        assert vieja.status == RunStatus.ABANDONADA
+        assert resultado["run"] != vieja.pk
+        assert resultado["processed"] == 1
+
+
+class TestColasCelery:
+    """Enrutado y límites por cola"""
+
+    def test_cada_tarea_va_a_su_cola(self):
+        from core.celery import app
+
+        colas = {
+            "cobranza.reevaluar_linea": "cobranza_eventos",
+            "cobranza.proceso_control_morosidad": "cobranza_periodica",
+            "cobranza.archivar_rubros": "cobranza_masiva",
+        }
+        for tarea, cola in colas.items():
+            assert app.amqp.router.route({}, tarea)["queue"].name == cola
+
+    def test_limites_y_acks_late_por_cola(self):
+        from apps.cobranza.tasks import reevaluar_linea, proceso_control_morosidad
+
+        assert reevaluar_linea.acks_late and proceso_control_morosidad.acks_late
+        assert reevaluar_linea.time_limit < proceso_control_morosidad.time_limit
+        assert reevaluar_linea.soft_time_limit < reevaluar_linea.time_limit
+
+
+@pytest.mark.django_db
+class TestLimiteDeTiempo:
+    def test_corta_la_ejecucion_y_conserva_el_checkpoint(self, monkeypatch, settings):
+        from celery.exceptions import SoftTimeLimitExceeded
+        from apps.cobranza import services
+        from apps.cobranza.models import CollectionsRun, RunStatus
+        from apps.cobranza.tasks import proceso_control_morosidad
+
+        settings.COBRANZA_LOTE_LINEAS = 1
+        lineas = sorted(LineaServicioFactory.create_batch(2), key=lambda linea: linea.pk)
+        original = services._evaluar_lote
+
+        def limite_en_el_segundo_lote(ids, *args):
+            if ids[0] == lineas[1].pk:
+                raise SoftTimeLimitExceeded()
+            return original(ids, *args)
+
+        monkeypatch.setattr(services, "_evaluar_lote", limite_en_el_segundo_lote)
+        resultado = proceso_control_morosidad()
+
+        run = CollectionsRun.objects.get()
+        assert resultado["completa"] is False
+        assert run.status == RunStatus.EN_CURSO
+        assert run.ultima_linea_id == lineas[0].pk
+        assert run.lease_hasta is None
+        # Sin log FAILED: el límite no se trata como fallo de la línea
+        assert not CollectionsRequestLog.objects.filter(status=LogStatus.FAILED).exists()
+
+
+@pytest.mark.django_db
+class TestResultadosCelery:
+    def test_solo_el_proceso_periodico_guarda_resultado(self):
+        from apps.cobranza.tasks import proceso_control_morosidad, reevaluar_linea
+
+        assert proceso_control_morosidad.ignore_result is False
+        assert reevaluar_linea.ignore_result is True
+
+    def test_limpieza_borra_los_vencidos(self, settings):
+        from django_celery_results.models import TaskResult
+        from core.celery import limpiar_resultados
+
+        vencido = TaskResult.objects.create(task_id="vencido", status="SUCCESS")
+        TaskResult.objects.filter(pk=vencido.pk).update(
+            date_done=timezone.now() - timedelta(days=2)
+        )
+        TaskResult.objects.create(task_id="reciente", status="SUCCESS")
+
+        assert limpiar_resultados()["borrados"] == 1
+        assert list(TaskResult.objects.values_list("task_id", flat=True)) == ["reciente"]